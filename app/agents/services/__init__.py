@@ -1,5 +1,7 @@
 from .llmService import llmService
+from .sriClient import sriClient
 
 __all__ = [
-    'llmService'
+    'llmService',
+    'sriClient'
 ]
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+MAIN_FORM_DOCUMENT = "mainForm"
+ANNEX_INDEX_DOCUMENT = "annexIndex"
+
+
+def proposal_namespace(tender_id: Optional[str], proposal: Dict) -> str:
+    """Handle prefix of one proposal's documents, e.g. 'tender_3/12/ACME'."""
+    return f"tender_{tender_id}/{proposal.get('contractorId')}/{proposal.get('companyName')}"
+
+
+def tender_namespace(tender_id: Optional[str]) -> str:
+    return f"tender_{tender_id}/"
+
+
+def document_handle(namespace: str, name: str) -> str:
+    return f"{namespace}/{name}"
+
+
+class DocumentStore:
+    """
+    Shared read-only store of the document texts under analysis.
+
+    Graph state and specialist tasks carry handles ('tender_3/12/ACME/Anexo_1.pdf')
+    instead of texts. A handle resolves to a text that is either loaded on first
+    use from a registered loader (e.g. PDF extraction), and can be unloaded again
+    once nobody needs it, or was put in directly (inline texts, passage selections).
+    Memory therefore follows the documents in flight, not the number of tasks
+    citing them.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], str]] = {}
+        self._texts: Dict[str, str] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.peak_resident_chars = 0
+        self._resident_chars = 0
+
+    def register(self, handle: str, loader: Callable[[], str]) -> str:
+        """Registers a lazily loaded document and returns its handle."""
+        with self._lock:
+            self._loaders[handle] = loader
+            self._drop(handle)
+        return handle
+
+    def put(self, handle: str, text: str) -> str:
+        """Stores a text that has no loader; it stays resident until released."""
+        with self._lock:
+            self._loaders.pop(handle, None)
+            self._drop(handle)
+            self._keep(handle, text or "")
+        return handle
+
+    def intern(self, namespace: str, text: str) -> str:
+        """Stores a derived text under a content handle, so identical texts are kept once."""
+        handle = f"{namespace}#{hashlib.sha1((text or '').encode('utf-8')).hexdigest()[:16]}"
+        with self._lock:
+            if handle not in self._texts:
+                self._keep(handle, text or "")
+        return handle
+
+    def get(self, handle: str) -> str:
+        """Returns the text of a handle, loading it if needed. Raises KeyError for unknown handles."""
+        if not handle:
+            return ""
+        text = self._texts.get(handle)
+        if text is not None:
+            return text
+        with self._lock:
+            loader = self._loaders.get(handle)
+            if loader is None:
+                raise KeyError(f"Unknown document handle: {handle}")
+            load_lock = self._load_locks.setdefault(handle, threading.Lock())
+        with load_lock:
+            text = self._texts.get(handle)
+            if text is None:
+                text = loader() or ""
+                with self._lock:
+                    self.loads += 1
+                    if handle in self._loaders:
+                        self._keep(handle, text)
+        return text
+
+    async def aget(self, handle: str) -> str:
+        """Like get, but runs a pending load (PDF extraction) off the event loop."""
+        if not handle:
+            return ""
+        text = self._texts.get(handle)
+        if text is not None:
+            return text
+        return await asyncio.to_thread(self.get, handle)
+
+    async def aload(self, handles: Iterable[Optional[str]]) -> List[str]:
+        """Resolves several handles concurrently, in order."""
+        return list(await asyncio.gather(*(self.aget(handle) for handle in handles)))
+
+    def unload(self, handles: Iterable[Optional[str]]) -> None:
+        """Drops the cached text of loader-backed handles; they load again on next use."""
+        with self._lock:
+            for handle in handles:
+                if handle in self._loaders:
+                    self._drop(handle)
+
+    def release(self, prefix: str) -> None:
+        """Forgets every handle under `prefix` (a proposal or tender namespace)."""
+        with self._lock:
+            for handle in [h for h in set(self._texts) | set(self._loaders) if h.startswith(prefix)]:
+                self._loaders.pop(handle, None)
+                self._load_locks.pop(handle, None)
+                self._drop(handle)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "handles": len(set(self._texts) | set(self._loaders)),
+                "residentDocuments": len(self._texts),
+                "residentChars": self._resident_chars,
+                "peakResidentChars": self.peak_resident_chars,
+                "loads": self.loads
+            }
+
+    def _keep(self, handle: str, text: str) -> None:
+        self._texts[handle] = text
+        self._resident_chars += len(text)
+        self.peak_resident_chars = max(self.peak_resident_chars, self._resident_chars)
+
+    def _drop(self, handle: str) -> None:
+        text = self._texts.pop(handle, None)
+        if text is not None:
+            self._resident_chars -= len(text)
+
+
+documentStore = DocumentStore()
+
+
+def proposal_document_refs(
+    tender_id: Optional[str],
+    proposal: Dict[str, Any],
+    store: Optional[DocumentStore] = None
+) -> Tuple[Optional[str], Optional[str], Dict[str, str]]:
+    """
+    Returns the (main form, annex index, {annex key: handle}) handles of a proposal.
+    Proposals loaded by tender_service already carry handles; proposals with
+    inline texts (JSON inputs, tests) have them put in the store once here.
+    """
+    if "attachmentRefs" in proposal:
+        return proposal.get("mainFormRef"), proposal.get("annexIndexRef"), dict(proposal["attachmentRefs"])
+
+    store = store or documentStore
+    namespace = proposal_namespace(tender_id, proposal)
+    main_form_ref = store.put(document_handle(namespace, MAIN_FORM_DOCUMENT), proposal.get("mainFormText") or "")
+    annex_index_ref = store.put(document_handle(namespace, ANNEX_INDEX_DOCUMENT), proposal.get("annexIndexText") or "")
+    attachment_refs = {
+        annex_key: store.put(document_handle(namespace, annex_key), text)
+        for annex_key, text in (proposal.get("attachments") or {}).items()
+    }
+    return main_form_ref, annex_index_ref, attachment_refs
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import openai
+from pydantic import BaseModel, Field
+
+from ...core.config import OPENAI_API_KEY, OPENAI_BASE_URL, LLM_MAX_CONCURRENCY, LLM_ENDPOINTS
+
+# Cool-down applied to an endpoint after a retryable failure, doubled per consecutive failure.
+BASE_COOLDOWN_SEC = 2.0
+MAX_COOLDOWN_SEC = 60.0
+
+
+class LLMEndpoint(BaseModel):
+    """One OpenAI-compatible account, key or deployment that calls can be routed to."""
+    name: str
+    apiKey: Optional[str] = None
+    baseUrl: Optional[str] = None
+    weight: float = Field(default=1.0, gt=0, description="Relative share of traffic this endpoint should take.")
+    maxConcurrency: int = Field(default=LLM_MAX_CONCURRENCY, ge=1, description="Calls allowed in flight on this endpoint.")
+    modelMap: Dict[str, str] = Field(default_factory=dict, description="Requested model -> model/deployment name on this endpoint.")
+
+    def model_for(self, model_name: str) -> str:
+        return self.modelMap.get(model_name, model_name)
+
+
+class _EndpointState:
+    """Runtime load and health of one endpoint."""
+
+    def __init__(self, endpoint: LLMEndpoint):
+        self.endpoint = endpoint
+        self.outstanding = 0
+        self.consecutiveFailures = 0
+        self.cooldownUntil = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.rateLimited = 0
+        self.lastError: Optional[str] = None
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.outstanding < self.endpoint.maxConcurrency
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.cooldownUntil
+
+    def load(self) -> float:
+        """Outstanding requests relative to the endpoint's weight (least-outstanding routing key)."""
+        return (self.outstanding + 1) / self.endpoint.weight
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.endpoint.name,
+            "baseUrl": self.endpoint.baseUrl,
+            "weight": self.endpoint.weight,
+            "maxConcurrency": self.endpoint.maxConcurrency,
+            "outstanding": self.outstanding,
+            "healthy": self.is_healthy(now),
+            "cooldownRemainingSec": round(max(0.0, self.cooldownUntil - now), 1),
+            "consecutiveFailures": self.consecutiveFailures,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rateLimited": self.rateLimited,
+            "lastError": self.lastError
+        }
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """429s, 5xx and connection problems are worth retrying on another endpoint."""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(header) if header else None
+    except ValueError:
+        return None
+
+
+class EndpointPool:
+    """
+    Routes LLM calls over several endpoints by least outstanding requests per
+    unit of weight, respecting each endpoint's concurrency limit. Endpoints that
+    answer 429/5xx are cooled down and the call fails over to the next one.
+    """
+
+    def __init__(self, endpoints: List[LLMEndpoint]):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint.")
+        self._states = [_EndpointState(endpoint) for endpoint in endpoints]
+        self._capacity_changed = asyncio.Condition()
+
+    @property
+    def endpoints(self) -> List[LLMEndpoint]:
+        return [state.endpoint for state in self._states]
+
+    @property
+    def total_capacity(self) -> int:
+        return sum(state.endpoint.maxConcurrency for state in self._states)
+
+    def _pick(self, excluded: set) -> Optional[_EndpointState]:
+        now = time.monotonic()
+        candidates = [s for s in self._states if s.endpoint.name not in excluded and s.has_capacity]
+        if not candidates:
+            return None
+        healthy = [s for s in candidates if s.is_healthy(now)]
+        if healthy:
+            return min(healthy, key=lambda s: (s.load(), -s.endpoint.weight))
+        # Every endpoint with room is cooling down: probe the one that recovers first,
+        # unless a healthy endpoint is merely busy and will free a slot soon.
+        if any(s.is_healthy(now) for s in self._states if s.endpoint.name not in excluded):
+            return None
+        return min(candidates, key=lambda s: s.cooldownUntil)
+
+    async def _acquire(self, excluded: set) -> _EndpointState:
+        async with self._capacity_changed:
+            while True:
+                state = self._pick(excluded)
+                if state is not None:
+                    state.outstanding += 1
+                    state.requests += 1
+                    return state
+                await self._capacity_changed.wait()
+
+    async def _release(self, state: _EndpointState) -> None:
+        async with self._capacity_changed:
+            state.outstanding -= 1
+            self._capacity_changed.notify_all()
+
+    def _mark_success(self, state: _EndpointState) -> None:
+        state.consecutiveFailures = 0
+        state.cooldownUntil = 0.0
+
+    def _mark_failure(self, state: _EndpointState, error: Exception) -> None:
+        state.failures += 1
+        state.consecutiveFailures += 1
+        state.lastError = f"{type(error).__name__}: {error}"[:300]
+        if isinstance(error, openai.RateLimitError):
+            state.rateLimited += 1
+        cooldown = _retry_after_seconds(error) or BASE_COOLDOWN_SEC * (2 ** (state.consecutiveFailures - 1))
+        state.cooldownUntil = time.monotonic() + min(cooldown, MAX_COOLDOWN_SEC)
+        print(f"LLM endpoint '{state.endpoint.name}' failed ({state.lastError}); cooling down {min(cooldown, MAX_COOLDOWN_SEC):.1f}s")
+
+    async def execute(self, call: Callable[[LLMEndpoint], Awaitable[Any]]) -> Tuple[Any, str, float]:
+        """
+        Runs `call` on the best available endpoint, failing over to the others on
+        retryable errors. Returns the result, the endpoint name and the time spent
+        waiting for endpoint capacity (ms).
+        """
+        tried: set = set()
+        wait_ms = 0.0
+        last_error: Optional[Exception] = None
+
+        while len(tried) < len(self._states):
+            waiting_since = time.perf_counter()
+            state = await self._acquire(tried)
+            wait_ms += (time.perf_counter() - waiting_since) * 1000
+            try:
+                result = await call(state.endpoint)
+                self._mark_success(state)
+                return result, state.endpoint.name, wait_ms
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+                self._mark_failure(state, e)
+                tried.add(state.endpoint.name)
+                last_error = e
+            finally:
+                await self._release(state)
+
+        raise last_error
+
+    def get_health(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [state.snapshot(now) for state in self._states]
+
+
+def load_endpoints_from_config() -> List[LLMEndpoint]:
+    """
+    Reads LLM_ENDPOINTS (a JSON list of LLMEndpoint objects). Without it, the pool
+    is the single OPENAI_API_KEY / OPENAI_BASE_URL endpoint.
+    """
+    if LLM_ENDPOINTS:
+        return [LLMEndpoint.model_validate(item) for item in json.loads(LLM_ENDPOINTS)]
+    return [LLMEndpoint(name="default", apiKey=OPENAI_API_KEY, baseUrl=OPENAI_BASE_URL)]
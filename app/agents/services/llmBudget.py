@@ -0,0 +1,144 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from ...core.config import ANALYSIS_MAX_LLM_CALLS, ANALYSIS_MAX_LLM_TOKENS, ANALYSIS_MAX_LLM_WALL_SEC, LLM_BUDGET_DEGRADE_AT
+from .llmTelemetry import LLMTelemetry
+
+BUDGET_NORMAL = "normal"
+BUDGET_DEGRADED = "degraded"
+BUDGET_EXHAUSTED = "exhausted"
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised instead of making an LLM call once the analysis budget is exhausted."""
+
+
+class LLMBudget(BaseModel):
+    """Ceilings of one analysis; 0 means unlimited."""
+    maxCalls: int = Field(default=0, ge=0)
+    maxTokens: int = Field(default=0, ge=0, description="Prompt plus completion tokens.")
+    maxWallTimeSec: float = Field(default=0, ge=0)
+    degradeAt: float = Field(default=LLM_BUDGET_DEGRADE_AT, gt=0, le=1, description="Fraction at which the analysis degrades.")
+
+    @classmethod
+    def from_config(cls, **overrides: Any) -> "LLMBudget":
+        """Configured budget (ANALYSIS_MAX_LLM_*), with any non-None override applied."""
+        values = {"maxCalls": ANALYSIS_MAX_LLM_CALLS, "maxTokens": ANALYSIS_MAX_LLM_TOKENS, "maxWallTimeSec": ANALYSIS_MAX_LLM_WALL_SEC}
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+
+    def is_limited(self) -> bool:
+        return self.maxCalls > 0 or self.maxTokens > 0 or self.maxWallTimeSec > 0
+
+
+class LLMBudgetGovernor:
+    """
+    Enforces the call, token and wall-time budget of each running analysis.
+    Consumption is read from the telemetry records plus the calls in flight.
+    Past `degradeAt` of any budget the analysis is "degraded" (nodes switch to
+    cheaper strategies); once any budget is used up it is "exhausted" and
+    `acquire` refuses further calls with BudgetExceededError.
+    """
+
+    def __init__(self, telemetry: LLMTelemetry):
+        self.telemetry = telemetry
+        self._budgets: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, tender_id: Optional[str], budget: LLMBudget) -> None:
+        """Starts (or restarts) the budget clock of a tender's analysis."""
+        if not budget.is_limited():
+            self._budgets.pop(tender_id or "unknown", None)
+            return
+        self._budgets[tender_id or "unknown"] = {
+            "budget": budget,
+            "startedAt": time.monotonic(),
+            "inFlight": 0,
+            "refusedCalls": 0,
+            "degradations": []
+        }
+        print(f"LLM budget for tender {tender_id}: {budget.model_dump()}")
+
+    def clear(self, tender_id: Optional[str]) -> None:
+        self._budgets.pop(tender_id or "unknown", None)
+
+    def _fractions(self, entry: Dict[str, Any], totals: Dict[str, Any]) -> List[float]:
+        budget: LLMBudget = entry["budget"]
+        fractions = []
+        if budget.maxCalls:
+            fractions.append((totals["calls"] + entry["inFlight"]) / budget.maxCalls)
+        if budget.maxTokens:
+            fractions.append((totals["promptTokens"] + totals["completionTokens"]) / budget.maxTokens)
+        if budget.maxWallTimeSec:
+            fractions.append((time.monotonic() - entry["startedAt"]) / budget.maxWallTimeSec)
+        return fractions
+
+    def level(self, tender_id: Optional[str]) -> str:
+        """BUDGET_NORMAL, BUDGET_DEGRADED or BUDGET_EXHAUSTED (always normal without a budget)."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is None:
+            return BUDGET_NORMAL
+        used = max(self._fractions(entry, self.telemetry.get_totals(tender_id)), default=0.0)
+        if used >= 1:
+            return BUDGET_EXHAUSTED
+        return BUDGET_DEGRADED if used >= entry["budget"].degradeAt else BUDGET_NORMAL
+
+    def is_degraded(self, tender_id: Optional[str]) -> bool:
+        return self.level(tender_id) != BUDGET_NORMAL
+
+    def note_degradation(self, tender_id: Optional[str], degradation: str) -> None:
+        """Records a cheaper strategy a node switched to, for the final report."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is not None and degradation not in entry["degradations"]:
+            entry["degradations"].append(degradation)
+            print(f"LLM budget of tender {tender_id} nearly used: {degradation}")
+
+    def acquire(self, tender_id: Optional[str]) -> None:
+        """Counts a call in flight, or raises BudgetExceededError if the budget is exhausted."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is None:
+            return
+        if max(self._fractions(entry, self.telemetry.get_totals(tender_id)), default=0.0) >= 1:
+            entry["refusedCalls"] += 1
+            raise BudgetExceededError(f"LLM budget of tender {tender_id} exhausted.")
+        entry["inFlight"] += 1
+
+    def release(self, tender_id: Optional[str]) -> None:
+        """Ends a call counted by `acquire`, once its telemetry record exists."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is not None and entry["inFlight"] > 0:
+            entry["inFlight"] -= 1
+
+    def headroom(self, tender_id: Optional[str]) -> Optional[Dict[str, Optional[float]]]:
+        """Calls and tokens left before the budget is exhausted (None per unlimited budget), or None without a budget."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is None:
+            return None
+        budget: LLMBudget = entry["budget"]
+        totals = self.telemetry.get_totals(tender_id)
+        return {
+            "calls": max(0, budget.maxCalls - totals["calls"] - entry["inFlight"]) if budget.maxCalls else None,
+            "tokens": max(0, budget.maxTokens - totals["promptTokens"] - totals["completionTokens"]) if budget.maxTokens else None
+        }
+
+    def usage(self, tender_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Budget consumption of a tender's analysis, or None if it runs without a budget."""
+        entry = self._budgets.get(tender_id or "unknown")
+        if entry is None:
+            return None
+        budget: LLMBudget = entry["budget"]
+        totals = self.telemetry.get_totals(tender_id)
+        used = max(self._fractions(entry, totals), default=0.0)
+        return {
+            "level": self.level(tender_id),
+            "calls": totals["calls"],
+            "maxCalls": budget.maxCalls,
+            "tokens": totals["promptTokens"] + totals["completionTokens"],
+            "maxTokens": budget.maxTokens,
+            "wallTimeSec": round(time.monotonic() - entry["startedAt"], 1),
+            "maxWallTimeSec": budget.maxWallTimeSec,
+            "usedFraction": round(min(used, 1.0), 3),
+            "refusedCalls": entry["refusedCalls"],
+            "degradations": list(entry["degradations"])
+        }
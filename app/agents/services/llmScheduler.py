@@ -0,0 +1,118 @@
+import asyncio
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+# Priority classes, highest first. Critical-path calls (master checklist, annex map,
+# executive summary) are dispatched before bulk specialist work.
+PRIORITY_CRITICAL = "critical"
+PRIORITY_STANDARD = "standard"
+PRIORITY_BULK = "bulk"
+PRIORITY_ORDER = (PRIORITY_CRITICAL, PRIORITY_STANDARD, PRIORITY_BULK)
+
+
+class LLMScheduler:
+    """
+    Hands out LLM call slots by priority class and, within a class, shares them
+    fairly across tenders: the next slot goes to the waiting tender with the
+    fewest calls in flight (ties go to the one served least recently).
+
+    `reserved_critical` slots are kept free for critical calls, so a tender's
+    checklist or summary never queues behind a wall of specialist calls.
+    """
+
+    def __init__(self, capacity: int, reserved_critical: int = 1):
+        self.capacity = max(1, capacity)
+        self.reserved_critical = min(max(0, reserved_critical), self.capacity - 1)
+        self._in_flight = 0
+        self._in_flight_by_tender: Dict[str, int] = {}
+        self._waiting: Dict[str, Dict[str, Deque[asyncio.Future]]] = {priority: {} for priority in PRIORITY_ORDER}
+        self._served_at: Dict[str, int] = {}
+        self._clock = itertools.count(1)
+
+    def _limit_for(self, priority: str) -> int:
+        return self.capacity if priority == PRIORITY_CRITICAL else self.capacity - self.reserved_critical
+
+    def _has_waiters_at_or_above(self, priority: str) -> bool:
+        for level in PRIORITY_ORDER:
+            if self._waiting[level]:
+                return True
+            if level == priority:
+                return False
+        return False
+
+    def _grant(self, tender_key: str) -> None:
+        self._in_flight += 1
+        self._in_flight_by_tender[tender_key] = self._in_flight_by_tender.get(tender_key, 0) + 1
+        self._served_at[tender_key] = next(self._clock)
+
+    def _release(self, tender_key: str) -> None:
+        self._in_flight -= 1
+        remaining = self._in_flight_by_tender.get(tender_key, 1) - 1
+        if remaining > 0:
+            self._in_flight_by_tender[tender_key] = remaining
+        else:
+            self._in_flight_by_tender.pop(tender_key, None)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grants free slots to waiters: strict priority between classes, fair share within one."""
+        for priority in PRIORITY_ORDER:
+            queues = self._waiting[priority]
+            while queues:
+                if self._in_flight >= self._limit_for(priority):
+                    return
+                tender_key = min(queues, key=lambda key: (self._in_flight_by_tender.get(key, 0), self._served_at.get(key, 0)))
+                waiter = queues[tender_key].popleft()
+                if not queues[tender_key]:
+                    del queues[tender_key]
+                if waiter.done():
+                    continue
+                self._grant(tender_key)
+                waiter.set_result(None)
+
+    async def _acquire(self, priority: str, tender_key: str) -> None:
+        if not self._has_waiters_at_or_above(priority) and self._in_flight < self._limit_for(priority):
+            self._grant(tender_key)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(tender_key, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before the cancellation arrived: hand it back.
+                self._release(tender_key)
+            else:
+                queue = self._waiting[priority].get(tender_key)
+                if queue and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._waiting[priority][tender_key]
+            raise
+
+    @asynccontextmanager
+    async def slot(self, priority: str = PRIORITY_STANDARD, tender_id: Optional[str] = None) -> AsyncIterator[None]:
+        """Waits for an LLM call slot and holds it for the duration of the block."""
+        if priority not in self._waiting:
+            raise ValueError(f"Unknown LLM priority class: {priority}")
+        tender_key = tender_id or "unknown"
+        await self._acquire(priority, tender_key)
+        try:
+            yield
+        finally:
+            self._release(tender_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "reservedCritical": self.reserved_critical,
+            "inFlight": self._in_flight,
+            "inFlightByTender": dict(self._in_flight_by_tender),
+            "waitingByPriority": {
+                priority: sum(len(queue) for queue in queues.values())
+                for priority, queues in self._waiting.items()
+            }
+        }
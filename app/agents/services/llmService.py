@@ -1,38 +1,191 @@
+import httpx
+import time
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel
-from typing import List, Type
+from typing import Any, Callable, Dict, List, Optional, Type
 
-from ...core.config import OPENAI_API_KEY
+from ...core.config import OPENAI_API_KEY, LLM_CRITICAL_RESERVED_SLOTS
+from .endpointPool import EndpointPool, LLMEndpoint, load_endpoints_from_config
+from .llmBudget import LLMBudgetGovernor
+from .llmScheduler import LLMScheduler, PRIORITY_STANDARD
+from .llmTelemetry import LLMTelemetry
+
+def _extract_usage(raw_message: Any) -> Dict[str, int]:
+    """
+    Reads the token usage reported by the API from a raw AIMessage.
+    Cached tokens come from the provider's prompt cache (usage.prompt_tokens_details).
+    """
+    usage = getattr(raw_message, "usage_metadata", None) or {}
+    input_details = usage.get("input_token_details") or {}
+    return {
+        "promptTokens": usage.get("input_tokens", 0) or 0,
+        "cachedPromptTokens": input_details.get("cache_read", 0) or 0,
+        "completionTokens": usage.get("output_tokens", 0) or 0
+    }
 
 class LLMService:
     """
     Class to encapsulate interactions with LLMs.
+    Every call is timed and its token usage recorded in `telemetry`,
+    tagged with the tender, proposal, graph node and schema it served.
+    Calls wait for a slot from `scheduler` (priority classes, fair share
+    across tenders) and are then routed over `endpointPool`, which enforces
+    per-endpoint concurrency limits and fails over on 429/5xx.
+    `budget` refuses the calls of an analysis that used up its LLM budget.
     """
-    
+
+    def __init__(self, endpoints: Optional[List[LLMEndpoint]] = None):
+        self.telemetry = LLMTelemetry()
+        self.budget = LLMBudgetGovernor(self.telemetry)
+        self.http_async_client: Optional[httpx.AsyncClient] = None
+        self.configure_endpoints(endpoints or load_endpoints_from_config())
+
+    def configure_endpoints(
+        self,
+        endpoints: List[LLMEndpoint],
+        http_async_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """Replaces the endpoint pool, e.g. with several keys or deployments."""
+        self.endpointPool = EndpointPool(endpoints)
+        self.scheduler = LLMScheduler(self.endpointPool.total_capacity, reserved_critical=LLM_CRITICAL_RESERVED_SLOTS)
+        self.http_async_client = http_async_client
+
+    def configure_endpoint(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """
+        Points the service at a single OpenAI-compatible endpoint, such as the
+        local stand-in. `http_async_client` allows an in-process transport.
+        """
+        self.configure_endpoints(
+            [LLMEndpoint(name="default", apiKey=api_key or OPENAI_API_KEY, baseUrl=base_url)],
+            http_async_client=http_async_client
+        )
+
+    def _build_runner(self, endpoint: LLMEndpoint, model_name: str, temperature: float) -> ChatOpenAI:
+        if not endpoint.apiKey:
+            raise ValueError(f"OPENAI_API_KEY is not set (endpoint '{endpoint.name}').")
+
+        runner_options = {}
+        if len(self.endpointPool.endpoints) > 1:
+            # Fail over to another endpoint right away instead of retrying this one.
+            runner_options["max_retries"] = 0
+
+        return ChatOpenAI(
+            api_key=endpoint.apiKey,
+            model=endpoint.model_for(model_name),
+            temperature=temperature,
+            base_url=endpoint.baseUrl,
+            http_async_client=self.http_async_client,
+            **runner_options
+        )
+
+    async def _tracked_ainvoke(
+        self,
+        runner_factory: Callable[[ChatOpenAI], Runnable],
+        messages: List[BaseMessage],
+        raw_getter: Callable[[Any], Any],
+        schema_name: str,
+        model_name: str,
+        temperature: float,
+        tender_id: Optional[str],
+        proposal_name: Optional[str],
+        node_name: Optional[str],
+        priority: str = PRIORITY_STANDARD
+    ) -> Any:
+        """
+        Runs one LLM call through the scheduler and the endpoint pool and records
+        its queue wait, wall time, token usage, estimated cost and endpoint.
+        Raises BudgetExceededError, before queueing, once the tender's budget is used up.
+        """
+        async def call_endpoint(endpoint: LLMEndpoint) -> Any:
+            runner = runner_factory(self._build_runner(endpoint, model_name, temperature))
+            return await runner.ainvoke(messages)
+
+        self.budget.acquire(tender_id)
+        queued_at = time.perf_counter()
+        started_at = queued_at
+        response = None
+        endpoint_name = None
+        queue_wait_ms = 0.0
+        error = None
+        try:
+            async with self.scheduler.slot(priority, tender_id):
+                started_at = time.perf_counter()
+                response, endpoint_name, pool_wait_ms = await self.endpointPool.execute(call_endpoint)
+            queue_wait_ms = (started_at - queued_at) * 1000 + pool_wait_ms
+            if isinstance(response, dict) and response.get("parsing_error") is not None:
+                error = f"Parsing error: {response['parsing_error']}"
+            return response
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            record = self.telemetry.record_call(
+                tender_id=tender_id,
+                proposal_name=proposal_name,
+                node_name=node_name,
+                schema_name=schema_name,
+                model_name=model_name,
+                queue_wait_ms=queue_wait_ms,
+                wall_time_ms=(time.perf_counter() - queued_at) * 1000 - queue_wait_ms,
+                usage=_extract_usage(raw_getter(response)) if response is not None else {},
+                error=error,
+                endpoint_name=endpoint_name
+            )
+            print(
+                f"--- LLM call done (Node: {record['node']}, Schema: {schema_name}, Priority: {priority}, Endpoint: {endpoint_name}, Status: {record['status']}) "
+                f"wall={record['wallTimeMs']:.0f}ms queue={record['queueWaitMs']:.0f}ms "
+                f"tokens={record['promptTokens']}/{record['cachedPromptTokens']} cached/{record['completionTokens']} "
+                f"cost=${record['estimatedCostUSD']:.5f} ---"
+            )
+            self.budget.release(tender_id)
+
+    def get_endpoint_health(self) -> List[Dict[str, Any]]:
+        """Returns load and health of every configured LLM endpoint."""
+        return self.endpointPool.get_health()
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Returns slots in flight and waiting calls per priority class and tender."""
+        return self.scheduler.get_stats()
+
+    def get_usage_summary(self, tender_id: Optional[str]) -> Dict[str, Any]:
+        """Returns the accumulated call, token, latency and cost totals for a tender."""
+        return self.telemetry.get_totals(tender_id)
+
+    def get_usage_breakdown(self, tender_id: Optional[str]) -> Dict[str, Any]:
+        """Returns the tender's cost/latency breakdown by node, proposal and schema."""
+        return self.telemetry.get_breakdown(tender_id)
+
+    def reset_usage(self, tender_id: Optional[str]) -> None:
+        """Clears the accumulated usage for a tender (before a new analysis run, or once its report is saved)."""
+        self.telemetry.reset(tender_id)
+
     async def invoke_text(
         self,
         messages: List[BaseMessage],
         model_name: str = "gpt-4o-mini",
-        temperature: float = 0.5
+        temperature: float = 0.5,
+        tender_id: Optional[str] = None,
+        proposal_name: Optional[str] = None,
+        node_name: Optional[str] = None,
+        priority: str = PRIORITY_STANDARD
     ) -> str:
         """
         Invokes the LLM to get a plain text response.
         """
-        print(f"--- Invoking LLM for text (Model: {model_name}, Temp: {temperature}) ---")
-        
-        if not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY is not set.")
+        print(f"--- Invoking LLM for text (Model: {model_name}, Temp: {temperature}, Node: {node_name}) ---")
 
-        print(f"--- Invoking LLM for text (Model: {model_name}) ---")
-        
-        llm_runner = ChatOpenAI(
-            api_key=OPENAI_API_KEY,
-            model=model_name,
-            temperature=temperature
+        response = await self._tracked_ainvoke(
+            lambda llm_runner: llm_runner, messages, raw_getter=lambda r: r, schema_name="text",
+            model_name=model_name, temperature=temperature,
+            tender_id=tender_id, proposal_name=proposal_name, node_name=node_name, priority=priority
         )
-        
-        response = await llm_runner.ainvoke(messages)
         return response.content
 
 
@@ -41,32 +194,34 @@ class LLMService:
         messages: List[BaseMessage],
         output_schema: Type[BaseModel],
         model_name: str = "gpt-4o-mini",
-        temperature: float = 0.5
+        temperature: float = 0.5,
+        tender_id: Optional[str] = None,
+        proposal_name: Optional[str] = None,
+        node_name: Optional[str] = None,
+        priority: str = PRIORITY_STANDARD
     ) -> dict:
         """
         Invokes the LLM with a structured output schema.
+        The raw response is kept so its token usage can be recorded for the tender.
         """
-        print(f"--- Invoking LLM for JSON (Model: {model_name}, Schema: {output_schema.__name__}) ---")
-        
-        if not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY is not set.")
-
-        print(f"--- Invoking LLM for JSON (Model: {model_name}) ---")
+        print(f"--- Invoking LLM for JSON (Model: {model_name}, Schema: {output_schema.__name__}, Node: {node_name}) ---")
 
-        llm_runner = ChatOpenAI(
-            api_key=OPENAI_API_KEY,
-            model=model_name,
-            temperature=temperature
-        )
-        
-        structured_llm_runner = llm_runner.with_structured_output(
-            schema=output_schema
+        response = await self._tracked_ainvoke(
+            lambda llm_runner: llm_runner.with_structured_output(schema=output_schema, include_raw=True),
+            messages, raw_getter=lambda r: r.get("raw"),
+            schema_name=output_schema.__name__, model_name=model_name, temperature=temperature,
+            tender_id=tender_id, proposal_name=proposal_name, node_name=node_name, priority=priority
         )
-        
-        response_pydantic_object = await structured_llm_runner.ainvoke(messages)
+
+        if response.get("parsing_error") is not None:
+            raise response["parsing_error"]
+        response_pydantic_object = response.get("parsed")
+        if response_pydantic_object is None:
+            raise ValueError(f"LLM returned no parsable {output_schema.__name__} object.")
+
         return response_pydantic_object.dict()
-    
-    
+
+
     async def invoke_agent_with_tools(
         self,
         messages: List[BaseMessage],
@@ -84,12 +239,12 @@ class LLMService:
             model=model_name,
             temperature=temperature
         )
-        
+
         llm_with_tools = llm_runner.bind_tools(tools)
-        
+
         response = await llm_with_tools.ainvoke(messages)
         return response
 
 # --- Instancia Única de Servicio (Patrón Singleton) ---
 # Se crea una sola instancia que se importará en todos los demás archivos.
-llmService = LLMService()
\ No newline at end of file
+llmService = LLMService()
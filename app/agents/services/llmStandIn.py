@@ -0,0 +1,486 @@
+"""
+Local OpenAI-compatible stand-in for the chat completions API.
+
+Lets the tender pipeline run, be load-tested and benchmarked without a real
+OpenAI key. LLMService targets it through OPENAI_BASE_URL (or an in-process
+httpx client, see `create_stand_in_client`).
+
+Modes:
+    synthetic  Builds a response that validates against the requested
+               structured-output schema (MasterChecklist, AnnexMapOutput,
+               the specialist findings, ExecutiveSummary, ...).
+    record     Proxies every request to a real upstream and appends the
+               request/response pair to a JSONL transcript.
+    replay     Answers from a recorded transcript, keyed by a hash of the
+               request, so end-to-end runs are deterministic.
+
+Run it with:
+    python -m app.agents.services.llmStandIn --port 8011 --latency lognormal --latency-ms 800
+"""
+import argparse
+import ast
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+CHARS_PER_TOKEN = 4
+# OpenAI only caches prompts of at least 1024 tokens, in 128-token increments.
+CACHE_MIN_TOKENS = 1024
+CACHE_INCREMENT_TOKENS = 128
+
+
+class StandInConfig(BaseModel):
+    """Behaviour of the stand-in server."""
+    mode: Literal["synthetic", "record", "replay"] = "synthetic"
+    latencyDistribution: Literal["none", "fixed", "uniform", "normal", "lognormal", "recorded"] = "none"
+    latencyMs: float = Field(default=0.0, description="Fixed/mean latency, or the lower bound for 'uniform'.")
+    latencySpreadMs: float = Field(default=0.0, description="Std. deviation, or the width of the 'uniform' range.")
+    latencyPerKTokenMs: float = Field(default=0.0, description="Extra synthetic latency per 1000 prompt tokens, so larger prompts take longer.")
+    errorRate: float = Field(default=0.0, ge=0.0, le=1.0, description="Probability of answering with an injected error.")
+    errorStatusCodes: List[int] = Field(default_factory=lambda: [429, 500, 503])
+    transcriptPath: Optional[str] = Field(default=None, description="JSONL transcript written in 'record' and read in 'replay'.")
+    replayFallback: Literal["synthetic", "error"] = "synthetic"
+    upstreamBaseUrl: str = "https://api.openai.com/v1"
+    upstreamApiKey: Optional[str] = None
+    simulatePromptCache: bool = True
+    seed: int = 0
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a request that determine its answer."""
+    relevant = {
+        "model": body.get("model"),
+        "messages": body.get("messages"),
+        "response_format": body.get("response_format"),
+        "tools": body.get("tools"),
+        "temperature": body.get("temperature"),
+    }
+    canonical = json.dumps(relevant, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _prompt_text(body: Dict[str, Any]) -> str:
+    return "\n".join(f"{m.get('role')}: {_message_text(m)}" for m in body.get("messages", []))
+
+
+def _find_list_after(label: str, text: str) -> List[str]:
+    """Parses a Python-style list printed after `label` in a prompt (e.g. 'Requirements List: [...]')."""
+    match = re.search(re.escape(label) + r"\s*(\[.*?\])\s*(?:\n|$)", text)
+    if not match:
+        return []
+    try:
+        values = ast.literal_eval(match.group(1))
+        return [str(value) for value in values]
+    except (ValueError, SyntaxError):
+        return []
+
+
+class _SchemaFaker:
+    """
+    Generates a JSON value that validates against a JSON schema.
+    The prompt is used for hints so the answers stay useful downstream
+    (requirement names and annex filenames are taken from the request).
+    """
+
+    def __init__(self, root_schema: Dict[str, Any], prompt: str, rng: random.Random):
+        self.root = root_schema
+        self.prompt = prompt
+        self.rng = rng
+        self.pdf_names = sorted(set(re.findall(r"[\w\-.]+\.pdf", prompt, flags=re.IGNORECASE)))
+        self.requirement = self._requirement_from_prompt()
+
+    def _requirement_from_prompt(self) -> Dict[str, Any]:
+        match = re.search(r"\*\*Requirement to Verify:\*\*\s*(\{.*?\n\})", self.prompt, flags=re.DOTALL)
+        if not match:
+            return {}
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            return {}
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        ref = schema.get("$ref")
+        if not ref:
+            return schema
+        node: Any = self.root
+        for part in ref.lstrip("#/").split("/"):
+            node = node.get(part, {})
+        return node
+
+    def fake(self, schema: Dict[str, Any], name: str = "") -> Any:
+        schema = self._resolve(schema)
+
+        for combinator in ("anyOf", "oneOf"):
+            if combinator in schema:
+                options = [option for option in schema[combinator] if option.get("type") != "null"]
+                return self.fake(options[0] if options else {"type": "null"}, name)
+        if "allOf" in schema:
+            return self.fake(schema["allOf"][0], name)
+        if "enum" in schema:
+            return self._pick_enum(schema["enum"], name)
+        if "const" in schema:
+            return schema["const"]
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), "null")
+
+        if schema_type == "object" or "properties" in schema:
+            return {
+                prop_name: self.fake(prop_schema, prop_name)
+                for prop_name, prop_schema in schema.get("properties", {}).items()
+            }
+        if schema_type == "array":
+            min_items = schema.get("minItems", 1)
+            count = max(min_items, self.rng.randint(2, 4))
+            return [self.fake(schema.get("items", {}), name) for _ in range(count)]
+        if schema_type == "boolean":
+            return self.rng.random() < 0.75
+        if schema_type == "integer":
+            return self.rng.randint(schema.get("minimum", 0), schema.get("maximum", 100))
+        if schema_type == "number":
+            return round(self.rng.uniform(schema.get("minimum", 0), schema.get("maximum", 100000)), 2)
+        if schema_type == "null":
+            return None
+        return self._fake_string(name)
+
+    def _pick_enum(self, values: List[Any], name: str) -> Any:
+        if name == "severity" and set(values) >= {"OK", "WARNING", "CRITICAL"}:
+            return self.rng.choices(["OK", "WARNING", "CRITICAL"], weights=[6, 3, 1])[0]
+        return self.rng.choice(values)
+
+    def _fake_string(self, name: str) -> str:
+        lowered = name.lower()
+        if lowered == "requirementname" and self.requirement.get("name"):
+            return self.requirement["name"]
+        if lowered == "requirementdetails" and self.requirement.get("details"):
+            return self.requirement["details"]
+        if "filename" in lowered and self.pdf_names:
+            return self.rng.choice(self.pdf_names)
+        if lowered == "name":
+            return f"Requisito simulado {self.rng.randint(1, 999)}"
+        if "value" in lowered:
+            return f"${self.rng.randint(10, 900)},{self.rng.randint(100, 999)}.00"
+        return f"Texto simulado para {name or 'campo'} ({self.rng.randint(1, 9999)})."
+
+
+def _annex_map_response(prompt: str) -> Optional[Dict[str, Any]]:
+    """Maps each listed requirement to one of the listed annexes, as the router expects."""
+    requirements = _find_list_after("Requirements List:", prompt)
+    annexes = _find_list_after("Available Annexes in Proposal:", prompt)
+    if not requirements or not annexes:
+        return None
+    return {
+        "annexMap": [
+            {"requirementName": requirement, "annexFilename": annexes[index % len(annexes)]}
+            for index, requirement in enumerate(requirements)
+        ]
+    }
+
+
+def _annex_batch_response(schema: Dict[str, Any], prompt: str, rng: random.Random) -> Optional[Dict[str, Any]]:
+    """Answers an annex batch with one finding per listed requirement, grouped by specialist."""
+    match = re.search(r"\*\*Requirements to Verify:\*\*\s*(\{.*\})", prompt, flags=re.DOTALL)
+    if not match:
+        return None
+    try:
+        requirements_by_specialist = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+    faker = _SchemaFaker(schema, prompt, rng)
+    payload = {}
+    for findings_key, finding_schema in schema.get("properties", {}).items():
+        specialist = findings_key.replace("Findings", "")
+        findings = []
+        for requirement in requirements_by_specialist.get(specialist, []):
+            faker.requirement = requirement
+            findings.append(_coherent_finding(faker.fake(finding_schema.get("items", {}))))
+        payload[findings_key] = findings
+    return payload
+
+
+def _coherent_finding(payload: Any) -> Any:
+    # Keep findings internally coherent: only CRITICAL ones are non-compliant.
+    if isinstance(payload, dict) and "severity" in payload:
+        for flag in ("isCompliant", "isConsistent"):
+            if flag in payload:
+                payload[flag] = payload["severity"] != "CRITICAL"
+    return payload
+
+
+def build_synthetic_payload(schema_name: str, schema: Dict[str, Any], prompt: str, rng: random.Random) -> Dict[str, Any]:
+    """Returns a structured answer for `schema`, using known shapes for the pipeline's own schemas."""
+    if schema_name == "AnnexMapOutput":
+        annex_map = _annex_map_response(prompt)
+        if annex_map is not None:
+            return annex_map
+    if schema_name == "AnnexFindingsBatch":
+        annex_batch = _annex_batch_response(schema, prompt, rng)
+        if annex_batch is not None:
+            return annex_batch
+
+    return _coherent_finding(_SchemaFaker(schema, prompt, rng).fake(schema))
+
+
+class _PromptCacheSimulator:
+    """Reports cached tokens the way OpenAI does: the longest previously seen prompt prefix."""
+
+    def __init__(self):
+        self._seen_prefixes = set()
+
+    def cached_tokens(self, prompt: str) -> int:
+        encoded = prompt.encode("utf-8")
+        prompt_tokens = len(encoded) // CHARS_PER_TOKEN
+        if prompt_tokens < CACHE_MIN_TOKENS:
+            return 0
+
+        cached = 0
+        digest = hashlib.sha1()
+        position = 0
+        for boundary_tokens in range(CACHE_MIN_TOKENS, prompt_tokens + 1, CACHE_INCREMENT_TOKENS):
+            boundary = boundary_tokens * CHARS_PER_TOKEN
+            digest.update(encoded[position:boundary])
+            position = boundary
+            prefix_hash = digest.copy().hexdigest()
+            if prefix_hash in self._seen_prefixes:
+                cached = boundary_tokens
+            else:
+                self._seen_prefixes.add(prefix_hash)
+        return cached
+
+
+def _completion_response(body: Dict[str, Any], key: str, content: Optional[str], tool_call: Optional[Dict[str, Any]], prompt_tokens: int, cached_tokens: int) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": content, "refusal": None}
+    if tool_call:
+        message["tool_calls"] = [tool_call]
+    completion_tokens = len((content or json.dumps(tool_call or {})).encode("utf-8")) // CHARS_PER_TOKEN
+    return {
+        "id": f"chatcmpl-standin-{key[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stand-in"),
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "logprobs": None,
+            "finish_reason": "tool_calls" if tool_call else "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+    }
+
+
+def _error_response(status_code: int, message: str) -> JSONResponse:
+    error_type = "rate_limit_error" if status_code == 429 else "server_error"
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": error_type}}
+    )
+
+
+class StandInServer:
+    """State of one stand-in instance: config, transcript, RNG and prompt cache."""
+
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.prompt_cache = _PromptCacheSimulator()
+        self.transcript: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "injectedErrors": 0, "replayHits": 0, "replayMisses": 0, "recorded": 0}
+        if config.transcriptPath and Path(config.transcriptPath).is_file():
+            self._load_transcript(Path(config.transcriptPath))
+
+    def _load_transcript(self, path: Path) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.transcript[entry["key"]] = entry
+
+    def _append_transcript(self, entry: Dict[str, Any]) -> None:
+        self.transcript[entry["key"]] = entry
+        self.stats["recorded"] += 1
+        if self.config.transcriptPath:
+            path = Path(self.config.transcriptPath)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def sample_latency_ms(self, recorded_ms: Optional[float] = None) -> float:
+        config = self.config
+        distribution = config.latencyDistribution
+        if distribution == "none":
+            return 0.0
+        if distribution == "recorded":
+            return recorded_ms if recorded_ms is not None else config.latencyMs
+        if distribution == "fixed":
+            return config.latencyMs
+        if distribution == "uniform":
+            return self.rng.uniform(config.latencyMs, config.latencyMs + config.latencySpreadMs)
+        if distribution == "normal":
+            return max(0.0, self.rng.gauss(config.latencyMs, config.latencySpreadMs))
+        # lognormal: heavy right tail like real LLM latency, with the given mean and spread.
+        mean = max(config.latencyMs, 1.0)
+        spread = config.latencySpreadMs or mean / 2
+        sigma_squared = math.log(1 + (spread / mean) ** 2)
+        mu = math.log(mean) - sigma_squared / 2
+        return self.rng.lognormvariate(mu, sigma_squared ** 0.5)
+
+    def maybe_injected_error(self) -> Optional[JSONResponse]:
+        if self.config.errorRate and self.rng.random() < self.config.errorRate:
+            self.stats["injectedErrors"] += 1
+            status_code = self.rng.choice(self.config.errorStatusCodes)
+            return _error_response(status_code, f"Injected error from LLM stand-in (status {status_code}).")
+        return None
+
+    def synthetic_completion(self, body: Dict[str, Any], key: str) -> Dict[str, Any]:
+        prompt = _prompt_text(body)
+        prompt_tokens = len(prompt.encode("utf-8")) // CHARS_PER_TOKEN
+        cached_tokens = self.prompt_cache.cached_tokens(prompt) if self.config.simulatePromptCache else 0
+        content_rng = random.Random(f"{self.config.seed}:{key}")
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            json_schema = response_format.get("json_schema", {})
+            payload = build_synthetic_payload(json_schema.get("name", ""), json_schema.get("schema", {}), prompt, content_rng)
+            return _completion_response(body, key, json.dumps(payload, ensure_ascii=False), None, prompt_tokens, cached_tokens)
+        if response_format.get("type") == "json_object":
+            return _completion_response(body, key, "{}", None, prompt_tokens, cached_tokens)
+
+        tools = body.get("tools") or []
+        if tools:
+            function = tools[0].get("function", {})
+            payload = build_synthetic_payload(function.get("name", ""), function.get("parameters", {}), prompt, content_rng)
+            tool_call = {
+                "id": f"call_{key[:16]}",
+                "type": "function",
+                "function": {"name": function.get("name", ""), "arguments": json.dumps(payload, ensure_ascii=False)}
+            }
+            return _completion_response(body, key, None, tool_call, prompt_tokens, cached_tokens)
+
+        return _completion_response(body, key, "Respuesta simulada del servidor local.", None, prompt_tokens, cached_tokens)
+
+    async def record_completion(self, body: Dict[str, Any], key: str, authorization: Optional[str]) -> JSONResponse:
+        api_key = self.config.upstreamApiKey
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {"Authorization": authorization or ""}
+        started_at = time.perf_counter()
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            upstream = await client.post(f"{self.config.upstreamBaseUrl.rstrip('/')}/chat/completions", json=body, headers=headers)
+        latency_ms = (time.perf_counter() - started_at) * 1000
+
+        response_json = upstream.json()
+        if upstream.status_code == 200:
+            self._append_transcript({
+                "key": key,
+                "model": body.get("model"),
+                "latencyMs": round(latency_ms, 1),
+                "request": body,
+                "response": response_json
+            })
+        return JSONResponse(status_code=upstream.status_code, content=response_json)
+
+    async def handle_chat_completion(self, body: Dict[str, Any], authorization: Optional[str]) -> JSONResponse:
+        self.stats["requests"] += 1
+        key = request_key(body)
+
+        if self.config.mode == "record":
+            return await self.record_completion(body, key, authorization)
+
+        recorded = self.transcript.get(key) if self.config.mode == "replay" else None
+        if self.config.mode == "replay":
+            self.stats["replayHits" if recorded else "replayMisses"] += 1
+            if recorded is None and self.config.replayFallback == "error":
+                return _error_response(404, f"No recorded response for request {key[:12]}.")
+
+        latency_ms = self.sample_latency_ms(recorded.get("latencyMs") if recorded else None)
+        if recorded is None and self.config.latencyPerKTokenMs:
+            latency_ms += len(_prompt_text(body).encode("utf-8")) / CHARS_PER_TOKEN / 1000 * self.config.latencyPerKTokenMs
+        await asyncio.sleep(latency_ms / 1000)
+
+        injected_error = self.maybe_injected_error()
+        if injected_error is not None:
+            return injected_error
+
+        if recorded is not None:
+            return JSONResponse(content=recorded["response"])
+        return JSONResponse(content=self.synthetic_completion(body, key))
+
+
+def create_stand_in_app(config: Optional[StandInConfig] = None) -> FastAPI:
+    """Builds the FastAPI app exposing the OpenAI-compatible endpoints."""
+    server = StandInServer(config or StandInConfig())
+    app = FastAPI(title="LLM Stand-in", description="Local OpenAI-compatible stand-in for offline benchmarking")
+    app.state.standIn = server
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if body.get("stream"):
+            return _error_response(400, "Streaming is not supported by the LLM stand-in.")
+        return await server.handle_chat_completion(body, request.headers.get("authorization"))
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": model, "object": "model", "owned_by": "stand-in"} for model in ("gpt-4o-mini", "gpt-4o")]}
+
+    @app.get("/stand-in/stats")
+    async def stats():
+        return {**server.stats, "transcriptEntries": len(server.transcript), "mode": server.config.mode}
+
+    return app
+
+
+def create_stand_in_client(app: FastAPI) -> httpx.AsyncClient:
+    """An httpx client that talks to the stand-in in-process, without opening a port."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://llm-stand-in/v1")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--mode", choices=["synthetic", "record", "replay"], default="synthetic")
+    parser.add_argument("--latency", dest="latencyDistribution", choices=["none", "fixed", "uniform", "normal", "lognormal", "recorded"], default="none")
+    parser.add_argument("--latency-ms", dest="latencyMs", type=float, default=0.0)
+    parser.add_argument("--latency-spread-ms", dest="latencySpreadMs", type=float, default=0.0)
+    parser.add_argument("--latency-per-ktoken-ms", dest="latencyPerKTokenMs", type=float, default=0.0)
+    parser.add_argument("--error-rate", dest="errorRate", type=float, default=0.0)
+    parser.add_argument("--error-status", dest="errorStatusCodes", type=int, nargs="+", default=[429, 500, 503])
+    parser.add_argument("--transcript", dest="transcriptPath", default=None)
+    parser.add_argument("--replay-fallback", dest="replayFallback", choices=["synthetic", "error"], default="synthetic")
+    parser.add_argument("--upstream-base-url", dest="upstreamBaseUrl", default="https://api.openai.com/v1")
+    parser.add_argument("--upstream-api-key", dest="upstreamApiKey", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    args = vars(_parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    uvicorn.run(create_stand_in_app(StandInConfig(**args)), host=host, port=port)
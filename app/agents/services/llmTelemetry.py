@@ -0,0 +1,171 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# USD per 1M tokens. Cached input is what the provider bills for prompt-cache hits.
+MODEL_PRICING_PER_1M = {
+    "gpt-4o-mini": {"input": 0.15, "cachedInput": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cachedInput": 1.25, "output": 10.00},
+    "gpt-4.1-mini": {"input": 0.40, "cachedInput": 0.10, "output": 1.60},
+    "gpt-4.1": {"input": 2.00, "cachedInput": 0.50, "output": 8.00},
+}
+
+def estimate_cost_usd(model_name: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """Estimates the cost of one call from its token usage. Unknown models are priced at 0."""
+    pricing = MODEL_PRICING_PER_1M.get(model_name)
+    if not pricing:
+        return 0.0
+    uncached_tokens = max(0, prompt_tokens - cached_tokens)
+    cost = (
+        uncached_tokens * pricing["input"]
+        + cached_tokens * pricing["cachedInput"]
+        + completion_tokens * pricing["output"]
+    ) / 1_000_000
+    return round(cost, 6)
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "wallTimeMs": 0.0,
+        "queueWaitMs": 0.0,
+        "promptTokens": 0,
+        "cachedPromptTokens": 0,
+        "completionTokens": 0,
+        "estimatedCostUSD": 0.0
+    }
+
+def _accumulate(totals: Dict[str, Any], record: Dict[str, Any]) -> None:
+    totals["calls"] += 1
+    totals["errors"] += 0 if record["status"] == "ok" else 1
+    for key in ("wallTimeMs", "queueWaitMs", "promptTokens", "cachedPromptTokens", "completionTokens", "estimatedCostUSD"):
+        totals[key] += record[key]
+
+def _finalize(totals: Dict[str, Any]) -> Dict[str, Any]:
+    totals["wallTimeMs"] = round(totals["wallTimeMs"], 1)
+    totals["queueWaitMs"] = round(totals["queueWaitMs"], 1)
+    totals["estimatedCostUSD"] = round(totals["estimatedCostUSD"], 6)
+    prompt_tokens = totals["promptTokens"]
+    totals["cacheHitRatio"] = round(totals["cachedPromptTokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+    return totals
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 1)
+
+
+class LLMTelemetry:
+    """
+    In-memory store of per-call LLM records, grouped by tender id.
+    Every record carries the tender, proposal, graph node and schema it belongs to.
+    Running per-tender totals are kept alongside, so the budget governor can
+    read them on every call without re-adding the tender's records.
+    """
+
+    def __init__(self):
+        self._recordsByTender: Dict[str, List[Dict[str, Any]]] = {}
+        self._totalsByTender: Dict[str, Dict[str, Any]] = {}
+        self._ruleEvaluationsByTender: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    def record_call(
+        self,
+        tender_id: Optional[str],
+        proposal_name: Optional[str],
+        node_name: Optional[str],
+        schema_name: str,
+        model_name: str,
+        queue_wait_ms: float,
+        wall_time_ms: float,
+        usage: Dict[str, int],
+        error: Optional[str] = None,
+        endpoint_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stores the record of one finished (or failed) LLM call and returns it."""
+        prompt_tokens = usage.get("promptTokens", 0)
+        cached_tokens = usage.get("cachedPromptTokens", 0)
+        completion_tokens = usage.get("completionTokens", 0)
+
+        record = {
+            "tenderId": tender_id or "unknown",
+            "proposal": proposal_name,
+            "node": node_name or "unknown",
+            "schema": schema_name,
+            "model": model_name,
+            "endpoint": endpoint_name,
+            "finishedAt": datetime.now().isoformat(),
+            "queueWaitMs": round(queue_wait_ms, 1),
+            "wallTimeMs": round(wall_time_ms, 1),
+            "promptTokens": prompt_tokens,
+            "cachedPromptTokens": cached_tokens,
+            "completionTokens": completion_tokens,
+            "estimatedCostUSD": estimate_cost_usd(model_name, prompt_tokens, cached_tokens, completion_tokens),
+            "status": "ok" if error is None else "error",
+            "error": error
+        }
+        self._recordsByTender.setdefault(record["tenderId"], []).append(record)
+        _accumulate(self._totalsByTender.setdefault(record["tenderId"], _empty_totals()), record)
+        return record
+
+    def record_rule_evaluation(self, tender_id: Optional[str], agent_source: str, decided: bool) -> None:
+        """Counts a requirement offered to the local rule engine, and whether it saved the LLM call."""
+        by_agent = self._ruleEvaluationsByTender.setdefault(tender_id or "unknown", {})
+        counts = by_agent.setdefault(agent_source, {"evaluated": 0, "decided": 0})
+        counts["evaluated"] += 1
+        counts["decided"] += 1 if decided else 0
+
+    def get_rule_engine_summary(self, tender_id: Optional[str]) -> Dict[str, Any]:
+        """Requirements decided locally and the fraction of specialist calls they skipped."""
+        by_agent = self._ruleEvaluationsByTender.get(tender_id or "unknown", {})
+        evaluated = sum(counts["evaluated"] for counts in by_agent.values())
+        decided = sum(counts["decided"] for counts in by_agent.values())
+        return {
+            "evaluated": evaluated,
+            "decided": decided,
+            "skippedCallFraction": round(decided / evaluated, 4) if evaluated else 0.0,
+            "byAgent": {agent: dict(counts) for agent, counts in by_agent.items()}
+        }
+
+    def get_records(self, tender_id: Optional[str]) -> List[Dict[str, Any]]:
+        return list(self._recordsByTender.get(tender_id or "unknown", []))
+
+    def has_records(self, tender_id: Optional[str]) -> bool:
+        return bool(self._recordsByTender.get(tender_id or "unknown"))
+
+    def get_totals(self, tender_id: Optional[str]) -> Dict[str, Any]:
+        """Totals of the tender's records, in constant time."""
+        return _finalize(dict(self._totalsByTender.get(tender_id or "unknown") or _empty_totals()))
+
+    def get_breakdown(self, tender_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Aggregates the tender's records into totals plus per-node, per-proposal
+        and per-schema groups, with p50/p95 call latency.
+        """
+        records = self._recordsByTender.get(tender_id or "unknown", [])
+        totals = _empty_totals()
+        groups: Dict[str, Dict[str, Dict[str, Any]]] = {"byNode": {}, "byProposal": {}, "bySchema": {}, "byEndpoint": {}}
+
+        for record in records:
+            _accumulate(totals, record)
+            _accumulate(groups["byNode"].setdefault(record["node"], _empty_totals()), record)
+            _accumulate(groups["byProposal"].setdefault(record["proposal"] or "(tender)", _empty_totals()), record)
+            _accumulate(groups["bySchema"].setdefault(record["schema"], _empty_totals()), record)
+            _accumulate(groups["byEndpoint"].setdefault(record["endpoint"] or "(none)", _empty_totals()), record)
+
+        latencies = sorted(record["wallTimeMs"] for record in records)
+        return {
+            "tenderId": tender_id,
+            "totals": _finalize(totals),
+            "latencyMs": {"p50": _percentile(latencies, 0.5), "p95": _percentile(latencies, 0.95), "max": latencies[-1] if latencies else 0.0},
+            "ruleEngine": self.get_rule_engine_summary(tender_id),
+            **{
+                group_name: {key: _finalize(value) for key, value in group.items()}
+                for group_name, group in groups.items()
+            }
+        }
+
+    def reset(self, tender_id: Optional[str]) -> None:
+        """Clears the records of a tender, before a new analysis run or once they are persisted."""
+        self._recordsByTender.pop(tender_id or "unknown", None)
+        self._totalsByTender.pop(tender_id or "unknown", None)
+        self._ruleEvaluationsByTender.pop(tender_id or "unknown", None)
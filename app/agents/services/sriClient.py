@@ -0,0 +1,279 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from ...core import constants
+from ...core.config import (
+    RUC_CHECKSUM_VALIDATION, SRI_BASE_URL, SRI_CACHE_TTL_HOURS, SRI_MAX_CONCURRENCY, SRI_TIMEOUT_SEC, SRI_LOOKUP_MODE
+)
+from .sriSnapshot import SRISnapshot
+
+SRI_RUC_PATH = "/sri-catastro-sujeto-servicio-internet/rest/ConsolidadoContribuyente/obtenerPorNumerosRuc"
+
+# Check digit coefficients of public-entity (third digit 6) and private-company (third digit 9) RUCs.
+PUBLIC_ENTITY_COEFFICIENTS = (3, 2, 7, 6, 5, 4, 3, 2)
+PRIVATE_COMPANY_COEFFICIENTS = (4, 3, 2, 7, 6, 5, 4, 3, 2)
+# Provinces 01-24, plus 30 for Ecuadorians registered abroad.
+PROVINCE_CODES = set(range(1, 25)) | {30}
+
+
+def _modulo_11(digits: str, coefficients: Tuple[int, ...]) -> Optional[int]:
+    remainder = sum(int(digit) * coefficient for digit, coefficient in zip(digits, coefficients)) % 11
+    check = 0 if remainder == 0 else 11 - remainder
+    return None if check == 10 else check
+
+
+def _modulo_10(digits: str) -> int:
+    total = 0
+    for index, digit in enumerate(digits):
+        product = int(digit) * (2 if index % 2 == 0 else 1)
+        total += product - 9 if product > 9 else product
+    return (10 - total % 10) % 10
+
+
+def ruc_format_error(ruc: str) -> Optional[str]:
+    """
+    Reason a RUC is malformed, or None if it is well formed: 13 digits, a valid
+    province, a known taxpayer type (third digit), a non-zero establishment
+    and a matching check digit (modulo 10 for natural persons, modulo 11 for
+    public entities and private companies).
+    """
+    if not ruc or not ruc.isdigit() or len(ruc) != 13:
+        return "a RUC has exactly 13 digits"
+    if int(ruc[:2]) not in PROVINCE_CODES:
+        return f"invalid province code {ruc[:2]}"
+
+    taxpayer_type = int(ruc[2])
+    if taxpayer_type == 6:
+        body, check_digit, establishment = ruc[:8], int(ruc[8]), ruc[9:]
+        expected = _modulo_11(body, PUBLIC_ENTITY_COEFFICIENTS)
+    elif taxpayer_type == 9:
+        body, check_digit, establishment = ruc[:9], int(ruc[9]), ruc[10:]
+        expected = _modulo_11(body, PRIVATE_COMPANY_COEFFICIENTS)
+    elif taxpayer_type < 6:
+        body, check_digit, establishment = ruc[:9], int(ruc[9]), ruc[10:]
+        expected = _modulo_10(body)
+    else:
+        return f"invalid taxpayer type digit {taxpayer_type}"
+
+    if not int(establishment):
+        return "the establishment number cannot be zero"
+    if expected != check_digit:
+        return "the check digit does not match"
+    return None
+
+
+class RucCache:
+    """
+    SRI answers by RUC, persisted as JSON (constants.SRI_CACHE_FILE by default)
+    so the same bidder is not looked up again on every tender it bids on.
+    Entries older than `ttl_sec` are ignored; a TTL of 0 disables the cache.
+    """
+
+    def __init__(self, ttl_sec: float, path: Optional[Path] = None):
+        self.ttl_sec = ttl_sec
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._loaded_from: Optional[Path] = None
+
+    def _file(self) -> Path:
+        return Path(self.path or constants.SRI_CACHE_FILE)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        path = self._file()
+        if self._entries is None or self._loaded_from != path:
+            self._entries, self._loaded_from = {}, path
+            if path.is_file():
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Warning: Could not read the RUC cache {path}: {e}")
+        return self._entries
+
+    def get(self, ruc: str) -> Optional[Dict[str, Any]]:
+        if self.ttl_sec <= 0:
+            return None
+        entry = self._load().get(ruc)
+        if entry is None or time.time() - entry.get("fetchedAt", 0) > self.ttl_sec:
+            return None
+        return entry["result"]
+
+    def put(self, ruc: str, result: Dict[str, Any]) -> None:
+        if self.ttl_sec <= 0:
+            return
+        entries = self._load()
+        entries[ruc] = {"result": result, "fetchedAt": time.time()}
+        path = self._file()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not save the RUC cache {path}: {e}")
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._file().unlink(missing_ok=True)
+
+
+class SRIClient:
+    """
+    Validates RUCs against the SRI catastro web service.
+    Malformed RUCs are rejected locally (see ruc_format_error). In "snapshot"
+    `lookup_mode`, RUCs found in a fresh offline `snapshot` of the catastro
+    are answered from it. Otherwise answers are reused from `cache`,
+    concurrent lookups of the same RUC share one request, and requests go
+    over one pooled HTTP client limited to `max_concurrency` at a time.
+    Results keep the shape of tools.validateRuc.
+    """
+
+    def __init__(
+        self,
+        base_url: str = SRI_BASE_URL,
+        max_concurrency: int = SRI_MAX_CONCURRENCY,
+        timeout_sec: float = SRI_TIMEOUT_SEC,
+        cache_ttl_hours: float = SRI_CACHE_TTL_HOURS,
+        lookup_mode: str = SRI_LOOKUP_MODE
+    ):
+        self.base_url = base_url
+        self.lookup_mode = lookup_mode
+        self.snapshot = SRISnapshot()
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_sec = timeout_sec
+        self.cache = RucCache(cache_ttl_hours * 3600)
+        self.http_async_client: Optional[httpx.AsyncClient] = None
+        self._owns_client = True
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._prefetches: Set["asyncio.Task[Any]"] = set()
+        self.stats = {"lookups": 0, "checksumRejections": 0, "snapshotHits": 0, "cacheHits": 0, "sriRequests": 0, "sriErrors": 0}
+
+    def configure(
+        self,
+        base_url: Optional[str] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None,
+        cache_path: Optional[Path] = None,
+        lookup_mode: Optional[str] = None,
+        snapshot: Optional[SRISnapshot] = None
+    ) -> None:
+        """Points the client at another SRI endpoint, such as the local stand-in. `http_async_client` allows an in-process transport."""
+        if base_url:
+            self.base_url = base_url
+        if cache_path is not None:
+            self.cache = RucCache(self.cache.ttl_sec, cache_path)
+        if lookup_mode:
+            self.lookup_mode = lookup_mode
+        if snapshot is not None:
+            self.snapshot = snapshot
+        if base_url or http_async_client is not None:
+            self.http_async_client = http_async_client
+            self._owns_client = http_async_client is None
+
+    def _bind_loop(self) -> None:
+        """Creates the pooled client and limits for the running event loop (tests and scripts run several loops)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._in_flight = {}
+            if self._owns_client:
+                self.http_async_client = None
+        if self.http_async_client is None:
+            self.http_async_client = httpx.AsyncClient(
+                timeout=self.timeout_sec,
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            )
+            self._owns_client = True
+
+    async def _fetch(self, ruc: str) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.stats["sriRequests"] += 1
+            try:
+                response = await self.http_async_client.get(f"{self.base_url.rstrip('/')}{SRI_RUC_PATH}", params={"ruc": ruc})
+                response.raise_for_status()
+                data = response.json()
+            except httpx.HTTPStatusError as e:
+                self.stats["sriErrors"] += 1
+                print(f"SRI ERROR: HTTP error validating RUC {ruc}: {e}")
+                return {"error": f"Failed to validate RUC. API returned status: {e.response.status_code}"}
+            except Exception as e:
+                self.stats["sriErrors"] += 1
+                print(f"SRI ERROR: An unexpected error occurred validating RUC {ruc}: {e!r}")
+                return {"error": f"An unexpected error occurred while validating RUC: {e}"}
+
+        if not data:
+            result = {"error": "No data returned from SRI for this RUC."}
+        else:
+            contributor_info = data[0]
+            result = {
+                "bidderName": contributor_info.get("razonSocial"),
+                "status": contributor_info.get("estadoContribuyenteRuc"),
+                "economicActivity": contributor_info.get("actividadEconomicaPrincipal")
+            }
+        # Only answers are cached; transport and HTTP errors are retried on the next lookup.
+        self.cache.put(ruc, result)
+        return result
+
+    async def validate(self, ruc: str) -> Dict[str, Any]:
+        """Returns the SRI record of a RUC ({bidderName, status, economicActivity}) or {"error": ...}."""
+        ruc = (ruc or "").strip()
+        self.stats["lookups"] += 1
+        if RUC_CHECKSUM_VALIDATION:
+            format_error = ruc_format_error(ruc)
+            if format_error:
+                self.stats["checksumRejections"] += 1
+                return {"error": f"Malformed RUC: {format_error}."}
+
+        if self.lookup_mode == "snapshot" and self.snapshot.is_fresh():
+            record = self.snapshot.lookup(ruc)
+            if record is not None:
+                self.stats["snapshotHits"] += 1
+                return record
+
+        cached = self.cache.get(ruc)
+        if cached is not None:
+            self.stats["cacheHits"] += 1
+            return cached
+
+        self._bind_loop()
+        pending = self._in_flight.get(ruc)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch(ruc))
+            self._in_flight[ruc] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(ruc, None))
+        # Shielded so a cancelled caller (e.g. a dropped proposal intake) does not cancel the others.
+        return await asyncio.shield(pending)
+
+    async def validate_many(self, rucs: Iterable[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Validates every distinct RUC concurrently and returns the results by RUC."""
+        unique = list(dict.fromkeys(ruc.strip() for ruc in rucs if ruc and ruc.strip()))
+        results = await asyncio.gather(*(self.validate(ruc) for ruc in unique))
+        return dict(zip(unique, results))
+
+    def prefetch(self, rucs: Iterable[Optional[str]]) -> Optional["asyncio.Task[Dict[str, Dict[str, Any]]]"]:
+        """
+        Starts validating `rucs` in the background so later lookups hit the
+        cache or join the request in flight. Returns None outside an event loop.
+        """
+        try:
+            task = asyncio.get_running_loop().create_task(self.validate_many(rucs))
+        except RuntimeError:
+            return None
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+        return task
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "lookupMode": self.lookup_mode, "snapshot": self.snapshot.info() if self.lookup_mode == "snapshot" else None}
+
+
+sriClient = SRIClient()
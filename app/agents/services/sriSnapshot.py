@@ -0,0 +1,235 @@
+"""
+Offline snapshot of the SRI taxpayer registry (catastro RUC) for RUC lookups.
+
+The SRI publishes the catastro as CSV exports (one per province, "|"
+separated, one row per establishment). `import_catastro_csv` loads them into
+a compact SQLite file keyed by RUC, so SRIClient can answer most lookups
+locally (SRI_LOOKUP_MODE=snapshot) and only call the live service for RUCs
+missing from the snapshot or when the snapshot is older than
+SRI_SNAPSHOT_MAX_AGE_DAYS.
+
+Import with:
+    python -m app.agents.services.sriSnapshot import SRI_RUC_Pichincha.csv SRI_RUC_Guayas.csv --snapshot-date 2026-10-01
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ...core import constants
+from ...core.config import SRI_SNAPSHOT_MAX_AGE_DAYS
+
+# Accepted header names (upper case) of each stored field in the catastro exports.
+CATASTRO_COLUMNS = {
+    "ruc": ("NUMERO_RUC", "RUC"),
+    "name": ("RAZON_SOCIAL", "NOMBRE"),
+    "status": ("ESTADO_CONTRIBUYENTE", "ESTADO_CONTRIBUYENTE_RUC", "ESTADO"),
+    "activity": ("ACTIVIDAD_ECONOMICA", "ACTIVIDAD_ECONOMICA_PRINCIPAL"),
+    "establishment": ("NUMERO_ESTABLECIMIENTO",),
+}
+CSV_DELIMITERS = ("|", ";", ",", "\t")
+IMPORT_BATCH_ROWS = 50000
+# The main establishment, whose activity describes the taxpayer.
+MAIN_ESTABLISHMENT = "001"
+
+
+def _detect_encoding(path: Path) -> str:
+    with open(path, "rb") as f:
+        sample = f.read(1 << 16)
+    try:
+        sample.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is still UTF-8.
+        return "utf-8-sig" if e.start >= len(sample) - 3 else "latin-1"
+
+
+def _column_indices(header: List[str]) -> Dict[str, Optional[int]]:
+    normalized = [name.strip().upper() for name in header]
+    indices = {}
+    for field, aliases in CATASTRO_COLUMNS.items():
+        indices[field] = next((normalized.index(alias) for alias in aliases if alias in normalized), None)
+    if indices["ruc"] is None:
+        raise ValueError(f"No RUC column (one of {CATASTRO_COLUMNS['ruc']}) in header: {header}")
+    return indices
+
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript("""
+        CREATE TABLE taxpayers (
+            ruc TEXT PRIMARY KEY,
+            name TEXT,
+            status TEXT,
+            activity TEXT
+        ) WITHOUT ROWID;
+        CREATE TABLE snapshot_info (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+    """)
+
+
+def import_catastro_csv(
+    csv_paths: Iterable[Path],
+    db_path: Optional[Path] = None,
+    snapshot_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Builds the snapshot from one or more catastro CSV exports and atomically
+    replaces the file at `db_path` (constants.SRI_SNAPSHOT_FILE by default).
+    The delimiter and encoding (UTF-8 or Latin-1) are detected per file; rows
+    of the main establishment win over the others of the same RUC.
+    `snapshot_date` (ISO date of the export) defaults to today.
+    """
+    started_at = time.perf_counter()
+    db_path = Path(db_path or constants.SRI_SNAPSHOT_FILE)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = db_path.with_suffix(".importing")
+    temp_path.unlink(missing_ok=True)
+
+    csv_paths = [Path(path) for path in csv_paths]
+    stats = {"files": len(csv_paths), "rows": 0, "skippedRows": 0}
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        _create_schema(connection)
+
+        for csv_path in csv_paths:
+            with open(csv_path, "r", encoding=_detect_encoding(csv_path), newline="") as f:
+                header_line = f.readline()
+                delimiter = max(CSV_DELIMITERS, key=header_line.count)
+                indices = _column_indices(next(csv.reader([header_line], delimiter=delimiter)))
+                main_rows, other_rows = [], []
+
+                def flush() -> None:
+                    # Main establishments overwrite; other establishments only fill RUCs not seen yet.
+                    connection.executemany("INSERT OR REPLACE INTO taxpayers VALUES (?, ?, ?, ?)", main_rows)
+                    connection.executemany("INSERT OR IGNORE INTO taxpayers VALUES (?, ?, ?, ?)", other_rows)
+                    main_rows.clear()
+                    other_rows.clear()
+
+                for row in csv.reader(f, delimiter=delimiter):
+                    stats["rows"] += 1
+                    values = {
+                        field: (row[index].strip() if index is not None and index < len(row) else None)
+                        for field, index in indices.items()
+                    }
+                    ruc = values["ruc"]
+                    if not ruc or not ruc.isdigit():
+                        stats["skippedRows"] += 1
+                        continue
+                    record = (ruc, values["name"], values["status"], values["activity"])
+                    is_main = values["establishment"] is None or values["establishment"].lstrip("0") in ("", "1")
+                    (main_rows if is_main else other_rows).append(record)
+                    if len(main_rows) + len(other_rows) >= IMPORT_BATCH_ROWS:
+                        flush()
+                flush()
+
+        stats["taxpayers"] = connection.execute("SELECT COUNT(*) FROM taxpayers").fetchone()[0]
+        info = {
+            "snapshotDate": snapshot_date or datetime.now(timezone.utc).date().isoformat(),
+            "importedAt": datetime.now(timezone.utc).isoformat(),
+            "sourceFiles": ", ".join(path.name for path in csv_paths),
+            "taxpayers": str(stats["taxpayers"]),
+        }
+        connection.executemany("INSERT INTO snapshot_info VALUES (?, ?)", info.items())
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(temp_path, db_path)
+    stats["seconds"] = round(time.perf_counter() - started_at, 2)
+    print(f"SRI snapshot imported into {db_path}: {stats}")
+    return stats
+
+
+class SRISnapshot:
+    """
+    Read-only RUC lookups in a snapshot built by `import_catastro_csv`.
+    The file is opened lazily and reopened when a new import replaces it.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age_days: float = SRI_SNAPSHOT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._connection: Optional[sqlite3.Connection] = None
+        self._opened_version: Optional[tuple] = None
+        self._info: Dict[str, str] = {}
+
+    def _file(self) -> Path:
+        return Path(self.path or constants.SRI_SNAPSHOT_FILE)
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        path = self._file()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        version = (str(path), stat.st_mtime_ns, stat.st_ino)
+        if self._connection is None or self._opened_version != version:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            self._info = dict(self._connection.execute("SELECT key, value FROM snapshot_info").fetchall())
+            self._opened_version = version
+        return self._connection
+
+    def info(self) -> Optional[Dict[str, Any]]:
+        """Snapshot date, import time, source files and size, or None if there is no snapshot."""
+        if self._open() is None:
+            return None
+        return {**self._info, "path": str(self._file()), "ageDays": self.age_days(), "isFresh": self.is_fresh()}
+
+    def age_days(self) -> Optional[float]:
+        if self._open() is None or "snapshotDate" not in self._info:
+            return None
+        snapshot_date = datetime.fromisoformat(self._info["snapshotDate"])
+        if snapshot_date.tzinfo is None:
+            snapshot_date = snapshot_date.replace(tzinfo=timezone.utc)
+        return round((datetime.now(timezone.utc) - snapshot_date).total_seconds() / 86400, 2)
+
+    def is_fresh(self) -> bool:
+        """True if the snapshot exists and is not older than `max_age_days` (0 = never too old)."""
+        age = self.age_days()
+        return age is not None and (self.max_age_days <= 0 or age <= self.max_age_days)
+
+    def lookup(self, ruc: str) -> Optional[Dict[str, Any]]:
+        """The validateRuc-shaped record of a RUC, or None if it is not in the snapshot."""
+        connection = self._open()
+        if connection is None:
+            return None
+        row = connection.execute("SELECT name, status, activity FROM taxpayers WHERE ruc = ?", (ruc,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "bidderName": row[0],
+            "status": row[1],
+            "economicActivity": row[2],
+            "snapshotDate": self._info.get("snapshotDate")
+        }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import or query the offline SRI taxpayer registry snapshot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import", help="Build the snapshot from catastro CSV exports.")
+    import_command.add_argument("csv_paths", nargs="+", type=Path)
+    import_command.add_argument("--db", type=Path, default=None, help="Snapshot file (default: data/sri_catastro.sqlite).")
+    import_command.add_argument("--snapshot-date", default=None, help="ISO date of the export (default: today).")
+    lookup_command = commands.add_parser("lookup", help="Look RUCs up in the snapshot.")
+    lookup_command.add_argument("rucs", nargs="+")
+    lookup_command.add_argument("--db", type=Path, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.command == "import":
+        import_catastro_csv(args.csv_paths, args.db, args.snapshot_date)
+    else:
+        snapshot = SRISnapshot(args.db)
+        print(snapshot.info())
+        for ruc in args.rucs:
+            print(ruc, snapshot.lookup(ruc))
@@ -0,0 +1,80 @@
+"""
+Local stand-in for the SRI catastro web service used to validate RUCs.
+
+Serves the same path and JSON shape as the real service from an in-memory
+registry, so RUC validation can be tested and benchmarked offline. SRIClient
+targets it through SRI_BASE_URL (or an in-process httpx client, see
+`create_sri_stand_in_client`).
+
+Run it with:
+    python -m app.agents.services.sriStandIn --port 8012 --registry registry.json --latency-ms 300
+"""
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from .sriClient import SRI_RUC_PATH
+
+
+class SRIStandInConfig(BaseModel):
+    """Behaviour of the SRI stand-in."""
+    registry: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Taxpayer records by RUC, with the SRI fields (razonSocial, estadoContribuyenteRuc, actividadEconomicaPrincipal)."
+    )
+    latencyMs: float = Field(default=0.0, description="Delay before every answer.")
+    failingRucs: List[str] = Field(default_factory=list, description="RUCs answered with a 503, to test error handling.")
+
+
+def create_sri_stand_in_app(config: Optional[SRIStandInConfig] = None) -> FastAPI:
+    """Builds the FastAPI app exposing the SRI RUC lookup."""
+    config = config or SRIStandInConfig()
+    app = FastAPI(title="SRI Stand-in", description="Local stand-in for the SRI catastro web service")
+    app.state.stats = {"requests": 0}
+
+    @app.get(SRI_RUC_PATH)
+    async def lookup_ruc(ruc: str):
+        app.state.stats["requests"] += 1
+        if config.latencyMs:
+            await asyncio.sleep(config.latencyMs / 1000)
+        if ruc in config.failingRucs:
+            return JSONResponse(status_code=503, content={"message": "Servicio no disponible"})
+        record = config.registry.get(ruc)
+        return [{"numeroRuc": ruc, **record}] if record else []
+
+    @app.get("/stand-in/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+def create_sri_stand_in_client(app: FastAPI) -> httpx.AsyncClient:
+    """An httpx client that talks to the stand-in in-process, without opening a port."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://sri-stand-in")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local stand-in for the SRI catastro web service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--registry", default=None, help="JSON file mapping RUC to its SRI record.")
+    parser.add_argument("--latency-ms", dest="latencyMs", type=float, default=0.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    args = _parse_args()
+    registry = {}
+    if args.registry:
+        with open(args.registry, "r", encoding="utf-8") as f:
+            registry = json.load(f)
+    uvicorn.run(create_sri_stand_in_app(SRIStandInConfig(registry=registry, latencyMs=args.latencyMs)), host=args.host, port=args.port)
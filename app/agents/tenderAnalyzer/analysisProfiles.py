@@ -0,0 +1,62 @@
+from typing import Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from ...core.config import DEFAULT_ANALYSIS_PROFILE
+
+
+class AnalysisProfile(BaseModel):
+    """
+    Depth/cost trade-off of one analysis: the model, concurrency and evidence
+    budget of each node. None means "use the configured default".
+    """
+    name: str
+    description: str
+    routerModel: str = "gpt-4o-mini"
+    specialistModel: str = "gpt-4o-mini"
+    summaryModel: str = "gpt-4o-mini"
+    evaluationMode: Optional[Literal["per_requirement", "per_annex", "per_proposal"]] = Field(
+        default=None, description="Specialist call granularity; SPECIALIST_EVALUATION_MODE if None."
+    )
+    auditWorkers: Optional[int] = Field(default=None, description="Audit pool workers; AUDIT_POOL_WORKERS if None.")
+    evidenceTopK: Optional[int] = Field(default=None, description="Annex passages per requirement; RETRIEVAL_EVIDENCE_TOP_K if None.")
+    formTopK: Optional[int] = Field(default=None, description="Form passages per requirement; RETRIEVAL_FORM_TOP_K if None.")
+    useRuleEngine: bool = Field(default=True, description="Let the rule engine decide clear-cut requirements without the LLM.")
+    llmAnnexMapping: bool = Field(default=True, description="Ask the LLM for the annexes the local resolver could not find.")
+    llmExecutiveSummary: bool = Field(default=True, description="Write the executive summary with the LLM instead of a template.")
+
+
+ANALYSIS_PROFILES: Dict[str, AnalysisProfile] = {
+    "triage": AnalysisProfile(
+        name="triage",
+        description="Quick screening: deterministic checks, small evidence windows, one call per proposal, template summary.",
+        evaluationMode="per_proposal",
+        evidenceTopK=2,
+        formTopK=1,
+        llmAnnexMapping=False,
+        llmExecutiveSummary=False
+    ),
+    "standard": AnalysisProfile(
+        name="standard",
+        description="The configured defaults."
+    ),
+    "forensic": AnalysisProfile(
+        name="forensic",
+        description="Final award review: every requirement reviewed by the larger model with wide evidence windows.",
+        specialistModel="gpt-4o",
+        summaryModel="gpt-4o",
+        evaluationMode="per_requirement",
+        auditWorkers=4,
+        evidenceTopK=8,
+        formTopK=4,
+        useRuleEngine=False
+    ),
+}
+
+
+def get_analysis_profile(name: Optional[str] = None) -> AnalysisProfile:
+    """Returns the named profile (DEFAULT_ANALYSIS_PROFILE if None). Raises ValueError for unknown names."""
+    profile = ANALYSIS_PROFILES.get(name or DEFAULT_ANALYSIS_PROFILE)
+    if profile is None:
+        raise ValueError(f"Unknown analysis profile '{name}'. Available: {', '.join(ANALYSIS_PROFILES)}")
+    return profile
@@ -0,0 +1,158 @@
+import difflib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .retrievalIndex import strip_accents, tokenize
+
+# Fraction of a requirement name's terms that must appear next to an annex reference.
+MIN_NAME_COVERAGE = 0.6
+FUZZY_CUTOFF = 0.85
+# Characters of text before a reference that still describe it.
+REFERENCE_CONTEXT_CHARS = 300
+
+_FILENAME_RE = re.compile(r"[\w\-.]+\.pdf", flags=re.IGNORECASE)
+_ANNEX_NUMBER_RE = re.compile(r"\banexo\s*(?:n[o°º]?\.?\s*)?0*(\d+)")
+_SEGMENT_END_RE = re.compile(r"\n|[.;](?:\s|$)")
+
+
+def normalize_annex_name(name: Optional[str]) -> str:
+    """Compares filenames flexibly: no case, accents, extension, or '_'/'-' separators."""
+    if not name:
+        return ""
+    name = strip_accents(name).lower().strip()
+    name = re.sub(r"\.pdf$", "", name)
+    return re.sub(r"[\s_\-.]+", " ", name).strip()
+
+
+def _annex_number(normalized_name: str) -> Optional[str]:
+    match = _ANNEX_NUMBER_RE.search(normalized_name)
+    return match.group(1) if match else None
+
+
+def _numbers(normalized_name: str) -> List[int]:
+    return [int(number) for number in re.findall(r"\d+", normalized_name)]
+
+
+class AnnexIndex:
+    """
+    Precomputed lookup from any spelling of an annex name ('ANEXO 1', 'anexo_01.pdf',
+    'Anexo No. 1') to the real key in the proposal's attachments.
+    """
+
+    def __init__(self, annex_keys: Iterable[str]):
+        self.keys = list(annex_keys)
+        self._by_normalized: Dict[str, str] = {}
+        self._by_compact: Dict[str, str] = {}
+        self._by_number: Dict[str, Optional[str]] = {}
+        for key in self.keys:
+            normalized = normalize_annex_name(key)
+            self._by_normalized.setdefault(normalized, key)
+            self._by_compact.setdefault(normalized.replace(" ", ""), key)
+            number = _annex_number(normalized)
+            if number is not None:
+                # Two annexes with the same number are ambiguous: resolve neither by number.
+                self._by_number[number] = None if number in self._by_number else key
+
+    def resolve(self, name: Optional[str]) -> Optional[str]:
+        """Returns the real annex key for a referenced name, or None."""
+        normalized = normalize_annex_name(name)
+        if not normalized:
+            return None
+        key = self._by_normalized.get(normalized) or self._by_compact.get(normalized.replace(" ", ""))
+        if key:
+            return key
+        number = _annex_number(normalized)
+        if number is not None and self._by_number.get(number):
+            return self._by_number[number]
+        # Fuzzy matching only absorbs typos in words: 'Anexo 9' must never become 'Anexo 1'.
+        numbers = _numbers(normalized)
+        candidates = [candidate for candidate in self._by_normalized if _numbers(candidate) == numbers]
+        close = difflib.get_close_matches(normalized, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return self._by_normalized[close[0]] if close else None
+
+
+def _fold_text(text: str) -> str:
+    """Lowercases and strips accents character by character, so offsets match the original text."""
+    folded = []
+    for char in text:
+        lowered = char.lower()
+        lowered = lowered if len(lowered) == 1 else char
+        plain = strip_accents(lowered)
+        folded.append(plain if len(plain) == 1 else lowered)
+    return "".join(folded)
+
+
+def find_annex_references(text: str, annex_index: AnnexIndex) -> List[Tuple[int, int, str]]:
+    """Finds '(start, end, annex key)' for every filename or 'Anexo N' mention that resolves."""
+    if not text:
+        return []
+    normalized_text = _fold_text(text)
+    references = []
+    for pattern in (_FILENAME_RE, _ANNEX_NUMBER_RE):
+        for match in pattern.finditer(normalized_text):
+            key = annex_index.resolve(match.group(0))
+            if key:
+                references.append((match.start(), match.end(), key))
+    references.sort()
+    # A filename like 'anexo_1.pdf' also matches the 'anexo 1' pattern: keep one per span.
+    deduped: List[Tuple[int, int, str]] = []
+    for reference in references:
+        if deduped and reference[0] < deduped[-1][1]:
+            continue
+        deduped.append(reference)
+    return deduped
+
+
+def _reference_segments(text: str, annex_index: AnnexIndex) -> List[Tuple[str, str]]:
+    """
+    Splits text into (segment, annex key) pairs. A segment is the text leading up
+    to a reference ('Patrimonio: ver Anexo_1.pdf') plus the rest of its sentence or
+    line ('Anexo 1 - Estados financieros' on index pages).
+    """
+    segments = []
+    previous_end = 0
+    for start, end, key in find_annex_references(text, annex_index):
+        context_start = max(previous_end, start - REFERENCE_CONTEXT_CHARS)
+        trailing = _SEGMENT_END_RE.search(text, end)
+        context_end = trailing.start() if trailing else len(text)
+        segments.append((text[context_start:context_end], key))
+        previous_end = max(end, context_end)
+    return segments
+
+
+def resolve_requirement_annexes(
+    requirement_names: List[str],
+    main_form_text: Optional[str],
+    annex_index_text: Optional[str],
+    annex_index: AnnexIndex
+) -> Dict[str, str]:
+    """
+    Maps requirement names to annex keys without an LLM, using the annex references
+    in the proposal form and its annex index page. A requirement is resolved when
+    most of its name appears next to references to exactly one annex; otherwise
+    it is left for the LLM mapper.
+    """
+    segments = [
+        (set(tokenize(segment)), key)
+        for text in (main_form_text, annex_index_text)
+        for segment, key in _reference_segments(text or "", annex_index)
+    ]
+    # Descriptive filenames ('Estados_Financieros.pdf') count as references to themselves.
+    segments += [(set(tokenize(normalize_annex_name(key))), key) for key in annex_index.keys]
+
+    resolved = {}
+    for name in requirement_names:
+        name_terms = set(tokenize(name))
+        if not name_terms:
+            continue
+        best_coverage = 0.0
+        best_keys = set()
+        for segment_terms, key in segments:
+            coverage = len(name_terms & segment_terms) / len(name_terms)
+            if coverage > best_coverage:
+                best_coverage, best_keys = coverage, {key}
+            elif coverage == best_coverage and coverage > 0:
+                best_keys.add(key)
+        if best_coverage >= MIN_NAME_COVERAGE and len(best_keys) == 1:
+            resolved[name] = best_keys.pop()
+    return resolved
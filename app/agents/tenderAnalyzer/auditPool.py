@@ -0,0 +1,404 @@
+import asyncio
+import itertools
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..services import llmService
+from ..services.documentStore import documentStore, proposal_namespace
+from ...core.config import AUDIT_POOL_WORKERS, AUDIT_POOL_SCHEDULING, PROPOSAL_AUDIT_DEADLINE_SEC, SPECIALIST_EVALUATION_MODE
+from .analysisProfiles import AnalysisProfile, get_analysis_profile
+from .schemas.masterChecklist import MasterChecklist, Requirement
+from .schemas.specialistTasks import SpecialistTask
+from .specialistNodes import (
+    projectManagerRouterNode,
+    compileProposalReportNode,
+    run_annex_batch,
+    run_disqualified_batch,
+    disqualification_reason,
+    timeout_finding,
+    error_finding,
+    SPECIALIST_TASK_KEYS,
+)
+
+
+class AuditJob:
+    """One specialist task, tagged with the proposal whose findings it belongs to."""
+
+    def __init__(self, proposal_index: int, agent_source: str, task: SpecialistTask):
+        self.proposal_index = proposal_index
+        self.agent_source = agent_source
+        self.task = task
+
+
+# Rough token estimates used to weigh calls against each other: a specialist
+# call costs its prompt and output overhead, each requirement it verifies,
+# and every distinct document text it sends.
+CHARS_PER_TOKEN = 4
+CALL_OVERHEAD_TOKENS = 800
+REQUIREMENT_TOKENS = 150
+
+# Coarser evaluation mode for proposals routed once the analysis nears its LLM budget,
+# or whose calls would not fit in what is left of it.
+BUDGET_DEGRADED_MODES = {"per_requirement": "per_annex", "per_annex": "per_proposal"}
+
+
+class _DispatchQueue:
+    """
+    Queue with the put_nowait/get interface of asyncio.Queue that hands out
+    the pending item with the lowest priority first, in insertion order among
+    equals. None sentinels always come after every real item.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._order = itertools.count()
+
+    def put_nowait(self, item: Any, priority: Tuple = ()) -> None:
+        if item is None:
+            priority = (math.inf,)
+        self._queue.put_nowait((priority, next(self._order), item))
+
+    async def get(self) -> Any:
+        return (await self._queue.get())[-1]
+
+
+class PoolProgress:
+    """Estimated work of an audit pool, in tokens, and the ETA it implies."""
+
+    def __init__(self, proposal_count: int):
+        self.proposal_count = proposal_count
+        self.routed_proposals = 0
+        self.estimated_tokens = 0
+        self.completed_tokens = 0
+        self.dispatch_started_at: Optional[float] = None
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time at the throughput seen so far; None until every proposal is routed and some work is done."""
+        if self.routed_proposals < self.proposal_count or not self.completed_tokens or self.dispatch_started_at is None:
+            return None
+        elapsed = time.perf_counter() - self.dispatch_started_at
+        return round(elapsed * (self.estimated_tokens - self.completed_tokens) / self.completed_tokens, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "routedProposals": self.routed_proposals,
+            "totalProposals": self.proposal_count,
+            "estimatedTokens": self.estimated_tokens,
+            "completedTokens": self.completed_tokens,
+            "etaSeconds": self.eta_seconds()
+        }
+
+
+def _document_tokens(handle: Optional[str]) -> int:
+    try:
+        return len(documentStore.get(handle)) // CHARS_PER_TOKEN
+    except KeyError:
+        return 0
+
+
+def estimate_unit_cost(jobs: List[AuditJob], unit: List[int]) -> int:
+    """Estimated tokens of the call that evaluates `unit` (indices into `jobs`)."""
+    handles = {ref for index in unit for ref in (jobs[index].task.evidenceRef, jobs[index].task.mainFormRef)}
+    return CALL_OVERHEAD_TOKENS + REQUIREMENT_TOKENS * len(unit) + sum(_document_tokens(handle) for handle in handles)
+
+
+def default_worker_count() -> int:
+    """AUDIT_POOL_WORKERS, or as many workers as the LLM scheduler has slots."""
+    return AUDIT_POOL_WORKERS if AUDIT_POOL_WORKERS > 0 else llmService.scheduler.capacity
+
+
+async def _drain_queue(
+    queue: _DispatchQueue,
+    handler: Callable[[Any], Awaitable[Any]],
+    worker_count: int,
+    on_done: Callable[[Any, Any], None]
+) -> None:
+    """
+    Runs `worker_count` workers over the (key, job) items of `queue`, calling
+    `on_done(key, result)` as each job completes. Producers may keep adding
+    items while workers run; each worker stops at the first None it takes.
+    If a worker fails or the drain is cancelled, the other workers are
+    cancelled too instead of being left running detached.
+    """
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            key, job = item
+            on_done(key, await handler(job))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, worker_count))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def _proposal_jobs(proposal_index: int, proposal_state: Dict[str, Any]) -> List[AuditJob]:
+    jobs = []
+    for agent_source, tasks_key in SPECIALIST_TASK_KEYS.items():
+        for task_dict in proposal_state.get(tasks_key) or []:
+            try:
+                task = SpecialistTask.model_validate(task_dict)
+            except Exception as e:
+                print(f"ERROR: Could not validate task_dict data: {e}")
+                continue
+            jobs.append(AuditJob(proposal_index, agent_source, task))
+    return jobs
+
+
+def _checklist_requirements(checklist: Any) -> List[Tuple[str, Requirement]]:
+    """(agentSource, requirement) pairs of a master checklist, or [] if it does not validate."""
+    try:
+        checklist = checklist if isinstance(checklist, MasterChecklist) else MasterChecklist.model_validate(checklist or {})
+    except Exception:
+        return []
+    return (
+        [("Financial", requirement) for requirement in checklist.financialRequirements]
+        + [("Technical", requirement) for requirement in checklist.technicalRequirements]
+        + [("Legal", requirement) for requirement in checklist.legalRequirements]
+    )
+
+
+def _group_jobs(jobs: List[AuditJob], evaluation_mode: str) -> List[List[int]]:
+    """
+    Splits job indices into units of work: one job per unit in "per_requirement"
+    mode, all jobs of a proposal that share an annex in "per_annex" mode, and
+    all jobs of a proposal in "per_proposal" mode.
+    """
+    if evaluation_mode not in ("per_annex", "per_proposal"):
+        return [[index] for index in range(len(jobs))]
+    units: Dict[Any, List[int]] = {}
+    for index, job in enumerate(jobs):
+        key = job.proposal_index if evaluation_mode == "per_proposal" else (job.proposal_index, job.task.annexKey)
+        units.setdefault(key, []).append(index)
+    return list(units.values())
+
+
+async def run_audit_pool(
+    subgraph_inputs: List[Dict[str, Any]],
+    worker_count: Optional[int] = None,
+    on_proposal_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    evaluation_mode: Optional[str] = None,
+    master_checklist: Optional[Dict[str, Any]] = None,
+    on_findings: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], None]] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    scheduling: Optional[str] = None,
+    deadline: Optional[float] = None,
+    proposal_deadline_sec: Optional[float] = None,
+    profile: Optional[AnalysisProfile] = None
+) -> List[Dict[str, Any]]:
+    """
+    Audits every proposal with the router and report compiler nodes, with
+    the specialist tasks of all proposals flattened into one bounded pool
+    instead of one serial loop per specialist and proposal.
+
+    1. The routers of all proposals run concurrently, sharing one validated
+       `master_checklist` (inputs may also carry their own). Each proposal's
+       tasks are queued as soon as its own router finishes. A router that
+       fails yields "not evaluated (error)" findings for that proposal only.
+    2. Every resulting SpecialistTask becomes one job in a shared queue
+       ("per_annex" mode queues one job per proposal annex instead, see
+       run_annex_batch). Each call's cost is estimated from its task count
+       and evidence tokens; with "lpt" scheduling pending calls are
+       dispatched longest first (the larger proposal first among equals), so
+       the calls of a large proposal routed last do not set the finish time
+       alone.
+       `on_progress` receives the estimated and completed work and the ETA.
+    3. Findings are streamed through `on_findings(proposal_state, findings)` as
+       each call returns, then routed back into their proposal's `findings`.
+       Each proposal's report is compiled as soon as its last job finishes (and
+       its documents are released from the documentStore), so a slow proposal
+       only delays itself.
+    4. Each proposal must finish within `proposal_deadline_sec` of entering
+       the pool (PROPOSAL_AUDIT_DEADLINE_SEC by default) and before the
+       absolute `deadline` (time.monotonic()). Calls still pending or running
+       when it expires, or a router that does not finish in time, yield
+       "not evaluated (timeout)" findings and the report is compiled anyway.
+    5. Once a proposal is disqualified under the early-termination policy
+       (see disqualification_reason), its calls not yet started are skipped
+       and recorded as such in its report.
+    6. A proposal is evaluated in coarser batches (see BUDGET_DEGRADED_MODES)
+       when the analysis nears its LLM budget or when its estimated calls,
+       added to those already queued, would not fit in the budget left.
+
+    `profile` (see analysisProfiles) sets the specialist model, the rule
+    engine, the default evaluation mode and the worker count.
+
+    Returns one final ProposalAuditState per input, in input order.
+    """
+    proposal_states: List[Dict[str, Any]] = [dict(state, findings=list(state.get("findings") or [])) for state in subgraph_inputs]
+    profile = profile or get_analysis_profile()
+    mode = evaluation_mode or profile.evaluationMode or SPECIALIST_EVALUATION_MODE
+    workers = worker_count or profile.auditWorkers or default_worker_count()
+    longest_first = (scheduling or AUDIT_POOL_SCHEDULING) == "lpt"
+    per_proposal_sec = PROPOSAL_AUDIT_DEADLINE_SEC if proposal_deadline_sec is None else proposal_deadline_sec
+
+    shared_checklist: Any = master_checklist
+    if master_checklist is not None:
+        try:
+            shared_checklist = MasterChecklist.model_validate(master_checklist)
+        except Exception as e:
+            print(f"ERROR: Could not validate MasterChecklist schema: {e}")
+
+    jobs_by_proposal: List[List[AuditJob]] = [[] for _ in proposal_states]
+    findings_by_proposal: List[Dict[int, Dict[str, Any]]] = [{} for _ in proposal_states]
+    queue = _DispatchQueue()
+    progress = PoolProgress(len(proposal_states))
+    proposal_deadlines: List[Optional[float]] = [None for _ in proposal_states]
+    disqualifications: List[Optional[str]] = [None for _ in proposal_states]
+    # Estimated calls and tokens queued but not finished yet, weighed against the LLM budget.
+    planned = {"calls": 0, "tokens": 0}
+
+    def time_left(proposal_index: int) -> Optional[float]:
+        """Seconds until the proposal's deadline, None without one."""
+        limit = proposal_deadlines[proposal_index]
+        return None if limit is None else max(0.0, limit - time.monotonic())
+
+    def exceeds_budget(tender_id: Optional[str], unit_costs: List[int]) -> bool:
+        if llmService.budget.is_degraded(tender_id):
+            return True
+        headroom = llmService.budget.headroom(tender_id)
+        if headroom is None:
+            return False
+        return (
+            (headroom["calls"] is not None and planned["calls"] + len(unit_costs) > headroom["calls"])
+            or (headroom["tokens"] is not None and planned["tokens"] + sum(unit_costs) > headroom["tokens"])
+        )
+
+    def report_progress() -> None:
+        if on_progress:
+            on_progress(progress.snapshot())
+
+    def compile_report(proposal_index: int) -> None:
+        proposal_state = proposal_states[proposal_index]
+        proposal_state.update(compileProposalReportNode(proposal_state))
+        documentStore.release(proposal_namespace(proposal_state.get("tenderId"), proposal_state.get("proposal", {})))
+        if on_proposal_done:
+            on_proposal_done(proposal_state)
+
+    async def route(proposal_index: int) -> None:
+        proposal_state = proposal_states[proposal_index]
+        router_input = {**proposal_state, "analysisProfile": profile.name}
+        if shared_checklist is not None:
+            router_input["masterChecklist"] = shared_checklist
+        limits = [limit for limit in (deadline, time.monotonic() + per_proposal_sec if per_proposal_sec > 0 else None) if limit is not None]
+        proposal_deadlines[proposal_index] = min(limits) if limits else None
+        try:
+            update = await asyncio.wait_for(projectManagerRouterNode(router_input), time_left(proposal_index))
+        except asyncio.TimeoutError:
+            print(f"Audit pool: routing timed out for {proposal_state.get('proposal', {}).get('companyName')}.")
+            update = {"findings": [
+                timeout_finding(agent_source, requirement)
+                for agent_source, requirement in _checklist_requirements(router_input.get("masterChecklist"))
+            ]}
+        except Exception as e:
+            # A document that cannot be loaded or a failed annex-map call only affects this proposal.
+            print(f"Audit pool: routing failed for {proposal_state.get('proposal', {}).get('companyName')}: {e}")
+            update = {"findings": [
+                error_finding(agent_source, requirement, e)
+                for agent_source, requirement in _checklist_requirements(router_input.get("masterChecklist"))
+            ]}
+        router_findings = update.pop("findings", [])
+        proposal_state["findings"] = proposal_state["findings"] + router_findings
+        proposal_state.update(update)
+        if router_findings and on_findings:
+            on_findings(proposal_state, router_findings)
+
+        jobs = _proposal_jobs(proposal_index, proposal_state)
+        jobs_by_proposal[proposal_index] = jobs
+        progress.routed_proposals += 1
+        disqualifications[proposal_index] = disqualification_reason(proposal_state["findings"])
+        if not jobs:
+            compile_report(proposal_index)
+            report_progress()
+            return
+        proposal_mode = mode
+        units = _group_jobs(jobs, proposal_mode)
+        unit_costs = [estimate_unit_cost(jobs, unit) for unit in units]
+        tender_id = proposal_state.get("tenderId")
+        while proposal_mode in BUDGET_DEGRADED_MODES and exceeds_budget(tender_id, unit_costs):
+            llmService.budget.note_degradation(tender_id, "batchedEvaluation")
+            proposal_mode = BUDGET_DEGRADED_MODES[proposal_mode]
+            units = _group_jobs(jobs, proposal_mode)
+            unit_costs = [estimate_unit_cost(jobs, unit) for unit in units]
+        proposal_cost = sum(unit_costs)
+        planned["calls"] += len(units)
+        planned["tokens"] += proposal_cost
+        progress.estimated_tokens += proposal_cost
+        if progress.dispatch_started_at is None:
+            progress.dispatch_started_at = time.perf_counter()
+        print(f"Audit pool: queued {len(jobs)} specialist tasks in {len(units)} calls (~{proposal_cost} tokens) for {proposal_state.get('proposal', {}).get('companyName')}.")
+        for unit, unit_cost in zip(units, unit_costs):
+            priority = (-unit_cost, -proposal_cost, proposal_index) if longest_first else ()
+            queue.put_nowait(((proposal_index, unit, unit_cost), (proposal_index, unit)), priority)
+        report_progress()
+
+    async def route_all() -> None:
+        try:
+            await asyncio.gather(*(route(proposal_index) for proposal_index in range(len(proposal_states))))
+        finally:
+            for _ in range(workers):
+                queue.put_nowait(None)
+
+    def unit_done(key: Any, findings: List[Dict[str, Any]]) -> None:
+        proposal_index, unit, unit_cost = key
+        progress.completed_tokens += unit_cost
+        planned["calls"] -= 1
+        planned["tokens"] -= unit_cost
+        proposal_state = proposal_states[proposal_index]
+        for job_index, finding in zip(unit, findings):
+            findings_by_proposal[proposal_index][job_index] = finding
+        if disqualifications[proposal_index] is None:
+            disqualifications[proposal_index] = disqualification_reason(
+                proposal_state["findings"] + list(findings_by_proposal[proposal_index].values())
+            )
+            if disqualifications[proposal_index]:
+                print(f"Audit pool: {proposal_state.get('proposal', {}).get('companyName')} disqualified ({disqualifications[proposal_index]}), skipping its remaining calls.")
+        if on_findings:
+            on_findings(proposal_state, findings)
+
+        jobs = jobs_by_proposal[proposal_index]
+        if len(findings_by_proposal[proposal_index]) == len(jobs):
+            # Keep findings in task order regardless of completion order.
+            proposal_state["findings"] = proposal_state["findings"] + [
+                findings_by_proposal[proposal_index][job_index] for job_index in range(len(jobs))
+            ]
+            compile_report(proposal_index)
+        report_progress()
+
+    async def handle(item: Any) -> List[Dict[str, Any]]:
+        proposal_index, unit = item
+        proposal_state = proposal_states[proposal_index]
+        jobs = jobs_by_proposal[proposal_index]
+        batch = [(jobs[index].agent_source, jobs[index].task) for index in unit]
+        if disqualifications[proposal_index]:
+            return await run_disqualified_batch(batch, disqualifications[proposal_index], proposal_state.get("tenderId"))
+        remaining = time_left(proposal_index)
+        if remaining != 0:
+            try:
+                return await asyncio.wait_for(run_annex_batch(
+                    batch,
+                    tender_id=proposal_state.get("tenderId"),
+                    proposal_name=proposal_state.get("proposal", {}).get("companyName"),
+                    model_name=profile.specialistModel,
+                    use_rules=profile.useRuleEngine
+                ), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return [timeout_finding(agent_source, task.requirementToVerify) for agent_source, task in batch]
+
+    print(f"Audit pool: {len(proposal_states)} proposals on {workers} workers ({'longest first' if longest_first else 'in routing order'}).")
+    tasks = [asyncio.ensure_future(route_all()), asyncio.ensure_future(_drain_queue(queue, handle, workers, unit_done))]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # If the pool fails, no router or specialist call may outlive it (the
+        # caller releases the budget and the documentStore right after).
+        for task in tasks:
+            task.cancel()
+
+    return proposal_states
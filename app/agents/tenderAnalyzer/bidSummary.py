@@ -0,0 +1,287 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ...core.constants import PAGE_SEPARATOR
+from .ruleEngine import NUMBER_PATTERN, find_amounts, parse_number
+
+# Following lines read as the value of a label that has none on its own line (table cells extracted one per line).
+VALUE_LOOKAHEAD_LINES = 2
+# Relative tolerance for the price table items to add up to the total (or subtotal) they precede.
+ITEMS_TOTAL_TOLERANCE = 0.01
+TOTAL_CATEGORY = "Total"
+
+_NUMBER_RE = re.compile(rf"(?<![\d.,])({NUMBER_PATTERN})(?!\d)(\s*%)?")
+_LETTERS_RE = re.compile(r"[a-z]{3}")
+_DIGIT_RE = re.compile(r"\d")
+_CELL_SPLIT_RE = re.compile(r"\s*(?:\||\t|\s{2,})\s*")
+_VALUE_CELL_RE = re.compile(rf"^(?:us\$|usd|\$)?\s*(?:{NUMBER_PATTERN})\s*(?:usd|dolares)?$")
+# A following line may hold the value if it starts with one ('1.250.000,00', '$ 80.000', '(120) dias').
+_VALUE_START_RE = re.compile(r"^[\s|:]*(?:us\$|usd|\$|\(|\d)")
+
+_TOTAL_LABEL_RE = re.compile(
+    r"\b(?:valor|monto|precio|importe|presupuesto)\s+(?:total|global)\b"
+    r"|\btotal\s+(?:de\s+(?:la\s+)?)?(?:oferta|propuesta|ofertado|general)\b"
+    r"|\b(?:valor|monto|precio)\s+(?:de\s+(?:la\s+)?)?(?:oferta|propuesta)\b"
+    r"|\b(?:valor|monto|precio)\s+ofertado\b"
+)
+# First cell of a price table's total row; 'Total IVA' is a tax line, not the total.
+_TOTAL_ROW_RE = re.compile(r"^total\b(?!\s+(?:del\s+)?iva\b)")
+_NOT_ITEM_RE = re.compile(r"\bsub\s*-?\s*total\b|\biva\b|\bdescuento")
+_SUBTOTAL_RE = re.compile(r"\bsub\s*-?\s*total\b")
+
+_DELIVERY_LABEL_RE = re.compile(
+    r"\b(?:plazo|tiempo)\s+(?:de|para)\s+(?:la\s+)?(?:entrega|ejecucion|cumplimiento)\b"
+    r"|\bplazo\s+(?:ofertado|de\s+(?:la\s+)?(?:obra|contrato|servicio))\b"
+)
+_DURATION_RE = re.compile(r"\(?\s*(\d+(?:[.,]\d+)?)\s*\)?\s*(dias?|semanas?|mes(?:es)?|anos?)\b(\s+(?:habiles|laborables))?")
+_DAYS_PER_UNIT = {"dia": 1, "semana": 7, "mes": 30, "ano": 365}
+
+# Label of each ratio in the financial section of the form (SERCOP indices).
+_RATIO_LABELS = {
+    "solvencyIndex": re.compile(r"\bsolvencia\b"),
+    "liquidityIndex": re.compile(r"\bliquidez\b|\brazon\s+corriente\b"),
+    "debtRatio": re.compile(r"\bendeudamiento\b"),
+}
+_ANY_RATIO_LABEL_RE = re.compile("|".join(label.pattern for label in _RATIO_LABELS.values()))
+# Ratios are small numbers; anything larger on the line is an amount.
+MAX_RATIO_VALUE = 100
+
+
+def _fold(line: str) -> str:
+    """Lower-case ASCII copy for matching: accents removed, other symbols dropped."""
+    return unicodedata.normalize("NFKD", line.lower()).encode("ascii", "ignore").decode("ascii")
+
+
+class _Line(NamedTuple):
+    page: int
+    text: str
+    folded: str
+
+
+def _lines(main_form_text: str) -> List[_Line]:
+    """Non-empty lines with their page number, plus an accent-free lower-case copy for matching."""
+    lines = []
+    for page, page_text in enumerate((main_form_text or "").split(PAGE_SEPARATOR), start=1):
+        for line in page_text.splitlines():
+            if line.strip():
+                lines.append(_Line(page, line.strip(), _fold(line.strip())))
+    return lines
+
+
+def _numbers(text: str) -> List[Tuple[float, bool]]:
+    """(value, is_percentage) of every number in the text."""
+    return [(parse_number(match.group(1)), bool(match.group(2))) for match in _NUMBER_RE.finditer(text)]
+
+
+def _value_texts(lines: List[_Line], index: int, label_end: int) -> Iterable[Tuple[str, int]]:
+    """The rest of a label's line, then the following value lines of the same page, with their indices."""
+    yield lines[index].folded[label_end:], index
+    for offset in range(1, VALUE_LOOKAHEAD_LINES + 1):
+        following = index + offset
+        if following >= len(lines) or lines[following].page != lines[index].page:
+            return
+        if not _VALUE_START_RE.match(lines[following].folded):
+            return
+        yield lines[following].folded, following
+
+
+def _amount(text: str) -> Optional[float]:
+    """The amount in a value text: its largest money figure, otherwise its largest non-percentage number."""
+    amounts = find_amounts(text)
+    if not amounts:
+        amounts = [value for value, is_percentage in _numbers(text) if not is_percentage]
+    return max(amounts) if amounts else None
+
+
+def _row(line: _Line) -> Optional[Tuple[str, str, float]]:
+    """(label, folded label, amount) of a table row whose first text cell is a label and last cell an amount."""
+    if not _DIGIT_RE.search(line.folded, len(line.folded) - 12):
+        return None
+    cells = _CELL_SPLIT_RE.split(line.text.strip(" |"))
+    folded_cells = _CELL_SPLIT_RE.split(line.folded.strip(" |"))
+    if len(cells) < 2 or len(cells) != len(folded_cells) or not _VALUE_CELL_RE.match(folded_cells[-1]):
+        return None
+    label_index = next((i for i, cell in enumerate(folded_cells[:-1]) if _LETTERS_RE.search(cell)), None)
+    if label_index is None:
+        return None
+    return cells[label_index], folded_cells[label_index], _amount(folded_cells[-1])
+
+
+def _table_rows(lines: List[_Line]) -> Dict[int, Tuple[str, str, float, int]]:
+    """
+    Table rows by the index of their first line: (label, folded label, amount, last line index).
+    A label-only line followed by an amount-only line is one row.
+    """
+    rows = {}
+    for index, line in enumerate(lines):
+        row = _row(line)
+        if row:
+            rows[index] = (*row, index)
+            continue
+        following = index + 1
+        if (
+            following < len(lines) and lines[following].page == line.page
+            and _LETTERS_RE.search(line.folded) and not _DIGIT_RE.search(line.folded)
+            and _VALUE_CELL_RE.match(lines[following].folded.strip(" |"))
+        ):
+            rows[index] = (line.text.strip(" |:"), line.folded.strip(" |:"), _amount(lines[following].folded), following)
+    return rows
+
+
+def _total_candidates(lines: List[_Line], rows: Dict[int, Tuple[str, str, float, int]]) -> List[Tuple[int, float]]:
+    """(line index, amount) of every labelled total: explicit labels first, then price table total rows."""
+    labelled, table_totals = [], []
+    for index, line in enumerate(lines):
+        match = _TOTAL_LABEL_RE.search(line.folded)
+        if match:
+            for text, _ in _value_texts(lines, index, match.end()):
+                amount = _amount(text)
+                if amount:
+                    labelled.append((index, amount))
+                    break
+        elif index in rows and _TOTAL_ROW_RE.match(rows[index][1]) and rows[index][2]:
+            table_totals.append((index, rows[index][2]))
+    return labelled + table_totals
+
+
+def _budget_items(
+    lines: List[_Line],
+    rows: Dict[int, Tuple[str, str, float, int]],
+    total_index: int,
+    total: float
+) -> List[Dict[str, Any]]:
+    """
+    Price table rows right above a total, kept only if they add up to it (or
+    to the subtotal among them), so unrelated figures are never charted.
+    """
+    row_ends = {end: start for start, (_, _, _, end) in rows.items()}
+    items, subtotal = [], None
+    index = total_index - 1
+    while index in row_ends and lines[index].page == lines[total_index].page:
+        start = row_ends[index]
+        label, folded_label, amount, _ = rows[start]
+        if _TOTAL_ROW_RE.match(folded_label) or _TOTAL_LABEL_RE.search(folded_label):
+            # The total of a table above this one.
+            break
+        if _SUBTOTAL_RE.search(folded_label):
+            subtotal = amount
+        elif not _NOT_ITEM_RE.search(folded_label) and amount:
+            items.append({"category": label, "amountUSD": amount})
+        index = start - 1
+    items.reverse()
+
+    items_sum = sum(item["amountUSD"] for item in items)
+    if len(items) < 2 or not any(
+        target and abs(items_sum - target) <= ITEMS_TOTAL_TOLERANCE * target for target in (total, subtotal)
+    ):
+        return []
+    return items
+
+
+def _delivery(lines: List[_Line]) -> Optional[Tuple[float, int]]:
+    """(calendar days, page) of the offered delivery or execution term."""
+    for index, line in enumerate(lines):
+        match = _DELIVERY_LABEL_RE.search(line.folded)
+        if not match:
+            continue
+        for text, _ in _value_texts(lines, index, match.end()):
+            duration = _DURATION_RE.search(text)
+            if duration:
+                unit = duration.group(2).rstrip("s").replace("mese", "mes")
+                days = parse_number(duration.group(1)) * _DAYS_PER_UNIT[unit]
+                if duration.group(3):
+                    # Working days: five per calendar week.
+                    days = days * 7 / 5
+                return days, line.page
+    return None
+
+
+def _financial_ratios(lines: List[_Line]) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """The bidder's declared financial indices, with the page of each. The last figure of a line is the bidder's (after any required minimum)."""
+    ratios, pages = {}, {}
+    for index, line in enumerate(lines):
+        if not _ANY_RATIO_LABEL_RE.search(line.folded):
+            continue
+        for name, label in _RATIO_LABELS.items():
+            match = label.search(line.folded)
+            if name in ratios or not match:
+                continue
+            for text, _ in _value_texts(lines, index, match.end()):
+                if find_amounts(text):
+                    break
+                numbers = [value / 100 if is_percentage else value for value, is_percentage in _numbers(text)]
+                numbers = [value for value in numbers if value < MAX_RATIO_VALUE]
+                if numbers:
+                    ratios[name], pages[name] = round(numbers[-1], 4), line.page
+                    break
+    return ratios, pages
+
+
+def extract_bid_summary(main_form_text: str) -> Dict[str, Any]:
+    """
+    Reads the bid's total amount, delivery term, price table items and
+    financial indices from the proposal's main form, with regular expressions
+    and table-row parsing over its page-separated text (no LLM call). Values
+    that cannot be found are None (or absent); `sourcePages` cites where each
+    one was read.
+    """
+    lines = _lines(main_form_text)
+    rows = _table_rows(lines)
+    summary: Dict[str, Any] = {"totalAmountUSD": None, "deliveryMonths": None, "deliveryDays": None, "budgetItems": []}
+    source_pages: Dict[str, int] = {}
+
+    candidates = _total_candidates(lines, rows)
+    if candidates:
+        total_index, total = candidates[0]
+        summary["totalAmountUSD"] = round(total, 2)
+        source_pages["totalAmountUSD"] = lines[total_index].page
+        for index, amount in candidates:
+            items = _budget_items(lines, rows, index, amount)
+            if items:
+                summary["budgetItems"] = items
+                source_pages["budgetItems"] = lines[index].page
+                break
+
+    delivery = _delivery(lines)
+    if delivery:
+        days, page = delivery
+        summary["deliveryDays"] = int(round(days))
+        summary["deliveryMonths"] = round(days / _DAYS_PER_UNIT["mes"], 1)
+        source_pages["deliveryMonths"] = page
+
+    ratios, ratio_pages = _financial_ratios(lines)
+    summary["financialRatios"] = ratios
+    source_pages.update(ratio_pages)
+    summary["sourcePages"] = source_pages
+    return summary
+
+
+def _category_key(category: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", _fold(category)).strip()
+
+
+def build_budget_comparison(analyses: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The budgetComparison chart data: the total amount and each price table
+    category (matched across bidders ignoring case and accents) per proposal.
+    Values a proposal does not state are None.
+    """
+    analyses = list(analyses)
+    categories: Dict[str, str] = {}
+    for analysis in analyses:
+        for item in (analysis.get("summaryData") or {}).get("budgetItems", []):
+            categories.setdefault(_category_key(item["category"]), item["category"])
+    keys = [_category_key(TOTAL_CATEGORY), *[key for key in categories if key != _category_key(TOTAL_CATEGORY)]]
+
+    proposals = []
+    for analysis in analyses:
+        summary = analysis.get("summaryData") or {}
+        amounts = {_category_key(item["category"]): item["amountUSD"] for item in summary.get("budgetItems", [])}
+        amounts[_category_key(TOTAL_CATEGORY)] = summary.get("totalAmountUSD")
+        proposals.append({"bidderName": analysis.get("bidderName", "Unknown"), "valuesUSD": [amounts.get(key) for key in keys]})
+
+    return {
+        "categories": [TOTAL_CATEGORY, *[categories[key] for key in keys[1:]]],
+        "proposals": proposals
+    }
@@ -0,0 +1,77 @@
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ...core import constants
+from ...core.config import MASTER_CHECKLIST_SECTION_CHARS
+from .prompts import CREATE_MASTER_CHECKLIST_PROMPT, MASTER_CHECKLIST_SECTION_INSTRUCTION
+from .schemas.masterChecklist import MasterChecklist
+
+MASTER_CHECKLIST_FILENAME = "master_checklist.json"
+
+# Changes whenever the extraction prompts or the checklist schema change, invalidating old entries.
+MASTER_CHECKLIST_PROMPT_VERSION = hashlib.sha256(
+    (
+        CREATE_MASTER_CHECKLIST_PROMPT + MASTER_CHECKLIST_SECTION_INSTRUCTION
+        + json.dumps(MasterChecklist.model_json_schema(), sort_keys=True)
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+def checklist_cache_key(tender_text: str, section_chars: Optional[int] = None) -> str:
+    """
+    Hash of the cleaned tender text, the prompt version and the section size
+    (MASTER_CHECKLIST_SECTION_CHARS by default), which decides how the tender
+    is split for extraction.
+    """
+    digest = hashlib.sha256()
+    digest.update(MASTER_CHECKLIST_PROMPT_VERSION.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(str(MASTER_CHECKLIST_SECTION_CHARS if section_chars is None else section_chars).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((tender_text or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _checklist_path(tender_id: str) -> Path:
+    return constants.TENDERS_DIR / f"tender_{tender_id}" / MASTER_CHECKLIST_FILENAME
+
+
+def load_checklist_entry(tender_id: str) -> Optional[Dict[str, Any]]:
+    """Returns the persisted checklist entry of a tender (checklist plus cache metadata), if any."""
+    checklist_path = _checklist_path(tender_id)
+    if not checklist_path.is_file():
+        return None
+    try:
+        with open(checklist_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read cached master checklist for tender {tender_id}: {e}")
+        return None
+
+
+def load_cached_checklist(tender_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+    """Returns the cached MasterChecklist only if it was built from the same text and prompt."""
+    entry = load_checklist_entry(tender_id)
+    if not entry or entry.get("cacheKey") != cache_key:
+        return None
+    return entry.get("masterChecklist")
+
+
+def save_cached_checklist(tender_id: str, cache_key: str, checklist: Dict[str, Any]) -> None:
+    checklist_path = _checklist_path(tender_id)
+    entry = {
+        "tenderId": tender_id,
+        "cacheKey": cache_key,
+        "promptVersion": MASTER_CHECKLIST_PROMPT_VERSION,
+        "createdAt": datetime.now().isoformat(),
+        "masterChecklist": checklist
+    }
+    try:
+        checklist_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(checklist_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not save master checklist for tender {tender_id}: {e}")
@@ -0,0 +1,112 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .tenderSections import CHECKLIST_KEYS, normalize_requirement_name
+
+SHINGLE_SIZE = 4
+# Names this similar are duplicates when both requirements cite the same distinctive figure
+# ('Patrimonio mínimo >= $80,187.24' / 'Patrimonio requerido: $80.187,24').
+NAME_THRESHOLD_WITH_SAME_FIGURES = 0.3
+
+
+def _shingles(text: str) -> set:
+    padded = f" {text} "
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def _numbers(text: str) -> frozenset:
+    return frozenset(re.sub(r"[.,]", "", number) for number in re.findall(r"\d[\d.,]*\d|\d", text))
+
+
+def jaccard_matrix(texts: List[str]) -> np.ndarray:
+    """Pairwise Jaccard similarity of the character shingles of `texts`."""
+    shingle_sets = [_shingles(text) for text in texts]
+    vocabulary = {shingle: index for index, shingle in enumerate(set().union(*shingle_sets))} if shingle_sets else {}
+    incidence = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    for row, shingles in enumerate(shingle_sets):
+        incidence[row, [vocabulary[shingle] for shingle in shingles]] = 1.0
+
+    intersections = incidence @ incidence.T
+    sizes = incidence.sum(axis=1)
+    unions = sizes[:, None] + sizes[None, :] - intersections
+    return np.divide(intersections, unions, out=np.zeros_like(intersections), where=unions > 0)
+
+
+def _find(parents: List[int], index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def consolidate_checklist(checklist: Dict[str, Any], threshold: float) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    Merges near-duplicate requirements across all three lists. Two requirements
+    are duplicates when the Jaccard similarity of their normalized name+details
+    shingles reaches `threshold`, or when their names are loosely similar and
+    they cite the same distinctive figure (4+ digits). Requirements citing
+    different figures ('3 contratos' vs '5 contratos') never merge. Each group
+    keeps its first requirement's name, all distinct details, and the list most
+    of its members came from.
+
+    Returns the consolidated checklist and a summary of what was merged.
+    """
+    items = [
+        (key, requirement)
+        for key in CHECKLIST_KEYS
+        for requirement in checklist.get(key, [])
+    ]
+    if len(items) < 2 or threshold >= 1:
+        return {key: list(checklist.get(key, [])) for key in CHECKLIST_KEYS}, {"before": len(items), "after": len(items), "mergedGroups": []}
+
+    raw_texts = [f"{requirement.get('name', '')} {requirement.get('details', '')}" for _, requirement in items]
+    texts = [normalize_requirement_name(text) for text in raw_texts]
+    numbers = [_numbers(text) for text in raw_texts]
+    similarity = jaccard_matrix(texts)
+    name_similarity = jaccard_matrix([normalize_requirement_name(requirement.get("name", "")) for _, requirement in items])
+
+    same_distinctive_figures = np.array([
+        [bool(a) and a == b and any(len(number) >= 4 for number in a) for b in numbers]
+        for a in numbers
+    ])
+    candidates = (similarity >= threshold) | (same_distinctive_figures & (name_similarity >= NAME_THRESHOLD_WITH_SAME_FIGURES))
+
+    parents = list(range(len(items)))
+    for i, j in zip(*np.nonzero(np.triu(candidates, k=1))):
+        if numbers[i] and numbers[j] and numbers[i] != numbers[j]:
+            continue
+        parents[_find(parents, j)] = _find(parents, i)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(items)):
+        groups.setdefault(_find(parents, index), []).append(index)
+
+    consolidated: Dict[str, List[Dict[str, Any]]] = {key: [] for key in CHECKLIST_KEYS}
+    merged_groups = []
+    for members in sorted(groups.values(), key=lambda group: group[0]):
+        first_key, first_requirement = items[members[0]]
+        if len(members) == 1:
+            consolidated[first_key].append(first_requirement)
+            continue
+
+        details = []
+        for index in members:
+            detail = items[index][1].get("details")
+            if detail and detail not in details:
+                details.append(detail)
+        member_keys = [items[index][0] for index in members]
+        target_key = max(CHECKLIST_KEYS, key=lambda key: (member_keys.count(key), key == first_key))
+
+        consolidated[target_key].append({**first_requirement, "details": "; ".join(details)})
+        merged_groups.append({
+            "keptName": first_requirement.get("name"),
+            "list": target_key,
+            "mergedNames": [items[index][1].get("name") for index in members[1:]]
+        })
+
+    after = sum(len(requirements) for requirements in consolidated.values())
+    return consolidated, {"before": len(items), "after": after, "mergedGroups": merged_groups}
@@ -1,7 +1,9 @@
 from langgraph.graph import StateGraph, END
 from .state import TenderAnalysisState
 from .pipelineNodes import (
+    startProposalIntakeNode,
     createMasterChecklistNode,
+    consolidateChecklistNode,
     prepareParallelAuditsNode,
     executeParallelAuditsNode,
     aggregateResultsNode,
@@ -10,14 +12,18 @@ from .pipelineNodes import (
 
 workflow = StateGraph(TenderAnalysisState)
 
+workflow.add_node("startProposalIntake", startProposalIntakeNode)
 workflow.add_node("createMasterChecklist", createMasterChecklistNode)
+workflow.add_node("consolidateChecklist", consolidateChecklistNode)
 workflow.add_node("prepareParallelAudits", prepareParallelAuditsNode)
 workflow.add_node("executeParallelAudits", executeParallelAuditsNode)
 workflow.add_node("aggregateResults", aggregateResultsNode)
 workflow.add_node("formatFinalResponse", formatFinalResponseNode)
 
-workflow.set_entry_point("createMasterChecklist")
-workflow.add_edge("createMasterChecklist", "prepareParallelAudits")
+workflow.set_entry_point("startProposalIntake")
+workflow.add_edge("startProposalIntake", "createMasterChecklist")
+workflow.add_edge("createMasterChecklist", "consolidateChecklist")
+workflow.add_edge("consolidateChecklist", "prepareParallelAudits")
 workflow.add_edge("prepareParallelAudits", "executeParallelAudits")
 workflow.add_edge("executeParallelAudits", "aggregateResults")
 workflow.add_edge("aggregateResults", "formatFinalResponse")
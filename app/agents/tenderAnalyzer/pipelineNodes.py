@@ -1,67 +1,210 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_core.runnables import RunnableConfig
 from ..services import llmService
+from ..services.llmScheduler import PRIORITY_CRITICAL
+from ..services.llmBudget import LLMBudget
+from ..services.sriClient import sriClient
 from .state import TenderAnalysisState
 from .schemas.masterChecklist import MasterChecklist
 from .schemas.aggregatorSchemas import ExecutiveSummary
-from .prompts import CREATE_MASTER_CHECKLIST_PROMPT, AGGREGATE_ANALYSIS_PROMPT
-from .specialistSubgraph import specialistAuditorGraph
+from .prompts import CREATE_MASTER_CHECKLIST_PROMPT, MASTER_CHECKLIST_SECTION_INSTRUCTION, AGGREGATE_ANALYSIS_PROMPT
+from .auditPool import run_audit_pool
+from .proposalIntake import start_proposal_intake, cancel_proposal_intake
+from .analysisProfiles import get_analysis_profile
+from .tenderSections import split_tender_sections, merge_checklists
+from .checklistCache import checklist_cache_key, load_cached_checklist, save_cached_checklist
+from .checklistConsolidation import consolidate_checklist
+from .bidSummary import build_budget_comparison
+from ...core.config import (
+    MASTER_CHECKLIST_SECTION_CHARS, CHECKLIST_DEDUP_THRESHOLD, ANALYSIS_DEADLINE_SEC, PROPOSAL_AUDIT_DEADLINE_SEC,
+    RETRIEVAL_EVIDENCE_TOP_K, RETRIEVAL_FORM_TOP_K
+)
+from collections import Counter
+import asyncio
 import json
 import os
+import time
+
+# Minimum time between two ETA progress events of the audit stage.
+PROGRESS_EMIT_INTERVAL_SEC = 2.0
+# Part of the analysis deadline kept for the executive summary after the audits.
+SUMMARY_RESERVE_SEC = 30.0
+SUMMARY_RESERVE_FRACTION = 0.2
+# Wording of the template executive summary: opening sentence and why requirements were left unevaluated.
+TEMPLATE_SUMMARY_WORDING = {
+    "triage": ("Triaje de {count} propuestas.", "en el triaje; confirme con un análisis estándar antes de adjudicar"),
+    "budget": (
+        "Resumen automático de {count} propuestas (presupuesto de LLM casi agotado).",
+        "por falta de presupuesto de LLM; confirme con un nuevo análisis antes de adjudicar"
+    ),
+}
 
 def get_current_tender_id():
     """Helper to get current tender ID from environment or context"""
     return os.environ.get("CURRENT_TENDER_ID", "unknown")
 
-def emit_progress(event_type: str, progress: int, message: str, node_name: str = None):
-    """Emit progress event to SSE stream"""
+def emit_progress(event_type: str, progress: int, message: str, node_name: str = None, eta_seconds: Optional[float] = None):
+    """Emit progress event to SSE stream, with the LLM budget consumption when the analysis has a budget"""
     try:
         from app.api.services.sse_service import emit_progress_event
         tender_id = get_current_tender_id()
-        emit_progress_event(tender_id, event_type, progress, message, node_name)
+        emit_progress_event(tender_id, event_type, progress, message, node_name, eta_seconds, llmService.budget.usage(tender_id))
     except Exception as e:
         print(f"Warning: Could not emit progress event: {e}")
 
+def publish_partial_result(tender_id: Optional[str], result_type: str, payload: Dict[str, Any]) -> None:
+    """Publish a finished proposal report or new findings on the tender's progress channel"""
+    try:
+        from app.api.services.sse_service import emit_partial_result
+        emit_partial_result(tender_id or get_current_tender_id(), result_type, payload)
+    except Exception as e:
+        print(f"Warning: Could not publish partial result: {e}")
+
+def time_left(state: TenderAnalysisState, reserve_sec: float = 0.0) -> Optional[float]:
+    """Seconds left before the analysis deadline (minus `reserve_sec`), or None without a deadline"""
+    deadline = state.get("analysisDeadline")
+    if deadline is None:
+        return None
+    return max(0.0, deadline - reserve_sec - time.monotonic())
+
+def _count_requirements(checklist: Dict[str, Any]) -> int:
+    return (
+        len(checklist.get("financialRequirements", [])) +
+        len(checklist.get("technicalRequirements", [])) +
+        len(checklist.get("legalRequirements", []))
+    )
+
+async def generate_master_checklist(
+    tender_id: Optional[str],
+    tender_text: str,
+    tender_outline: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[Dict[str, Any], List[int]]:
+    """
+    Extracts the MasterChecklist from the tender text with the LLM.
+    Long tenders are split into sections (PDF outline, chapter headings or
+    pages) that are extracted in parallel and merged. Returns the checklist
+    and the (1-based) sections whose extraction failed; a checklist with
+    failed sections is incomplete and must not be cached.
+    """
+    sections = split_tender_sections(tender_text, tender_outline, MASTER_CHECKLIST_SECTION_CHARS)
+
+    async def extract_checklist(text: str) -> Dict[str, Any]:
+        messages = [
+            SystemMessage(content=CREATE_MASTER_CHECKLIST_PROMPT),
+            HumanMessage(content=text)
+        ]
+        return await llmService.invoke_json(
+            messages=messages,
+            output_schema=MasterChecklist,
+            model_name="gpt-4o-mini",
+            temperature=0.3,
+            tender_id=tender_id,
+            node_name="createMasterChecklist",
+            priority=PRIORITY_CRITICAL
+        )
+
+    if len(sections) == 1:
+        return await extract_checklist(tender_text), []
+
+    print(f"Tender split into {len(sections)} sections for checklist extraction.")
+    section_results = await asyncio.gather(
+        *(
+            extract_checklist(MASTER_CHECKLIST_SECTION_INSTRUCTION.format(index=index + 1, count=len(sections)) + section)
+            for index, section in enumerate(sections)
+        ),
+        return_exceptions=True
+    )
+    section_checklists = [result for result in section_results if not isinstance(result, Exception)]
+    failed_sections = []
+    for index, result in enumerate(section_results):
+        if isinstance(result, Exception):
+            print(f"ERROR extracting checklist from tender section {index + 1}: {result}")
+            failed_sections.append(index + 1)
+    if not section_checklists:
+        raise section_results[0]
+    return merge_checklists(section_checklists), failed_sections
+
+async def startProposalIntakeNode(state: TenderAnalysisState) -> Dict[str, Any]:
+    """
+    Starts extracting every proposal's documents and validating its RUC in the
+    background, so this work overlaps with the master checklist instead of
+    following it. Each proposal's router picks up its own intake when ready.
+    All distinct RUCs of the tender are pre-validated at once (see sriClient),
+    so each intake's RUC check finds its answer cached or already in flight.
+    Also starts the clocks of the analysis deadline (ANALYSIS_DEADLINE_SEC)
+    and of its LLM budget (ANALYSIS_MAX_LLM_*, overridden by state["llmBudget"]).
+    """
+    print("EXECUTING NODE: startProposalIntakeNode")
+
+    llmService.budget.start(state.get("tenderId"), LLMBudget.from_config(**(state.get("llmBudget") or {})))
+
+    profile = get_analysis_profile(state.get("analysisProfile"))
+    evidence_top_k = RETRIEVAL_EVIDENCE_TOP_K if profile.evidenceTopK is None else profile.evidenceTopK
+    form_top_k = RETRIEVAL_FORM_TOP_K if profile.formTopK is None else profile.formTopK
+    sriClient.prefetch(proposal.get("ruc") for proposal in state.get("proposals", []))
+    started = start_proposal_intake(state.get("tenderId"), state.get("proposals", []), evidence_top_k > 0 or form_top_k > 0)
+
+    emit_progress(
+        "progress",
+        12,
+        f"Extracting documents and validating RUCs of {started} proposals in the background...",
+        "startProposalIntake"
+    )
+    if ANALYSIS_DEADLINE_SEC > 0 and state.get("analysisDeadline") is None:
+        return {"analysisDeadline": time.monotonic() + ANALYSIS_DEADLINE_SEC}
+    return {}
+
 async def createMasterChecklistNode(state: TenderAnalysisState) -> Dict[str, Any]:
     """
     Reads the tender text and uses an LLM to generate a dynamic,
     structured, and categorized MasterChecklist of all requirements.
+    The checklist is cached per tender, keyed by the tender text, prompt
+    version and section size, so re-analysis reuses it unless regeneration is
+    requested. A checklist missing failed sections is used but not cached.
     """
     print("EXECUTING NODE: createMasterChecklistNode")
     
     emit_progress("progress", 15, "Creating master requirements checklist...", "createMasterChecklist")
     
     tenderText = state.get("tenderText")
+    tenderId = state.get("tenderId")
     
     if not tenderText:
         raise ValueError("Tender text not found in state. Cannot create checklist.")
 
-    messages = [
-        SystemMessage(content=CREATE_MASTER_CHECKLIST_PROMPT),
-        HumanMessage(content=tenderText)
-    ]
-    
+    cache_key = checklist_cache_key(tenderText)
+    if tenderId and not state.get("regenerateChecklist"):
+        cached_checklist = load_cached_checklist(tenderId, cache_key)
+        if cached_checklist is not None:
+            print("MasterChecklist LOADED FROM CACHE")
+            emit_progress(
+                "node_complete",
+                25,
+                f"Master checklist loaded from cache: {_count_requirements(cached_checklist)} requirements",
+                "createMasterChecklist"
+            )
+            return {"masterChecklist": cached_checklist}
+
     try:
-        structured_response = await llmService.invoke_json(
-            messages=messages,
-            output_schema=MasterChecklist,
-            model_name="gpt-4o-mini",
-            temperature=0.3
+        structured_response, failed_sections = await asyncio.wait_for(
+            generate_master_checklist(tenderId, tenderText, state.get("tenderOutline")),
+            time_left(state)
         )
         
         print(f"\nMasterChecklist created by LLM:")
         print(json.dumps(structured_response, indent=2, ensure_ascii=False))
         
-        total_requirements = (
-            len(structured_response.get("financialRequirements", [])) +
-            len(structured_response.get("technicalRequirements", [])) +
-            len(structured_response.get("legalRequirements", []))
-        )
+        total_requirements = _count_requirements(structured_response)
+        if tenderId and total_requirements and not failed_sections:
+            save_cached_checklist(tenderId, cache_key, structured_response)
+        elif failed_sections:
+            print(f"MasterChecklist incomplete (failed sections {failed_sections}), not cached.")
+
+        incomplete = f" (sections {', '.join(map(str, failed_sections))} failed, not cached)" if failed_sections else ""
         emit_progress(
             "node_complete", 
             25, 
-            f"Master checklist created: {total_requirements} requirements identified",
+            f"Master checklist created: {total_requirements} requirements identified{incomplete}",
             "createMasterChecklist"
         )
         
@@ -73,16 +216,40 @@ async def createMasterChecklistNode(state: TenderAnalysisState) -> Dict[str, Any
         emit_progress("error", 15, f"Error creating checklist: {str(e)}", "createMasterChecklist")
         return {"masterChecklist": {"financialRequirements": [], "technicalRequirements": [], "legalRequirements": []}}
 
+def consolidateChecklistNode(state: TenderAnalysisState) -> Dict[str, Any]:
+    """
+    Merges near-duplicate requirements of the master checklist (the same
+    requirement extracted twice, or listed under two categories) so each one
+    is audited once per proposal.
+    """
+    print("EXECUTING NODE: consolidateChecklistNode")
+
+    masterChecklist = state.get("masterChecklist") or {}
+    consolidated, summary = consolidate_checklist(masterChecklist, CHECKLIST_DEDUP_THRESHOLD)
+
+    for group in summary["mergedGroups"]:
+        print(f"Merged {group['mergedNames']} into '{group['keptName']}' ({group['list']})")
+
+    emit_progress(
+        "node_complete",
+        28,
+        f"Checklist consolidated: {summary['before']} -> {summary['after']} requirements",
+        "consolidateChecklist"
+    )
+
+    return {"masterChecklist": consolidated, "checklistConsolidation": summary}
+
 def prepareParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any]:
     """
     Prepares the list of inputs for the parallel execution (.map).
     Each input is a dictionary that will initialize the state for one sub-graph run.
+    Inputs only reference their proposal; the master checklist is passed to the
+    audit pool once instead of being copied into every input.
     """
     print("Dispatching proposals for parallel audit")
     
     emit_progress("progress", 30, "Preparing proposal analysis...", "prepareParallelAudits")
     
-    masterChecklist = state.get("masterChecklist")
     proposals = state.get("proposals", [])
     
     subgraph_inputs = []
@@ -90,8 +257,9 @@ def prepareParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any]:
     for proposal in proposals:
         subgraph_inputs.append(
             {
+                "tenderId": state.get("tenderId"),
                 "proposal": proposal,
-                "masterChecklist": masterChecklist,
+                "analysisProfile": state.get("analysisProfile"),
                 "findings": [] 
             }
         )
@@ -107,7 +275,10 @@ def prepareParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any]:
 
 async def executeParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any]:
     """
-    Executes the specialist sub-graph in parallel for each proposal.
+    Audits all proposals at once: routers run concurrently and the specialist
+    tasks of every proposal share one bounded worker pool (see auditPool).
+    Findings and proposal reports are published as they complete instead of
+    after the last proposal; progress and ETA follow the estimated work left.
     """
     print("EXECUTING NODE: executeParallelAuditsNode")
     
@@ -123,11 +294,66 @@ async def executeParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any
         "executeParallelAudits"
     )
     
-    config = RunnableConfig(max_concurrency=2)
-    
-    individual_reports = await specialistAuditorGraph.abatch(
-        subgraph_inputs, config=config
+    completed = []
+    tender_id = state.get("tenderId")
+    # Share of the estimated audit work done and its ETA (see auditPool.PoolProgress).
+    estimate = {"fraction": 0.0, "etaSeconds": None, "emittedAt": 0.0}
+
+    def audit_progress() -> int:
+        return 40 + int(30 * estimate["fraction"])
+
+    def progress_estimated(snapshot: Dict[str, Any]) -> None:
+        if snapshot["routedProposals"] == snapshot["totalProposals"] and snapshot["estimatedTokens"]:
+            estimate["fraction"] = snapshot["completedTokens"] / snapshot["estimatedTokens"]
+        estimate["etaSeconds"] = snapshot["etaSeconds"]
+        now = time.monotonic()
+        if estimate["etaSeconds"] is None or now - estimate["emittedAt"] < PROGRESS_EMIT_INTERVAL_SEC:
+            return
+        estimate["emittedAt"] = now
+        emit_progress(
+            "progress",
+            audit_progress(),
+            f"Auditing proposals: {estimate['fraction']:.0%} of the estimated work done, about {estimate['etaSeconds']:.0f}s left",
+            "executeParallelAudits",
+            estimate["etaSeconds"]
+        )
+
+    def findings_ready(proposal_state: Dict[str, Any], findings: List[Dict[str, Any]]) -> None:
+        publish_partial_result(tender_id, "findings", {
+            "bidderName": proposal_state.get("proposal", {}).get("companyName"),
+            "findings": findings
+        })
+
+    def proposal_done(proposal_state: Dict[str, Any]) -> None:
+        completed.append(proposal_state)
+        publish_partial_result(tender_id, "proposalReport", {
+            "bidderName": proposal_state.get("proposal", {}).get("companyName"),
+            "finalAnalysis": proposal_state.get("finalAnalysis")
+        })
+        emit_progress(
+            "progress",
+            audit_progress(),
+            f"Audit completed for {proposal_state.get('proposal', {}).get('companyName', 'Unknown')} ({len(completed)}/{total_proposals})",
+            "executeParallelAudits",
+            estimate["etaSeconds"]
+        )
+
+    # The audits stop early enough to leave the executive summary its share of the deadline.
+    summary_reserve = min(SUMMARY_RESERVE_SEC, SUMMARY_RESERVE_FRACTION * ANALYSIS_DEADLINE_SEC)
+    audit_time_left = time_left(state, summary_reserve)
+
+    individual_reports = await run_audit_pool(
+        subgraph_inputs,
+        deadline=None if audit_time_left is None else time.monotonic() + audit_time_left,
+        on_proposal_done=proposal_done,
+        on_findings=findings_ready,
+        on_progress=progress_estimated,
+        evaluation_mode=state.get("evaluationMode"),
+        profile=get_analysis_profile(state.get("analysisProfile")),
+        master_checklist=state.get("masterChecklist")
     )
+    # Intake of proposals the pool never routed (e.g. an empty checklist) is not needed anymore.
+    cancel_proposal_intake(tender_id)
     
     emit_progress(
         "node_complete", 
@@ -139,10 +365,30 @@ async def executeParallelAuditsNode(state: TenderAnalysisState) -> Dict[str, Any
     print(f"Parallel audits completed for {len(individual_reports)} proposals.")
     return {"individualReports": individual_reports}
 
+def template_executive_summary(analyses: List[Dict[str, Any]], reason: str = "triage") -> str:
+    """Executive summary built without an LLM call (triage profile or LLM budget nearly used): ranking, critical findings and coverage"""
+    ranked = sorted(analyses, key=lambda analysis: analysis.get("scores", {}).get("viabilityTotal", 0), reverse=True)
+    if not ranked:
+        return "No summary could be generated."
+
+    def describe(analysis: Dict[str, Any]) -> str:
+        summary = analysis.get("findingsSummary", {})
+        return f"{analysis.get('bidderName', 'Unknown')} ({analysis.get('scores', {}).get('viabilityTotal', 0)}/100, {summary.get('critical', 0)} hallazgos críticos)"
+
+    opening, not_evaluated_reason = TEMPLATE_SUMMARY_WORDING[reason]
+    sentences = [f"{opening.format(count=len(ranked))} La mejor puntuada es {describe(ranked[0])}."]
+    if len(ranked) > 1:
+        sentences.append(f"Le siguen: {', '.join(describe(analysis) for analysis in ranked[1:])}.")
+    not_evaluated = sum(analysis.get("findingsSummary", {}).get("notEvaluated", 0) for analysis in ranked)
+    if not_evaluated:
+        sentences.append(f"{not_evaluated} requisitos quedaron sin evaluar {not_evaluated_reason}.")
+    return " ".join(sentences)
+
 async def aggregateResultsNode(state: TenderAnalysisState) -> Dict[str, Any]:
     """
     Aggregates the individual audit reports from the parallel runs
     into a final, comparative summary and structured data for charts.
+    Near the LLM budget the narrative summary is replaced by the template one.
     """
     print("EXECUTING NODE: aggregateResultsNode")
     
@@ -170,35 +416,45 @@ async def aggregateResultsNode(state: TenderAnalysisState) -> Dict[str, Any]:
         summary_context += "---\n"
 
     executive_summary = "No summary could be generated."
+    profile = get_analysis_profile(state.get("analysisProfile"))
+    over_budget = profile.llmExecutiveSummary and llmService.budget.is_degraded(state.get("tenderId"))
 
-    try:
-        messages = [
-            SystemMessage(content=AGGREGATE_ANALYSIS_PROMPT),
-            HumanMessage(content=summary_context)
-        ]
-        
-        summary_response = await llmService.invoke_json(
-            messages=messages,
-            output_schema=ExecutiveSummary,
-            model_name="gpt-4o-mini",
-            temperature=0.2
+    if not profile.llmExecutiveSummary or over_budget:
+        if over_budget:
+            llmService.budget.note_degradation(state.get("tenderId"), "templateSummary")
+        executive_summary = template_executive_summary(
+            [report.get("finalAnalysis") for report in individual_reports if report.get("finalAnalysis")],
+            "budget" if over_budget else "triage"
         )
-        print(summary_response)
-        executive_summary = summary_response.get("summary", "")
+    else:
+        try:
+            messages = [
+                SystemMessage(content=AGGREGATE_ANALYSIS_PROMPT),
+                HumanMessage(content=summary_context)
+            ]
+        
+            summary_response = await asyncio.wait_for(llmService.invoke_json(
+                messages=messages,
+                output_schema=ExecutiveSummary,
+                model_name=profile.summaryModel,
+                temperature=0.2,
+                tender_id=state.get("tenderId"),
+                node_name="aggregateResults",
+                priority=PRIORITY_CRITICAL
+            ), time_left(state))
+            print(summary_response)
+            executive_summary = summary_response.get("summary", "")
 
-    except Exception as e:
-        print(f"ERROR during executive summary LLM call: {e}")
+        except Exception as e:
+            print(f"ERROR during executive summary LLM call: {e!r}")
 
-    budget_comparison = {
-        "categories": [],
-        "proposals": []
-    }
-    
     analysis_list = [
         report.get("finalAnalysis") 
         for report in individual_reports 
         if report.get("finalAnalysis") is not None
     ]
+    # Amounts read from each proposal's form at intake, no LLM call involved.
+    budget_comparison = build_budget_comparison(analysis_list)
 
     emit_progress(
         "node_complete", 
@@ -215,6 +471,15 @@ async def aggregateResultsNode(state: TenderAnalysisState) -> Dict[str, Any]:
         "budgetComparison": budget_comparison
     }
 
+def _not_evaluated_by_reason(analysis: Dict[str, Any]) -> Dict[str, int]:
+    """Requirements of a proposal report left unevaluated, counted by notEvaluatedReason."""
+    reasons = Counter(
+        finding.get("notEvaluatedReason") or "unknown"
+        for finding in analysis.get("findings", [])
+        if finding.get("notEvaluated")
+    )
+    return dict(reasons)
+
 def formatFinalResponseNode(state: TenderAnalysisState) -> Dict[str, Any]:
     """
     Assembles the final JSON object in the exact format required by the frontend.
@@ -224,11 +489,44 @@ def formatFinalResponseNode(state: TenderAnalysisState) -> Dict[str, Any]:
     emit_progress("progress", 90, "Formatting final report...", "formatFinalResponse")
 
     proposals_analysis = state.get("analysisResults", [])
+    llm_usage = llmService.get_usage_breakdown(state.get("tenderId"))
+    usage_totals = llm_usage["totals"]
+    print(f"LLM usage: {usage_totals['calls']} calls, {usage_totals['promptTokens']} prompt tokens ({usage_totals['cacheHitRatio']:.0%} cached), est. ${usage_totals['estimatedCostUSD']:.4f}")
+    rule_engine = llm_usage["ruleEngine"]
+    print(f"Rule engine: {rule_engine['decided']}/{rule_engine['evaluated']} requirements decided locally ({rule_engine['skippedCallFraction']:.0%} of specialist calls skipped)")
     
+    not_evaluated = [(analysis.get("bidderName"), _not_evaluated_by_reason(analysis)) for analysis in proposals_analysis]
+    timed_out = [
+        {"bidderName": bidder_name, "notEvaluated": reasons["timeout"]}
+        for bidder_name, reasons in not_evaluated if reasons.get("timeout")
+    ]
+    # Budget, profile, disqualification and error skips are reported apart from deadline timeouts.
+    skipped = [
+        {"bidderName": bidder_name, "byReason": {reason: count for reason, count in reasons.items() if reason != "timeout"}}
+        for bidder_name, reasons in not_evaluated if set(reasons) - {"timeout"}
+    ]
+    if timed_out:
+        print(f"Deadlines: {len(timed_out)} proposals have requirements not evaluated (timeout)")
+    if skipped:
+        print(f"Not evaluated for other reasons: {len(skipped)} proposals")
+    llm_budget = llmService.budget.usage(state.get("tenderId"))
+    if llm_budget:
+        print(f"LLM budget: {llm_budget['usedFraction']:.0%} used ({llm_budget['level']}), {llm_budget['refusedCalls']} calls refused, degradations: {llm_budget['degradations']}")
+
     final_report = {
         "executiveSummary": state.get("executiveSummary", "No summary could be generated."),
         "budgetComparison": state.get("budgetComparison", {}),
-        "proposalsAnalysis": proposals_analysis
+        "proposalsAnalysis": proposals_analysis,
+        "analysisProfile": get_analysis_profile(state.get("analysisProfile")).name,
+        "checklistConsolidation": state.get("checklistConsolidation"),
+        "deadlines": {
+            "proposalAuditDeadlineSec": PROPOSAL_AUDIT_DEADLINE_SEC or None,
+            "analysisDeadlineSec": ANALYSIS_DEADLINE_SEC or None,
+            "timedOutProposals": timed_out
+        },
+        "notEvaluatedProposals": skipped,
+        "llmBudget": llm_budget,
+        "llmUsage": llm_usage
     }
     
     try:
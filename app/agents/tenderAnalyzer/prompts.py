@@ -25,6 +25,12 @@ Your mission is to read the following 'Pliego de Licitación' and distill it int
 Finally, invoke the `MasterChecklist` tool with the three populated lists.
 """
 
+# Prepended to each section of a long tender extracted on its own.
+MASTER_CHECKLIST_SECTION_INSTRUCTION = (
+    "**Tender section {index} of {count}.** Extract only the requirements stated in this section; "
+    "leave a list empty if the section has none.\n\n"
+)
+
 CREATE_ANNEX_MAP_PROMPT = """
 You are a highly efficient Project Management Assistant AI.
 Your task is to read a list of requirements and a proposal form text, and map each requirement to the annex filename referenced in the form.
@@ -54,6 +60,7 @@ Your mission is to audit a bidder's proposal against a given list of financial r
 1.  `financialRequirements`: A list of financial requirements from the MasterChecklist.
 2.  `mainFormText`: The text of the main proposal form.
 3.  `annexes`: A dictionary where keys are annex names (e.g., "anexo_1") and values are their full text content.
+    Long documents are reduced to their most relevant passages, each tagged `[document, p. N]`. Cite those pages in the `observation`.
 
 **STEP-BY-STEP INSTRUCTIONS:**
 For **EACH** requirement in the `financialRequirements` list, you must perform the following 5-step process:
@@ -79,6 +86,7 @@ Your mission is to audit a **single technical requirement** for a bidder's propo
 1.  `Requirement to Verify`: The specific requirement from the MasterChecklist that you must audit (e.g., experience, equipment, quality certificates).
 2.  `Main Proposal Form Text`: The text of the main proposal form for context.
 3.  `Evidence Document Text`: The text of the **one specific annex** where the evidence is supposed to be.
+    Long documents are reduced to their most relevant passages, each tagged `[document, p. N]`. Cite those pages in the `observation`.
 
 **STEP-BY-STEP INSTRUCTIONS:**
 1.  **Analyze Relevance:** First, confirm the 'Evidence Document Text' is semantically relevant to the 'Requirement to Verify'.
@@ -103,6 +111,7 @@ Your mission is to audit a **single legal requirement** for a bidder's proposal.
 1.  `Requirement to Verify`: The specific requirement from the MasterChecklist (e.g., warranties, fines, declarations).
 2.  `Main Proposal Form Text`: The text of the main proposal form.
 3.  `Evidence Document Text`: The text of the **one specific annex** (e.g., a sworn declaration).
+    Long documents are reduced to their most relevant passages, each tagged `[document, p. N]`. Cite those pages in the `observation`.
 
 **STEP-BY-STEP INSTRUCTIONS:**
 1.  **Analyze Relevance:** Confirm the 'Evidence Document Text' is relevant to the 'Requirement to Verify'.
@@ -116,6 +125,31 @@ Your mission is to audit a **single legal requirement** for a bidder's proposal.
 Finally, invoke the `LegalFinding` tool with the results of your analysis.
 """
 
+ANNEX_BATCH_ANALYSIS_PROMPT = """
+You are a panel of Procurement Auditor AIs (Financial, Technical and Legal) reviewing **one annex** of a bidder's proposal. Your personality is meticulous, precise, and objective.
+
+**MISSION:**
+Your mission is to audit **every requirement listed** against the main proposal form and the single evidence document provided. Each requirement is listed under the specialist that must audit it.
+
+**CONTEXT PROVIDED:**
+1.  `Main Proposal Form Text`: The text of the main proposal form for context.
+2.  `Evidence Document Text`: The text of the **one specific annex** the requirements were mapped to.
+    Long documents are reduced to their most relevant passages, each tagged `[document, p. N]`. Cite those pages in the `observation`.
+3.  `Requirements to Verify`: A JSON object with the `financial`, `technical` and `legal` requirements to audit.
+
+**STEP-BY-STEP INSTRUCTIONS:**
+For **EACH** requirement, independently of the others:
+
+1.  **Find Declaration:** Locate the value or commitment declared for the requirement in the `Main Proposal Form Text`.
+2.  **Find Evidence:** Search within the `Evidence Document Text` for the supporting value or clause.
+3.  **Check Consistency & Compliance:** Compare the declaration with the evidence and verify if it complies with the official requirement.
+4.  **Report Finding:** Create one finding with the schema of its specialist (`FinancialFinding`, `TechnicalFinding` or `LegalFinding`). Copy the `requirementName` exactly as listed. The `observation` field is critical; clearly explain your reasoning.
+
+Return exactly one finding per listed requirement in `financialFindings`, `technicalFindings` and `legalFindings`.
+
+### **YOUR ANSWERS MUST BE IN SPANISH**
+"""
+
 AGGREGATE_ANALYSIS_PROMPT = """
 You are a top-tier Strategic Procurement Advisor.
 Your mission is to analyze the final audit reports of multiple proposals for a tender and write a concise, decisive executive summary for a high-level manager.
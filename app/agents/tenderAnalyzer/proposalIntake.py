@@ -0,0 +1,254 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..services.documentStore import (
+    documentStore, proposal_document_refs, proposal_namespace, tender_namespace, MAIN_FORM_DOCUMENT, ANNEX_INDEX_DOCUMENT
+)
+from ...core.config import PROPOSAL_INTAKE_CONCURRENCY, RETRIEVAL_EVIDENCE_TOP_K, RETRIEVAL_FORM_TOP_K, RETRIEVAL_PASSAGE_CHARS
+from .retrievalIndex import ProposalRetrievalIndex
+from .bidSummary import extract_bid_summary
+
+RUC_REQUIREMENT_NAME = "Company RUC Validation"
+RUC_REQUIREMENT_DETAILS = "Verify bidder is registered with SRI (Tax Authority)"
+
+
+class ProposalIntake:
+    """
+    Everything about a proposal that does not depend on the master checklist:
+    its document handles and texts, its retrieval index, its RUC findings,
+    findings for documents that could not be read, and the bid summary
+    (amount, delivery term, financial indices) read from its form.
+    """
+
+    def __init__(
+        self,
+        main_form_ref: Optional[str],
+        annex_index_ref: Optional[str],
+        attachment_refs: Dict[str, str],
+        main_form_text: str,
+        annex_index_text: str,
+        annexes: Dict[str, str],
+        retrieval_index: Optional[ProposalRetrievalIndex],
+        ruc_findings: List[Dict[str, Any]],
+        bid_summary: Dict[str, Any],
+        document_findings: Optional[List[Dict[str, Any]]] = None
+    ):
+        self.main_form_ref = main_form_ref
+        self.annex_index_ref = annex_index_ref
+        self.attachment_refs = attachment_refs
+        self.main_form_text = main_form_text
+        self.annex_index_text = annex_index_text
+        self.annexes = annexes
+        self.retrieval_index = retrieval_index
+        self.ruc_findings = ruc_findings
+        self.bid_summary = bid_summary
+        self.document_findings = document_findings or []
+
+
+async def validate_proposal_ruc(proposal: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Checks the bidder's RUC against the SRI and returns the resulting Project Manager finding."""
+    ruc = proposal.get("ruc")
+    if not ruc:
+        return [{
+            "agentSource": "Project Manager",
+            "severity": "CRITICAL",
+            "requirementName": RUC_REQUIREMENT_NAME,
+            "requirementDetails": "RUC number is mandatory for bidders",
+            "isCompliant": False,
+            "observation": "No RUC provided with proposal submission.",
+            "recommendation": "Request RUC from bidder."
+        }]
+
+    from .tools import validateRuc
+    print(f"Validating RUC: {ruc}")
+
+    try:
+        ruc_result = await validateRuc.ainvoke({"ruc": ruc})
+    except Exception as e:
+        print(f"RUC validation error: {e}")
+        return [{
+            "agentSource": "Project Manager",
+            "severity": "WARNING",
+            "requirementName": RUC_REQUIREMENT_NAME,
+            "requirementDetails": RUC_REQUIREMENT_DETAILS,
+            "isCompliant": False,
+            "observation": f"Unable to verify RUC: {str(e)}. Manual verification required.",
+            "recommendation": "Verify company registration manually."
+        }]
+
+    if "error" in ruc_result:
+        return [{
+            "agentSource": "Project Manager",
+            "severity": "CRITICAL",
+            "requirementName": RUC_REQUIREMENT_NAME,
+            "requirementDetails": RUC_REQUIREMENT_DETAILS,
+            "isCompliant": False,
+            "observation": f"RUC Validation Failed: {ruc_result['error']}. Company may not be legally registered.",
+            "recommendation": "Request valid RUC or disqualify proposal."
+        }]
+    source = f" (SRI registry snapshot of {ruc_result['snapshotDate']})" if ruc_result.get("snapshotDate") else ""
+    return [{
+        "agentSource": "Project Manager",
+        "severity": "OK",
+        "requirementName": RUC_REQUIREMENT_NAME,
+        "requirementDetails": RUC_REQUIREMENT_DETAILS,
+        "isCompliant": True,
+        "observation": f"RUC verified: {ruc_result.get('bidderName', 'N/A')} - Status: {ruc_result.get('status', 'N/A')}{source}",
+        "recommendation": "Company legally registered with SRI."
+    }]
+
+
+def unreadable_document_finding(document_name: str, error: Exception) -> Dict[str, Any]:
+    """Project Manager finding for a submitted document whose text could not be extracted."""
+    is_annex_index = document_name == ANNEX_INDEX_DOCUMENT
+    label = {MAIN_FORM_DOCUMENT: "main proposal form", ANNEX_INDEX_DOCUMENT: "annex index"}.get(document_name, f"annex '{document_name}'")
+    return {
+        "agentSource": "Project Manager",
+        "severity": "WARNING" if is_annex_index else "CRITICAL",
+        "requirementName": f"Readable document: {document_name}",
+        "requirementDetails": "Submitted documents must be readable to be verified",
+        "isCompliant": False,
+        "observation": f"Document Omission: The {label} could not be read ({type(error).__name__}: {error}). Requirements relying on it cannot be verified.",
+        "recommendation": "Request a readable copy of the document from the bidder."
+    }
+
+
+async def _load_proposal_documents(
+    documents: List[Tuple[str, Optional[str]]]
+) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+    """
+    Loads (name, handle) documents concurrently. A document whose loader fails
+    (e.g. a corrupt PDF) reads as empty, is stored as such so nothing retries
+    the loader, and yields a finding. Returns the texts, the findings and the
+    names of the unreadable documents.
+    """
+    results = await asyncio.gather(*(documentStore.aget(handle) for _, handle in documents), return_exceptions=True)
+    texts, findings, unreadable = [], [], []
+    for (name, handle), result in zip(documents, results):
+        if isinstance(result, Exception):
+            print(f"Could not read document {handle}: {result}")
+            findings.append(unreadable_document_finding(name, result))
+            unreadable.append(name)
+            documentStore.put(handle, "")
+            result = ""
+        texts.append(result)
+    return texts, findings, unreadable
+
+
+async def prepare_proposal_intake(
+    tender_id: Optional[str],
+    proposal: Dict[str, Any],
+    build_index: Optional[bool] = None
+) -> ProposalIntake:
+    """
+    Extracts a proposal's documents, builds its retrieval index (by default
+    when retrieval is configured), validates its RUC and reads its bid summary
+    from the main form. Extraction and the SRI call run concurrently.
+    Unreadable documents only affect this proposal: they are reported as
+    findings and unreadable annexes are left out, so requirements mapped to
+    them are reported as omissions instead of being sent to a specialist.
+    """
+    main_form_ref, annex_index_ref, attachment_refs = proposal_document_refs(tender_id, proposal)
+    documents = [(MAIN_FORM_DOCUMENT, main_form_ref), (ANNEX_INDEX_DOCUMENT, annex_index_ref), *attachment_refs.items()]
+    ((main_form_text, annex_index_text, *annex_texts), document_findings, unreadable), ruc_findings = await asyncio.gather(
+        _load_proposal_documents(documents),
+        validate_proposal_ruc(proposal)
+    )
+    annexes = {annex_key: text for annex_key, text in zip(attachment_refs, annex_texts) if annex_key not in unreadable}
+    attachment_refs = {annex_key: ref for annex_key, ref in attachment_refs.items() if annex_key not in unreadable}
+
+    if build_index is None:
+        build_index = RETRIEVAL_EVIDENCE_TOP_K > 0 or RETRIEVAL_FORM_TOP_K > 0
+    retrieval_index = None
+    if build_index:
+        retrieval_index = await asyncio.to_thread(
+            ProposalRetrievalIndex, main_form_text or "", annexes, RETRIEVAL_PASSAGE_CHARS
+        )
+        print(f"Retrieval index built for {proposal.get('companyName')}: {len(retrieval_index.passages)} passages.")
+
+    # Amounts, delivery term and financial indices for the report charts, read without the LLM.
+    bid_summary = await asyncio.to_thread(extract_bid_summary, main_form_text or "")
+
+    return ProposalIntake(
+        main_form_ref, annex_index_ref, attachment_refs,
+        main_form_text, annex_index_text, annexes,
+        retrieval_index, ruc_findings, bid_summary, document_findings
+    )
+
+
+# Intake started ahead of the master checklist, keyed by proposal namespace,
+# and the semaphore bounding how many of a tender's intakes are held at once.
+_pending_intakes: Dict[str, "asyncio.Task[ProposalIntake]"] = {}
+_intake_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+async def _prepare_in_slot(
+    slots: Optional[asyncio.Semaphore],
+    tender_id: Optional[str],
+    proposal: Dict[str, Any],
+    build_index: Optional[bool]
+) -> ProposalIntake:
+    """Prepares an intake once a slot is free; the slot is kept until the intake is consumed."""
+    if slots is None:
+        return await prepare_proposal_intake(tender_id, proposal, build_index)
+    await slots.acquire()
+    try:
+        return await prepare_proposal_intake(tender_id, proposal, build_index)
+    except BaseException:
+        slots.release()
+        raise
+
+
+def start_proposal_intake(
+    tender_id: Optional[str],
+    proposals: List[Dict[str, Any]],
+    build_index: Optional[bool] = None,
+    concurrency: Optional[int] = None
+) -> int:
+    """
+    Starts the intake of every proposal in the background, so documents are
+    extracted and RUCs validated while the master checklist is being built.
+    At most `concurrency` (PROPOSAL_INTAKE_CONCURRENCY by default, 0 = all)
+    intakes are prepared or waiting for their router at once, so their texts
+    and indices are not all resident together. Must be called from a running
+    event loop. Returns the number started.
+    """
+    limit = PROPOSAL_INTAKE_CONCURRENCY if concurrency is None else concurrency
+    slots = asyncio.Semaphore(limit) if limit > 0 else None
+    for proposal in proposals:
+        namespace = proposal_namespace(tender_id, proposal)
+        if namespace not in _pending_intakes:
+            _pending_intakes[namespace] = asyncio.create_task(_prepare_in_slot(slots, tender_id, proposal, build_index))
+            if slots is not None:
+                _intake_slots[namespace] = slots
+    return len(proposals)
+
+
+async def get_proposal_intake(
+    tender_id: Optional[str],
+    proposal: Dict[str, Any],
+    build_index: Optional[bool] = None
+) -> ProposalIntake:
+    """
+    Returns the intake of a proposal: awaits the one started ahead of time,
+    or prepares it now if none was started (single-proposal runs, tests).
+    """
+    namespace = proposal_namespace(tender_id, proposal)
+    task = _pending_intakes.pop(namespace, None)
+    slots = _intake_slots.pop(namespace, None)
+    if task is None:
+        return await prepare_proposal_intake(tender_id, proposal, build_index)
+    try:
+        return await task
+    finally:
+        # A finished intake hands its slot over to the next proposal (a failed one already did).
+        if slots is not None and task.done() and not task.cancelled() and task.exception() is None:
+            slots.release()
+
+
+def cancel_proposal_intake(tender_id: Optional[str]) -> None:
+    """Drops the intake a tender's analysis started but never consumed (e.g. after an error)."""
+    prefix = tender_namespace(tender_id)
+    for namespace in [namespace for namespace in _pending_intakes if namespace.startswith(prefix)]:
+        _pending_intakes.pop(namespace).cancel()
+        _intake_slots.pop(namespace, None)
@@ -0,0 +1,182 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ...core.constants import PAGE_SEPARATOR
+
+MAIN_FORM_SOURCE = "Main form"
+
+# Separates formatted passages; used to merge evidence of several tasks without repeats.
+PASSAGE_SEPARATOR = "\n\n"
+
+SPANISH_STOPWORDS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella ellas
+ellos en entre era es esa esas ese eso esos esta estas este esto estos fue fueron ha han hasta hay la las le
+les lo los mas me mi mis muy ni no nos o os otra otras otro otros para pero por porque que quien se sea segun
+ser si sin sobre su sus tambien te tiene tienen todo todos tu u un una unas uno unos y ya
+""".split())
+
+_TOKEN_RE = re.compile(r"\d[\d.,]*\d|\w+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.;:])\s+")
+
+
+class Passage(NamedTuple):
+    """A chunk of one document page, small enough to quote in a prompt."""
+    source: str
+    page: int
+    text: str
+
+
+def strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _stem(word: str) -> str:
+    """Light Spanish plural stemming: 'garantías' and 'garantia' share a term."""
+    if len(word) > 5 and word.endswith("es"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Spanish-aware terms for lexical matching: lowercase, no accents, no stopwords,
+    light plural stemming. Numbers lose their separators so '$80,187.24' and
+    '80.187,24' match.
+    """
+    tokens = []
+    for raw in _TOKEN_RE.findall(strip_accents(text.lower())):
+        if raw[0].isdigit():
+            tokens.append(raw.replace(".", "").replace(",", ""))
+        elif len(raw) > 1 and raw not in SPANISH_STOPWORDS:
+            tokens.append(_stem(raw))
+    return tokens
+
+
+def _pack(pieces: Iterable[str], max_chars: int) -> List[str]:
+    """Greedily joins pieces into chunks of at most max_chars, hard-splitting oversized pieces."""
+    chunks, buffer = [], ""
+    for piece in pieces:
+        while len(piece) > max_chars:
+            cut = piece.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if buffer:
+                chunks.append(buffer)
+                buffer = ""
+            chunks.append(piece[:cut].strip())
+            piece = piece[cut:].strip()
+        if buffer and len(buffer) + len(piece) + 1 > max_chars:
+            chunks.append(buffer)
+            buffer = ""
+        buffer = f"{buffer} {piece}".strip()
+    if buffer:
+        chunks.append(buffer)
+    return chunks
+
+
+def split_passages(source: str, text: str, max_chars: int = 1200) -> List[Passage]:
+    """Splits a document into passages by page, then paragraph, then sentence."""
+    passages = []
+    for page_number, page_text in enumerate((text or "").split(PAGE_SEPARATOR), start=1):
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", page_text) if p.strip()]
+        sentences = [s for paragraph in paragraphs for s in _SENTENCE_END_RE.split(paragraph) if s]
+        passages.extend(Passage(source, page_number, chunk) for chunk in _pack(sentences, max_chars))
+    return passages
+
+
+class BM25Index:
+    """Okapi BM25 over tokenized documents, with postings stored as NumPy arrays."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.doc_count = len(documents)
+        doc_lengths = np.array([len(tokens) for tokens in documents], dtype=np.float64)
+        average_length = doc_lengths.mean() if self.doc_count and doc_lengths.mean() > 0 else 1.0
+        self._length_norm = k1 * (1 - b + b * doc_lengths / average_length)
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc_id, tokens in enumerate(documents):
+            for term, frequency in Counter(tokens).items():
+                doc_ids, frequencies = postings.setdefault(term, ([], []))
+                doc_ids.append(doc_id)
+                frequencies.append(frequency)
+
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, (doc_ids, frequencies) in postings.items():
+            idf = math.log(1 + (self.doc_count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            self._postings[term] = (np.array(doc_ids, dtype=np.int32), np.array(frequencies, dtype=np.float64), idf)
+
+    def scores(self, query_tokens: List[str]) -> np.ndarray:
+        scores = np.zeros(self.doc_count, dtype=np.float64)
+        for term in set(query_tokens):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, frequencies, idf = posting
+            scores[doc_ids] += idf * frequencies * (self.k1 + 1) / (frequencies + self._length_norm[doc_ids])
+        return scores
+
+
+class ProposalRetrievalIndex:
+    """
+    One BM25 index over the passages of a proposal's main form and annexes.
+    Searches are restricted to one document, so a requirement only sees
+    passages from the annex it was mapped to (or from the form).
+    """
+
+    def __init__(self, main_form_text: str, attachments: Dict[str, str], passage_chars: int = 1200):
+        self.passages: List[Passage] = split_passages(MAIN_FORM_SOURCE, main_form_text, passage_chars)
+        for annex_key, annex_text in attachments.items():
+            self.passages.extend(split_passages(annex_key, annex_text, passage_chars))
+
+        self._index = BM25Index([tokenize(passage.text) for passage in self.passages])
+        sources = np.array([passage.source for passage in self.passages], dtype=object)
+        self._source_ids: Dict[str, np.ndarray] = {
+            source: np.flatnonzero(sources == source) for source in dict.fromkeys(sources.tolist())
+        }
+
+    def search(self, query: str, source: str, k: int) -> List[Passage]:
+        """Top-k passages of `source` for `query`, returned in document order."""
+        candidate_ids = self._source_ids.get(source)
+        if candidate_ids is None or len(candidate_ids) == 0:
+            return []
+        if len(candidate_ids) <= k:
+            return [self.passages[i] for i in candidate_ids]
+
+        candidate_scores = self._index.scores(tokenize(query))[candidate_ids]
+        if not candidate_scores.any():
+            # Nothing matches lexically: the opening pages usually hold the declarations.
+            return [self.passages[i] for i in candidate_ids[:k]]
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[candidate_scores[top] > 0]
+        return [self.passages[i] for i in np.sort(candidate_ids[top])]
+
+    def best_source(self, query: str, sources: Iterable[str]) -> Optional[str]:
+        """The source among `sources` holding the passage that best matches `query`, or None without any match."""
+        candidates = [source for source in sources if len(self._source_ids.get(source, [])) > 0]
+        if not candidates:
+            return None
+        scores = self._index.scores(tokenize(query))
+        best_scores = [scores[self._source_ids[source]].max() for source in candidates]
+        best = int(np.argmax(best_scores))
+        return candidates[best] if best_scores[best] > 0 else None
+
+
+def format_passages(passages: List[Passage]) -> str:
+    """Renders passages with their page citation, e.g. '[Anexo_1.pdf, p. 37]'."""
+    return PASSAGE_SEPARATOR.join(f"[{passage.source}, p. {passage.page}]\n{passage.text}" for passage in passages)
+
+
+def merge_passage_texts(texts: List[str]) -> str:
+    """Merges formatted evidence from several tasks, keeping each passage once."""
+    blocks: Dict[str, None] = {}
+    for text in texts:
+        for block in re.split(r"\n\n(?=\[[^\]\n]+, p\. \d+\]\n)", text):
+            blocks.setdefault(block, None)
+    return PASSAGE_SEPARATOR.join(blocks)
@@ -0,0 +1,306 @@
+import re
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .retrievalIndex import strip_accents, tokenize
+
+# Specialists whose requirements are often a plain comparison or declaration.
+RULE_ENGINE_SOURCES = ("Financial", "Legal")
+
+# Fraction of a requirement name's terms a sentence must contain to be read as its evidence.
+MIN_TERM_COVERAGE = 0.6
+# Name terms that describe the comparison, not the subject ('Patrimonio mínimo requerido').
+_COMPARISON_TERMS = frozenset(tokenize("mínimo mínima máximo máxima requerido requerida exigido exigida"))
+
+# Amounts as written in the forms: '80,187.24', '80.187,24', '80187' or '12,5' (see parse_number).
+NUMBER_PATTERN = r"\d{1,3}(?:[.,]\d{3})+(?:[.,]\d{1,2})?|\d+(?:[.,]\d{1,2})?"
+_MONEY_RE = re.compile(
+    rf"(?:US\$|USD|\$)\s*({NUMBER_PATTERN})|({NUMBER_PATTERN})\s*(?:USD|d[oó]lares)\b", flags=re.IGNORECASE
+)
+_PERCENT_RE = re.compile(rf"({NUMBER_PATTERN})\s*(?:%|por\s*ciento)", flags=re.IGNORECASE)
+_MONTHS = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7,
+    "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12
+}
+_DATE_RES = (
+    (re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b"), lambda m: (int(m[3]), int(m[2]), int(m[1]))),
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), lambda m: (int(m[1]), int(m[2]), int(m[3]))),
+    (
+        re.compile(rf"\b(\d{{1,2}})\s+de\s+({'|'.join(_MONTHS)})\s+(?:de|del)\s+(\d{{4}})\b"),
+        lambda m: (int(m[3]), _MONTHS[m[2]], int(m[1]))
+    ),
+)
+
+# Checked in order; each match is blanked out so 'no menor a' is not also read as 'menor a'.
+_COMPARATOR_PATTERNS = (
+    (">=", r">=|≥|\bminim[oa]\b|\bal menos\b|\bno (?:menor|inferior)|\b(?:mayor|superior) o igual|\bigual o (?:mayor|superior)"),
+    ("<=", r"<=|≤|\bmaxim[oa]\b|\bno (?:mayor|superior|exced)|\b(?:menor|inferior) o igual|\bigual o (?:menor|inferior)|\bhasta\b"),
+    (">", r">|\b(?:mayor|superior) (?:a|al|que)\b"),
+    ("<", r"<|\b(?:menor|inferior) (?:a|al|que)\b"),
+)
+_DATE_COMPARATOR_PATTERNS = (
+    # 'vigente hasta el 31/12/2025': the document must stay valid at least until then.
+    (">=", r"\bvigen\w*(?:\s+\w+){0,4}?\s+hasta\b|\bvigen|\bdesde\b|\ba partir\b|\bposterior|\bdespues\b|\bno antes\b|\bal menos\b"),
+    ("<=", r"\bhasta\b|\bantes\b|\ba mas tardar\b|\bno posterior|\blimite\b"),
+)
+
+_DECLARATION_RE = re.compile(r"declara|acept|compromiso|comprometo|si/no")
+_POSITIVE_RE = re.compile(r"\b(?:acepto|aceptamos|declaro|declaramos|me comprometo|nos comprometemos)\b")
+_POSITIVE_ACCENTED_RE = re.compile(r"\bs[íÍ]\b", flags=re.IGNORECASE)
+_NEGATIVE_RE = re.compile(r"\bno\s+(?:acepto|aceptamos|declaro|declaramos|cumple|cumplimos|me comprometo|nos comprometemos)\b|:\s*no\s*(?:$|[.;,])")
+
+_CITATION_RE = re.compile(r"^\[([^\]\n]+), p\. (\d+)\]$")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.;])\s+")
+
+
+class Sentence(NamedTuple):
+    text: str
+    citation: Optional[str]
+
+
+def parse_number(raw: str) -> float:
+    """
+    Parses '80,187.24', '80.187,24', '80187' or '12,5'. With both separators the
+    last one is decimal; a lone separator followed by exactly three digits is a
+    thousands separator.
+    """
+    if "," in raw and "." in raw:
+        decimal = "," if raw.rfind(",") > raw.rfind(".") else "."
+        thousands = "." if decimal == "," else ","
+        return float(raw.replace(thousands, "").replace(decimal, "."))
+    for separator in (",", "."):
+        if separator in raw:
+            parts = raw.split(separator)
+            if len(parts) > 2 or len(parts[-1]) == 3:
+                return float(raw.replace(separator, ""))
+            return float(raw.replace(separator, "."))
+    return float(raw)
+
+
+def find_amounts(text: str) -> List[float]:
+    return [parse_number(match.group(1) or match.group(2)) for match in _MONEY_RE.finditer(text)]
+
+
+def find_percentages(text: str) -> List[float]:
+    return [parse_number(match.group(1)) for match in _PERCENT_RE.finditer(text)]
+
+
+def find_dates(text: str) -> List[date]:
+    folded = strip_accents(text).lower()
+    dates = []
+    for pattern, parts in _DATE_RES:
+        for match in pattern.finditer(folded):
+            try:
+                dates.append(date(*parts(match)))
+            except ValueError:
+                continue
+    return dates
+
+
+# Each kind: how to extract its values, its comparator words, and how to display a value.
+_VALUE_KINDS = (
+    ("percentage", find_percentages, _COMPARATOR_PATTERNS, lambda value: f"{value:g}%"),
+    ("amount", find_amounts, _COMPARATOR_PATTERNS, lambda value: f"${value:,.2f}"),
+    ("date", find_dates, _DATE_COMPARATOR_PATTERNS, lambda value: value.strftime("%d/%m/%Y")),
+)
+
+
+def parse_comparator(details: str, patterns=_COMPARATOR_PATTERNS) -> Optional[str]:
+    """The single comparison a requirement asks for, or None if there is none or several."""
+    text = strip_accents(details or "").lower()
+    found = set()
+    for comparator, pattern in patterns:
+        if re.search(pattern, text):
+            found.add(comparator)
+            text = re.sub(pattern, " ", text)
+    return found.pop() if len(found) == 1 else None
+
+
+def _compare(value: Any, comparator: str, threshold: Any) -> bool:
+    return {
+        ">=": value >= threshold,
+        "<=": value <= threshold,
+        ">": value > threshold,
+        "<": value < threshold,
+    }[comparator]
+
+
+def split_sentences(text: str) -> List[Sentence]:
+    """Splits formatted passages (or a whole document) into sentences tagged with their page citation."""
+    sentences = []
+    citation = None
+    for line in (text or "").splitlines():
+        header = _CITATION_RE.match(line.strip())
+        if header:
+            citation = f"{header.group(1)}, p. {header.group(2)}"
+            continue
+        sentences.extend(Sentence(part.strip(), citation) for part in _SENTENCE_SPLIT_RE.split(line) if part.strip())
+    return sentences
+
+
+def relevant_sentences(text: str, requirement_name: str) -> List[Sentence]:
+    """Sentences that mention most of the requirement's subject terms."""
+    terms = set(tokenize(requirement_name)) - _COMPARISON_TERMS
+    if not terms:
+        return []
+    return [
+        sentence for sentence in split_sentences(text)
+        if len(terms & set(tokenize(sentence.text))) / len(terms) >= MIN_TERM_COVERAGE
+    ]
+
+
+def _distinct(values: List[Any]) -> List[Any]:
+    distinct: List[Any] = []
+    for value in values:
+        if not any(_same_value(value, seen) for seen in distinct):
+            distinct.append(value)
+    return distinct
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) < 0.005
+    return a == b
+
+
+def _cited(sentence: Sentence) -> str:
+    return f"'{sentence.text[:200]}'" + (f" ({sentence.citation})" if sentence.citation else "")
+
+
+def _finding(
+    agent_source: str,
+    requirement_name: str,
+    requirement_details: str,
+    is_compliant: bool,
+    observation: str,
+    declared: str,
+    annex_evidence: str
+) -> Dict[str, Any]:
+    finding = {
+        "requirementName": requirement_name,
+        "requirementDetails": requirement_details,
+        "isCompliant": is_compliant,
+        "severity": "OK" if is_compliant else "CRITICAL",
+        "observation": observation,
+        "recommendation": "No action required." if is_compliant else "Consider as serious non-compliance if the requirement is mandatory.",
+        "isConsistent": True,
+        "agentSource": agent_source
+    }
+    if agent_source == "Legal":
+        finding.update({"declaredCompliance": declared, "annexEvidenceSummary": annex_evidence})
+    else:
+        finding.update({"declaredValue": declared, "foundInAnnexValue": annex_evidence})
+    return finding
+
+
+def _evaluate_threshold(
+    agent_source: str, name: str, details: str, form_text: str, evidence_text: str
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Returns (applies, finding). A rule applies when the details state one threshold of a known kind."""
+    for kind, extract, comparator_patterns, display in _VALUE_KINDS:
+        thresholds = _distinct(extract(details))
+        if not thresholds:
+            continue
+        comparator = parse_comparator(details, comparator_patterns)
+        if len(thresholds) != 1 or comparator is None:
+            return True, None
+        threshold = thresholds[0]
+
+        form_sentences = [s for s in relevant_sentences(form_text, name) if extract(s.text)]
+        declared_values = _distinct([value for sentence in form_sentences for value in extract(sentence.text)])
+        if len(declared_values) != 1:
+            return True, None
+        declared = declared_values[0]
+
+        annex_sentence = next(
+            (s for s in relevant_sentences(evidence_text, name) if any(_same_value(declared, value) for value in extract(s.text))),
+            None
+        )
+        if annex_sentence is None:
+            return True, None
+
+        is_compliant = _compare(declared, comparator, threshold)
+        verdict = "meets" if is_compliant else "does not meet"
+        observation = (
+            f"Verified automatically: the declared {kind} {display(declared)} {verdict} the requirement "
+            f"({comparator} {display(threshold)}). Declared in {_cited(form_sentences[0])}; "
+            f"the same value appears in the annex: {_cited(annex_sentence)}."
+        )
+        return True, _finding(agent_source, name, details, is_compliant, observation, display(declared), _cited(annex_sentence))
+    return False, None
+
+
+def _declaration(text: str) -> Optional[bool]:
+    folded = strip_accents(text).lower()
+    negative = bool(_NEGATIVE_RE.search(folded))
+    positive = bool(_POSITIVE_RE.search(_NEGATIVE_RE.sub(" ", folded)) or _POSITIVE_ACCENTED_RE.search(text))
+    if positive == negative:
+        return None
+    return positive
+
+
+def _declaration_answers(text: str, requirement_name: str) -> List[Tuple[Sentence, bool]]:
+    """
+    The Sí/Acepto (True) or No (False) answers given next to the requirement.
+    Each sentence that names the requirement is read together with its neighbours,
+    since forms often put the answer right after the label.
+    """
+    sentences = split_sentences(text)
+    terms = set(tokenize(requirement_name)) - _COMPARISON_TERMS
+    answers = []
+    for index, sentence in enumerate(sentences):
+        if not terms or len(terms & set(tokenize(sentence.text))) / len(terms) < MIN_TERM_COVERAGE:
+            continue
+        window = " ".join(s.text for s in sentences[max(0, index - 1):index + 2])
+        answer = _declaration(window)
+        if answer is not None:
+            answers.append((sentence, answer))
+    return answers
+
+
+def _evaluate_declaration(name: str, details: str, form_text: str, evidence_text: str) -> Optional[Dict[str, Any]]:
+    if not _DECLARATION_RE.search(strip_accents(f"{name} {details}").lower()):
+        return None
+
+    form_answers = _declaration_answers(form_text, name)
+    if not form_answers or len({answer for _, answer in form_answers}) != 1:
+        return None
+    form_sentence, declared_yes = form_answers[0]
+
+    annex_answers = _declaration_answers(evidence_text, name)
+    annex_positive = next((s for s, answer in annex_answers if answer), None)
+    annex_negative = next((s for s, answer in annex_answers if not answer), None)
+
+    if declared_yes and annex_positive is not None and annex_negative is None:
+        observation = f"Verified automatically: the bidder accepts the requirement in {_cited(form_sentence)}, confirmed in the annex: {_cited(annex_positive)}."
+        return _finding("Legal", name, details, True, observation, form_sentence.text[:200], _cited(annex_positive))
+    if not declared_yes and annex_positive is None:
+        observation = f"Verified automatically: the bidder does not accept the requirement in {_cited(form_sentence)}."
+        evidence = _cited(annex_negative) if annex_negative else "No acceptance found in the annex."
+        return _finding("Legal", name, details, False, observation, form_sentence.text[:200], evidence)
+    return None
+
+
+def evaluate_requirement(
+    agent_source: str,
+    requirement_name: str,
+    requirement_details: str,
+    form_text: str,
+    evidence_text: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Decides a requirement locally when the evidence leaves no doubt, returning a
+    finding in the specialist's schema; returns None to leave it to the LLM.
+
+    - Thresholds (amounts, percentages, dates): the details state exactly one
+      value and one comparison, the form declares exactly one value for the
+      requirement, and the annex shows that same value.
+    - Declarations (legal): the form answers Sí/Acepto or No without
+      contradiction, and the annex agrees.
+    """
+    if agent_source not in RULE_ENGINE_SOURCES:
+        return None
+    applies, finding = _evaluate_threshold(agent_source, requirement_name, requirement_details or "", form_text or "", evidence_text or "")
+    if applies or agent_source != "Legal":
+        return finding
+    return _evaluate_declaration(requirement_name, requirement_details or "", form_text or "", evidence_text or "")
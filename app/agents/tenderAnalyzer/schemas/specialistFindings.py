@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional, Union, Literal
+from typing import List, Optional, Union, Literal
 
 class BaseFinding(BaseModel):
     """
@@ -67,4 +67,19 @@ class LegalFinding(BaseFinding):
         description="True if the declaration is consistent with the annex's content."
     )
 
-AnyFinding = Union[FinancialFinding, TechnicalFinding, LegalFinding]
\ No newline at end of file
+AnyFinding = Union[FinancialFinding, TechnicalFinding, LegalFinding]
+
+class AnnexFindingsBatch(BaseModel):
+    """
+    Output schema for annex-centric evaluation: the findings for every
+    requirement mapped to one annex, grouped by specialist.
+    """
+    financialFindings: List[FinancialFinding] = Field(
+        description="One FinancialFinding per requirement listed under 'financial'."
+    )
+    technicalFindings: List[TechnicalFinding] = Field(
+        description="One TechnicalFinding per requirement listed under 'technical'."
+    )
+    legalFindings: List[LegalFinding] = Field(
+        description="One LegalFinding per requirement listed under 'legal'."
+    )
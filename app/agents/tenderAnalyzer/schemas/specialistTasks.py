@@ -1,11 +1,14 @@
 from pydantic import BaseModel, Field
+from typing import Optional
 from .masterChecklist import Requirement
 
 class SpecialistTask(BaseModel):
     """
     Represents a single, focused task for a specialist agent.
-    This is the "surgical package" created by the router.
+    This is the "surgical package" created by the router. Texts are carried as
+    documentStore handles, so a task stays small however large its annex is.
     """
     requirementToVerify: Requirement = Field(description="The specific requirement object from the MasterChecklist to be audited.")
-    evidenceText: str = Field(description="The full text content of the specific annex where the evidence should be found.")
-    mainFormText: str = Field(description="The full text of the main proposal form for additional context.")
\ No newline at end of file
+    evidenceRef: str = Field(description="Document store handle of the annex where the evidence should be found, or of its most relevant passages with page citations.")
+    mainFormRef: str = Field(description="Document store handle of the main proposal form, or of its most relevant passages with page citations.")
+    annexKey: Optional[str] = Field(default=None, description="Filename of the annex the evidence was taken from.")
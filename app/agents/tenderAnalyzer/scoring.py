@@ -0,0 +1,250 @@
+"""
+Proposal scoring as array operations over a findings matrix.
+
+The findings of a tender are stored as counts[requirement, proposal, severity]
+(plus the same shape for requirements that were not evaluated). Scoring a
+policy is then a couple of matrix products: deductions per area and proposal,
+clipped area scores, and their weighted mean as viabilityTotal. The matrix is
+persisted next to the tender so /tenders/{id}/rescore can try other deduction
+tables and area weights without re-running the analysis or calling the LLM.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+from ...core import constants
+from ...core.config import (
+    SCORING_DEDUCTION_CRITICAL, SCORING_DEDUCTION_OK, SCORING_DEDUCTION_WARNING,
+    SCORING_WEIGHT_FINANCIAL, SCORING_WEIGHT_LEGAL, SCORING_WEIGHT_TECHNICAL
+)
+
+SCORE_MATRIX_FILENAME = "score_matrix.npz"
+SEVERITIES = ("OK", "WARNING", "CRITICAL")
+AREAS = ("legal", "technical", "financial")
+# Findings of other sources (e.g. the Project Manager's RUC check) are reported but not scored.
+AREA_BY_AGENT_SOURCE = {"Legal": "legal", "Technical": "technical", "Financial": "financial"}
+MAX_AREA_SCORE = 100
+
+DEFAULT_DEDUCTIONS = {"CRITICAL": SCORING_DEDUCTION_CRITICAL, "WARNING": SCORING_DEDUCTION_WARNING, "OK": SCORING_DEDUCTION_OK}
+DEFAULT_AREA_WEIGHTS = {"legal": SCORING_WEIGHT_LEGAL, "technical": SCORING_WEIGHT_TECHNICAL, "financial": SCORING_WEIGHT_FINANCIAL}
+
+
+class ScoringPolicy(BaseModel):
+    """
+    Points deducted per finding and weight of each area in viabilityTotal.
+    Severities and areas left out keep their configured (SCORING_*) values.
+    """
+    deductions: Dict[str, float] = Field(default_factory=dict, description="Points per finding by severity, e.g. {\"CRITICAL\": 25}.")
+    areaDeductions: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Per-area overrides of `deductions`, e.g. {\"legal\": {\"CRITICAL\": 40}}."
+    )
+    areaWeights: Dict[str, float] = Field(default_factory=dict, description="Weight of each area in viabilityTotal, e.g. {\"technical\": 2}.")
+
+    @model_validator(mode="after")
+    def check_keys(self) -> "ScoringPolicy":
+        tables = [self.deductions, *self.areaDeductions.values()]
+        unknown_severities = {severity for table in tables for severity in table} - set(SEVERITIES)
+        unknown_areas = (set(self.areaDeductions) | set(self.areaWeights)) - set(AREAS)
+        if unknown_severities:
+            raise ValueError(f"Unknown severities {sorted(unknown_severities)}. Available: {', '.join(SEVERITIES)}")
+        if unknown_areas:
+            raise ValueError(f"Unknown areas {sorted(unknown_areas)}. Available: {', '.join(AREAS)}")
+        weights = self.weight_vector()
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Area weights must be non-negative and not all zero.")
+        return self
+
+    def deduction_table(self) -> np.ndarray:
+        """Points per finding as an (area, severity) array."""
+        base = {**DEFAULT_DEDUCTIONS, **self.deductions}
+        return np.array([
+            [{**base, **self.areaDeductions.get(area, {})}[severity] for severity in SEVERITIES]
+            for area in AREAS
+        ], dtype=np.float64)
+
+    def weight_vector(self) -> np.ndarray:
+        weights = {**DEFAULT_AREA_WEIGHTS, **self.areaWeights}
+        return np.array([weights[area] for area in AREAS], dtype=np.float64)
+
+    def resolved(self) -> Dict[str, Any]:
+        """The full policy applied, with the configured values filled in."""
+        table = self.deduction_table()
+        return {
+            "deductions": {area: dict(zip(SEVERITIES, row.tolist())) for area, row in zip(AREAS, table)},
+            "areaWeights": dict(zip(AREAS, self.weight_vector().tolist()))
+        }
+
+
+def _score_value(value: float) -> Any:
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
+class ScoreMatrix:
+    """
+    Findings of one or more proposals indexed by requirement (agent source and
+    requirement name), proposal and severity. `counts` holds the evaluated
+    findings, `pending` the ones not evaluated (timeout, budget, early
+    termination), which are reported but never scored.
+    """
+
+    def __init__(
+        self,
+        requirements: List[str],
+        requirement_areas: np.ndarray,
+        bidders: List[str],
+        counts: np.ndarray,
+        pending: np.ndarray
+    ):
+        self.requirements = requirements
+        self.requirement_areas = requirement_areas
+        self.bidders = bidders
+        self.counts = counts
+        self.pending = pending
+
+    @classmethod
+    def from_analyses(cls, analyses: Iterable[Dict[str, Any]]) -> "ScoreMatrix":
+        """Builds the matrix from proposal analyses ({bidderName, findings})."""
+        analyses = list(analyses)
+        requirement_index: Dict[Tuple[str, str], int] = {}
+        entries = []
+        for proposal, analysis in enumerate(analyses):
+            for finding in analysis.get("findings", []):
+                severity = finding.get("severity")
+                if severity not in SEVERITIES:
+                    continue
+                key = (finding.get("agentSource") or "", finding.get("requirementName") or "")
+                requirement = requirement_index.setdefault(key, len(requirement_index))
+                entries.append((requirement, proposal, SEVERITIES.index(severity), bool(finding.get("notEvaluated"))))
+
+        shape = (len(requirement_index), len(analyses), len(SEVERITIES))
+        counts = np.zeros(shape, dtype=np.uint16)
+        pending = np.zeros(shape, dtype=np.uint16)
+        if entries:
+            requirement, proposal, severity, not_evaluated = np.array(entries, dtype=np.int64).T
+            evaluated = not_evaluated == 0
+            np.add.at(counts, (requirement[evaluated], proposal[evaluated], severity[evaluated]), 1)
+            np.add.at(pending, (requirement[~evaluated], proposal[~evaluated], severity[~evaluated]), 1)
+
+        area_index = {area: index for index, area in enumerate(AREAS)}
+        requirement_areas = np.array(
+            [area_index.get(AREA_BY_AGENT_SOURCE.get(source), -1) for source, _ in requirement_index],
+            dtype=np.int8
+        )
+        return cls(
+            [f"{source}: {name}" for source, name in requirement_index],
+            requirement_areas,
+            [analysis.get("bidderName", "Unknown name") for analysis in analyses],
+            counts,
+            pending
+        )
+
+    @classmethod
+    def from_findings(cls, findings: List[Dict[str, Any]], bidder_name: str = "Unknown name") -> "ScoreMatrix":
+        return cls.from_analyses([{"bidderName": bidder_name, "findings": findings}])
+
+    def _area_membership(self) -> np.ndarray:
+        """(requirement, area) one-hot matrix; unscored requirements are all zeros."""
+        return (self.requirement_areas[:, None] == np.arange(len(AREAS))[None, :]).astype(np.float64)
+
+    def score(self, policy: Optional[ScoringPolicy] = None) -> Dict[str, np.ndarray]:
+        """
+        Area scores (area, proposal) and viabilityTotal (proposal,) under `policy`
+        (the configured one if None).
+        """
+        policy = policy or ScoringPolicy()
+        membership = self._area_membership()
+        # Findings per area, proposal and severity, then the points they deduct.
+        area_counts = np.einsum("ra,rps->aps", membership, self.counts)
+        deductions = np.einsum("aps,as->ap", area_counts, policy.deduction_table())
+        area_scores = np.clip(MAX_AREA_SCORE - deductions, 0, None)
+        weights = policy.weight_vector()
+        viability = np.floor(weights @ area_scores / weights.sum() + 1e-9).astype(np.int64)
+        return {"areaScores": area_scores, "viabilityTotal": viability}
+
+    def scores(self, policy: Optional[ScoringPolicy] = None) -> List[Dict[str, Any]]:
+        """The `scores` dict of each proposal, as in the proposal reports."""
+        result = self.score(policy)
+        return [
+            {
+                **{area: _score_value(value) for area, value in zip(AREAS, result["areaScores"][:, proposal])},
+                "viabilityTotal": int(result["viabilityTotal"][proposal])
+            }
+            for proposal in range(len(self.bidders))
+        ]
+
+    def findings_summaries(self) -> List[Dict[str, int]]:
+        """The `findingsSummary` of each proposal (not-evaluated findings count under their severity too)."""
+        by_severity = (self.counts + self.pending).sum(axis=0, dtype=np.int64)
+        not_evaluated = self.pending.sum(axis=(0, 2), dtype=np.int64)
+        return [
+            {
+                "total": int(by_severity[proposal].sum()),
+                "critical": int(by_severity[proposal, SEVERITIES.index("CRITICAL")]),
+                "warning": int(by_severity[proposal, SEVERITIES.index("WARNING")]),
+                "ok": int(by_severity[proposal, SEVERITIES.index("OK")]),
+                "notEvaluated": int(not_evaluated[proposal])
+            }
+            for proposal in range(len(self.bidders))
+        ]
+
+    def ranking(self, policy: Optional[ScoringPolicy] = None) -> List[Dict[str, Any]]:
+        """Proposals by descending viabilityTotal (ties keep the analysis order)."""
+        viability = self.score(policy)["viabilityTotal"]
+        order = np.argsort(-viability, kind="stable")
+        return [
+            {"rank": rank, "bidderName": self.bidders[proposal], "viabilityTotal": int(viability[proposal])}
+            for rank, proposal in enumerate(order.tolist(), start=1)
+        ]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                requirements=np.array(self.requirements, dtype=np.str_),
+                requirement_areas=self.requirement_areas,
+                bidders=np.array(self.bidders, dtype=np.str_),
+                counts=self.counts,
+                pending=self.pending
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ScoreMatrix":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["requirements"].tolist(),
+                data["requirement_areas"],
+                data["bidders"].tolist(),
+                data["counts"],
+                data["pending"]
+            )
+
+
+def _score_matrix_path(tender_id: str) -> Path:
+    return constants.TENDERS_DIR / f"tender_{tender_id}" / SCORE_MATRIX_FILENAME
+
+
+def save_score_matrix(tender_id: str, analyses: Iterable[Dict[str, Any]]) -> Optional[ScoreMatrix]:
+    """Persists the findings matrix of a finished analysis next to its tender PDF."""
+    matrix = ScoreMatrix.from_analyses(analyses)
+    try:
+        matrix.save(_score_matrix_path(tender_id))
+    except OSError as e:
+        print(f"Warning: Could not save the score matrix of tender {tender_id}: {e}")
+        return None
+    return matrix
+
+
+def load_score_matrix(tender_id: str) -> Optional[ScoreMatrix]:
+    """Returns the persisted findings matrix of a tender, if any."""
+    path = _score_matrix_path(tender_id)
+    if not path.is_file():
+        return None
+    try:
+        return ScoreMatrix.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: Could not read the score matrix {path}: {e}")
+        return None
@@ -1,19 +1,63 @@
 # app/agents/specialistNodes.py
 
-from typing import Dict, Any, List
+import asyncio
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from .state import ProposalAuditState
-from .schemas.specialistFindings import FinancialFinding, TechnicalFinding, LegalFinding
+from .schemas.specialistFindings import FinancialFinding, TechnicalFinding, LegalFinding, AnnexFindingsBatch
 from .schemas.routerSchemas import AnnexMapOutput
 from .schemas.specialistTasks import SpecialistTask
-from .prompts import CREATE_ANNEX_MAP_PROMPT, FINANCIAL_ANALYSIS_PROMPT, TECHNICAL_ANALYSIS_PROMPT, LEGAL_ANALYSIS_PROMPT
+from .prompts import CREATE_ANNEX_MAP_PROMPT, FINANCIAL_ANALYSIS_PROMPT, TECHNICAL_ANALYSIS_PROMPT, LEGAL_ANALYSIS_PROMPT, ANNEX_BATCH_ANALYSIS_PROMPT
 from ..services import llmService
-from langchain_core.messages import SystemMessage, HumanMessage
+from ..services.documentStore import documentStore, proposal_namespace
+from ..services.llmScheduler import PRIORITY_CRITICAL, PRIORITY_BULK
+from ..services.llmBudget import BudgetExceededError
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
 from .schemas.masterChecklist import MasterChecklist, Requirement
+from .annexResolver import AnnexIndex, resolve_requirement_annexes
+from .retrievalIndex import MAIN_FORM_SOURCE, format_passages, merge_passage_texts
+from .proposalIntake import get_proposal_intake, RUC_REQUIREMENT_NAME
+from .analysisProfiles import get_analysis_profile
+from .ruleEngine import evaluate_requirement, RULE_ENGINE_SOURCES
+from .scoring import ScoreMatrix
+from .bidSummary import extract_bid_summary
+from ...core.config import (
+    RETRIEVAL_EVIDENCE_TOP_K, RETRIEVAL_FORM_TOP_K, RULE_ENGINE_ENABLED,
+    EARLY_TERMINATION_CRITICAL_FINDINGS, EARLY_TERMINATION_ON_INVALID_RUC, EARLY_TERMINATION_ACTION
+)
+
+# Passages per requirement once the analysis nears its LLM budget (see llmBudget).
+BUDGET_DEGRADED_EVIDENCE_TOP_K = 2
+BUDGET_DEGRADED_FORM_TOP_K = 1
+
+def build_specialist_messages(system_prompt: str, task: SpecialistTask) -> List[BaseMessage]:
+    """
+    Builds the messages for a specialist call with the static parts first:
+    system prompt, proposal form, annex, and only then the requirement.
+    Calls for the same proposal therefore share a byte-identical prefix that
+    the provider's prompt cache can reuse.
+    """
+    context_for_llm = (
+        "**Main Proposal Form Text (for context):**\n"
+        f"{documentStore.get(task.mainFormRef)}\n"
+        "---\n"
+        "**Evidence Document Text (Annex):**\n"
+        f"{documentStore.get(task.evidenceRef)}\n"
+        "---\n"
+        "**Requirement to Verify:**\n"
+        f"{task.requirementToVerify.model_dump_json(indent=2)}"
+    )
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=context_for_llm)
+    ]
 
 async def projectManagerRouterNode(state: ProposalAuditState) -> Dict[str, Any]:
     """
     Acts as the intelligent router for a single proposal audit.
-    Validates RUC early and creates findings before specialist analysis.
+    Adds the RUC findings of the proposal's intake before specialist analysis.
+    Near the LLM budget, tasks carry fewer evidence passages; once it is
+    exhausted, annexes are matched by retrieval instead of the LLM.
     """
     proposal = state.get("proposal", {})
     masterChecklist_dict = state.get("masterChecklist", {})
@@ -22,13 +66,11 @@ async def projectManagerRouterNode(state: ProposalAuditState) -> Dict[str, Any]:
     print(f"EXECUTING ROUTER for company: {companyName}")
 
     try:
-        masterChecklist = MasterChecklist.model_validate(masterChecklist_dict)
+        # The audit pool validates the checklist once and shares the instance across proposals.
+        masterChecklist = masterChecklist_dict if isinstance(masterChecklist_dict, MasterChecklist) else MasterChecklist.model_validate(masterChecklist_dict)
     except Exception as e:
         print(f"ROUTER ERROR: Could not validate MasterChecklist schema: {e}")
         return {"technicalTasks": [], "financialTasks": [], "legalTasks": []}
-
-    mainFormText = proposal.get("mainFormText")
-    annexes = proposal.get("attachments", {})
     
     all_requirements = (masterChecklist.financialRequirements + 
                         masterChecklist.technicalRequirements + 
@@ -41,101 +83,112 @@ async def projectManagerRouterNode(state: ProposalAuditState) -> Dict[str, Any]:
     findings = state.get("findings", [])
     new_findings = []
     
-    ruc = proposal.get("ruc")
-    if ruc:
-        from ..tenderAnalyzer.tools import validateRuc
-        print(f"Validating RUC: {ruc}")
-        
-        try:
-            ruc_result = await validateRuc.ainvoke({"ruc": ruc})
-            
-            if "error" in ruc_result:
-                new_findings.append({
-                    "agentSource": "Project Manager",
-                    "severity": "CRITICAL",
-                    "requirementName": "Company RUC Validation",
-                    "requirementDetails": "Verify bidder is registered with SRI (Tax Authority)",
-                    "isCompliant": False,
-                    "observation": f"RUC Validation Failed: {ruc_result['error']}. Company may not be legally registered.",
-                    "recommendation": "Request valid RUC or disqualify proposal."
-                })
-            else:
-                new_findings.append({
-                    "agentSource": "Project Manager",
-                    "severity": "OK",
-                    "requirementName": "Company RUC Validation",
-                    "requirementDetails": "Verify bidder is registered with SRI (Tax Authority)",
-                    "isCompliant": True,
-                    "observation": f"RUC verified: {ruc_result.get('bidderName', 'N/A')} - Status: {ruc_result.get('status', 'N/A')}",
-                    "recommendation": "Company legally registered with SRI."
-                })
-        except Exception as e:
-            print(f"RUC validation error: {e}")
-            new_findings.append({
-                "agentSource": "Project Manager",
-                "severity": "WARNING",
-                "requirementName": "Company RUC Validation",
-                "requirementDetails": "Verify bidder is registered with SRI (Tax Authority)",
-                "isCompliant": False,
-                "observation": f"Unable to verify RUC: {str(e)}. Manual verification required.",
-                "recommendation": "Verify company registration manually."
-            })
-    else:
-        new_findings.append({
-            "agentSource": "Project Manager",
-            "severity": "CRITICAL",
-            "requirementName": "Company RUC Validation",
-            "requirementDetails": "RUC number is mandatory for bidders",
-            "isCompliant": False,
-            "observation": "No RUC provided with proposal submission.",
-            "recommendation": "Request RUC from bidder."
-        })
-    
+    tenderId = state.get("tenderId")
+    profile = get_analysis_profile(state.get("analysisProfile"))
+    evidence_top_k = RETRIEVAL_EVIDENCE_TOP_K if profile.evidenceTopK is None else profile.evidenceTopK
+    form_top_k = RETRIEVAL_FORM_TOP_K if profile.formTopK is None else profile.formTopK
+    if llmService.budget.is_degraded(tenderId):
+        llmService.budget.note_degradation(tenderId, "smallerEvidenceWindows")
+        evidence_top_k = min(evidence_top_k or BUDGET_DEGRADED_EVIDENCE_TOP_K, BUDGET_DEGRADED_EVIDENCE_TOP_K)
+        form_top_k = min(form_top_k or BUDGET_DEGRADED_FORM_TOP_K, BUDGET_DEGRADED_FORM_TOP_K)
+    namespace = proposal_namespace(tenderId, proposal)
+    # Documents, retrieval index and RUC check usually come from the intake started
+    # while the master checklist was built (see proposalIntake).
+    intake = await get_proposal_intake(tenderId, proposal, evidence_top_k > 0 or form_top_k > 0)
+    new_findings.extend(intake.ruc_findings)
+    new_findings.extend(intake.document_findings)
+    main_form_ref, annex_index_ref, attachment_refs = intake.main_form_ref, intake.annex_index_ref, intake.attachment_refs
+    mainFormText, annexIndexText, annexes = intake.main_form_text, intake.annex_index_text, intake.annexes
+
     requirement_names = [req.name for req in all_requirements]
     available_annexes = list(annexes.keys())
-    
-    context_for_mapper = f"""Requirements List: {requirement_names}
+    annex_index = AnnexIndex(available_annexes)
+
+    # Most forms name their annexes explicitly ("Ver Anexo_1.pdf"): resolve those locally
+    # and only ask the LLM about the requirements that stay unresolved.
+    requirement_to_annex_map = resolve_requirement_annexes(
+        requirement_names, mainFormText, annexIndexText, annex_index
+    )
+    unresolved_names = [name for name in requirement_names if name not in requirement_to_annex_map]
+    print(f"Annex resolver mapped {len(requirement_to_annex_map)}/{len(requirement_names)} requirements locally.")
+
+    use_llm_mapping = profile.llmAnnexMapping
+    if unresolved_names and available_annexes and use_llm_mapping:
+        context_for_mapper = f"""Requirements List: {unresolved_names}
 ---
 Available Annexes in Proposal: {available_annexes}
 ---
 Main Proposal Form Text:
 {mainFormText}"""
-    
-    messages = [
-        SystemMessage(content=CREATE_ANNEX_MAP_PROMPT),
-        HumanMessage(content=context_for_mapper)
-    ]
-    structured_map_response = await llmService.invoke_json(
-        messages=messages, output_schema=AnnexMapOutput, model_name="gpt-4o-mini", temperature=0.0
-    )
-    requirement_to_annex_map = {
-        item.get("requirementName"): item.get("annexFilename")
-        for item in structured_map_response.get("annexMap", [])
-    }
-    
-    print("Requirement to Annex map created by LLM:", requirement_to_annex_map)
-    print("Available annexes in proposal:", list(annexes.keys()))
-
-    def normalize_filename(name: str | None) -> str:
-        """Helper to compare filenames flexibly."""
-        if not name: return ""
-        return name.replace(".pdf", "").replace("_", " ").replace("-", " ").lower().strip()
-
-    def find_real_annex_key(mapped_name: str | None) -> str | None:
-        """Finds the actual key in the annexes dict, ignoring case, underscores, and .pdf extension."""
-        if not mapped_name: return None
-        normalized_mapped_name = normalize_filename(mapped_name)
-        for real_key in annexes.keys():
-            if normalize_filename(real_key) == normalized_mapped_name:
-                return real_key
-        return None
+
+        messages = [
+            SystemMessage(content=CREATE_ANNEX_MAP_PROMPT),
+            HumanMessage(content=context_for_mapper)
+        ]
+        try:
+            structured_map_response = await llmService.invoke_json(
+                messages=messages, output_schema=AnnexMapOutput, model_name=profile.routerModel, temperature=0.0,
+                tender_id=state.get("tenderId"), proposal_name=companyName, node_name="router",
+                priority=PRIORITY_CRITICAL
+            )
+            llm_map = {
+                item.get("requirementName"): item.get("annexFilename")
+                for item in structured_map_response.get("annexMap", [])
+                if item.get("requirementName") in unresolved_names
+            }
+            print("Requirement to Annex map created by LLM:", llm_map)
+            requirement_to_annex_map.update(llm_map)
+        except BudgetExceededError as e:
+            print(f"ROUTER: {e} Matching annexes by retrieval instead.")
+            llmService.budget.note_degradation(tenderId, "retrievalAnnexMapping")
+            use_llm_mapping = False
+
+    if unresolved_names and intake.retrieval_index and not use_llm_mapping:
+        # Without the LLM mapper, fall back to the annex whose passages best match the requirement.
+        requirements_by_name = {req.name: req for req in all_requirements}
+        for name in unresolved_names:
+            requirement = requirements_by_name[name]
+            best_annex = intake.retrieval_index.best_source(f"{requirement.name} {requirement.details}", available_annexes)
+            if best_annex:
+                requirement_to_annex_map[name] = best_annex
+        unresolved_names = [name for name in requirement_names if name not in requirement_to_annex_map]
+
+    print("Available annexes in proposal:", available_annexes)
+
+    retrieval_index = intake.retrieval_index
+
+    def select_evidence(requirement: Requirement, annex_key: str) -> Tuple[str, str]:
+        """
+        Returns the (evidence, form) handles for a requirement: its top passages,
+        interned so tasks citing the same passages share one copy, or whole documents.
+        """
+        query = f"{requirement.name} {requirement.details}"
+        evidence_ref = attachment_refs[annex_key]
+        form_ref = main_form_ref
+        if retrieval_index and evidence_top_k > 0:
+            passages = format_passages(retrieval_index.search(query, annex_key, evidence_top_k))
+            evidence_ref = documentStore.intern(namespace, passages) if passages else evidence_ref
+        if retrieval_index and form_top_k > 0:
+            passages = format_passages(retrieval_index.search(query, MAIN_FORM_SOURCE, form_top_k))
+            form_ref = documentStore.intern(namespace, passages) if passages else form_ref
+        return evidence_ref, form_ref
 
     def prepare_tasks_for_specialist(requirements_list: List[Requirement]) -> List[SpecialistTask]:
         tasks = []
         for requirement in requirements_list:
             mapped_filename = requirement_to_annex_map.get(requirement.name)
-            real_annex_key = find_real_annex_key(mapped_filename)
-
+            real_annex_key = annex_index.resolve(mapped_filename)
+
+            if not real_annex_key and mapped_filename is None and not profile.llmAnnexMapping:
+                new_findings.append(not_evaluated_finding(
+                    "Project Manager", requirement, "profile",
+                    f"Not evaluated ({profile.name} profile): no annex is referenced for or matches this requirement, and the profile does not ask the LLM to find one.",
+                    "Run the standard analysis profile to have this requirement mapped and verified."
+                ))
+                continue
+            if not real_annex_key and mapped_filename is None and not use_llm_mapping:
+                new_findings.append(budget_finding("Project Manager", requirement))
+                continue
             if not real_annex_key:
                 new_findings.append({
                     "agentSource": "Project Manager", "severity": "CRITICAL",
@@ -146,10 +199,12 @@ Main Proposal Form Text:
                 })
                 continue
             
+            evidence_ref, form_ref = select_evidence(requirement, real_annex_key)
             tasks.append(SpecialistTask(
                 requirementToVerify=requirement,
-                evidenceText=annexes[real_annex_key],
-                mainFormText=mainFormText
+                evidenceRef=evidence_ref,
+                mainFormRef=form_ref,
+                annexKey=real_annex_key
             ))
         return tasks
 
@@ -158,208 +213,296 @@ Main Proposal Form Text:
     legalTasks = prepare_tasks_for_specialist(masterChecklist.legalRequirements)
 
     print(f"Router prepared {len(technicalTasks)} technical, {len(financialTasks)} financial, {len(legalTasks)} legal tasks.")
+
+    # Whole documents no task points at are only needed again if the proposal is re-routed.
+    referenced = {ref for task in financialTasks + technicalTasks + legalTasks for ref in (task.evidenceRef, task.mainFormRef)}
+    documentStore.unload(ref for ref in [main_form_ref, annex_index_ref, *attachment_refs.values()] if ref not in referenced)
     
     return {
         "findings": new_findings,
         "technicalTasks": technicalTasks,
         "financialTasks": financialTasks,
         "legalTasks": legalTasks,
+        "bidSummary": intake.bid_summary,
     }
 
-async def financialSpecialistNode(state: ProposalAuditState) -> Dict[str, Any]:
+# Prompt, output schema and telemetry node name for each specialist, keyed by agentSource.
+SPECIALIST_PROFILES = {
+    "Financial": (FINANCIAL_ANALYSIS_PROMPT, FinancialFinding, "financial_auditor"),
+    "Technical": (TECHNICAL_ANALYSIS_PROMPT, TechnicalFinding, "technical_auditor"),
+    "Legal": (LEGAL_ANALYSIS_PROMPT, LegalFinding, "legal_auditor"),
+}
+
+# ProposalAuditState key holding each specialist's tasks.
+SPECIALIST_TASK_KEYS = {
+    "Financial": "financialTasks",
+    "Technical": "technicalTasks",
+    "Legal": "legalTasks",
+}
+
+def try_rule_engine(agent_source: str, task: SpecialistTask, tender_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
-    Acts as the financial specialist. Receives a list of surgical tasks
-    from the router and executes them by performing LLM-driven cross-validation.
+    Returns the finding of the local rule engine when it can decide the task on
+    its own (see ruleEngine), or None when the task needs the LLM. The task's
+    texts must already be loaded in the documentStore.
     """
-    print("EXECUTING NODE: financialSpecialistNode")
-    
-    financial_tasks: List[SpecialistTask] = state.get("financialTasks", [])
-    if not financial_tasks:
-        print("SKIPPING: No financial tasks to perform.")
-        return {}
+    if not RULE_ENGINE_ENABLED or agent_source not in RULE_ENGINE_SOURCES:
+        return None
+    requirement = task.requirementToVerify
+    finding = evaluate_requirement(
+        agent_source, requirement.name, requirement.details,
+        documentStore.get(task.mainFormRef), documentStore.get(task.evidenceRef)
+    )
+    llmService.telemetry.record_rule_evaluation(tender_id, agent_source, finding is not None)
+    if finding is not None:
+        print(f"Rule engine decided {agent_source} Requirement: {requirement.name} ({finding['severity']})")
+    return finding
+
+async def run_specialist_task(
+    agent_source: str,
+    task: SpecialistTask,
+    tender_id: Optional[str] = None,
+    proposal_name: Optional[str] = None,
+    use_rules: bool = True,
+    model_name: str = "gpt-4o-mini"
+) -> Dict[str, Any]:
+    """
+    Audits one requirement with the given specialist and returns its finding.
+    Requirements the rule engine can decide never reach the LLM.
+    LLM failures become a CRITICAL finding asking for manual review; calls
+    refused by the LLM budget a "not evaluated (budget)" finding.
+    """
+    system_prompt, output_schema, node_name = SPECIALIST_PROFILES[agent_source]
+    print(f"Auditing {agent_source} Requirement: {task.requirementToVerify.name}")
 
-    new_findings = []
-    
-    for task_dict in financial_tasks:
-        try:
-            task = SpecialistTask.model_validate(task_dict)
-        except Exception as e:
-            print(f"ERROR: Could not validate task_dict data: {e}")
-            continue
-
-        print(f"Auditing Financial Requirement: {task.requirementToVerify.name}")
-        
-        context_for_llm = f"""
-        **Requirement to Verify:**
-        {task.requirementToVerify.model_dump_json(indent=2)}
-        ---
-        **Main Proposal Form Text (for context):**
-        {task.mainFormText}
-        ---
-        **Evidence Document Text (Annex):**
-        {task.evidenceText}
-        """
-        messages = [
-            SystemMessage(content=FINANCIAL_ANALYSIS_PROMPT),
-            HumanMessage(content=context_for_llm)
-        ]
+    try:
+        await documentStore.aload([task.mainFormRef, task.evidenceRef])
+        rule_finding = try_rule_engine(agent_source, task, tender_id) if use_rules else None
+        if rule_finding is not None:
+            return rule_finding
+        messages = build_specialist_messages(system_prompt, task)
+        finding_result = await llmService.invoke_json(
+            messages=messages,
+            output_schema=output_schema,
+            model_name=model_name,
+            temperature=0.0,
+            tender_id=tender_id,
+            proposal_name=proposal_name,
+            node_name=node_name,
+            priority=PRIORITY_BULK
+        )
+        finding_result["agentSource"] = agent_source
+        return finding_result
+
+    except BudgetExceededError:
+        return budget_finding(agent_source, task.requirementToVerify)
+    except Exception as e:
+        return {
+            "requirementName": task.requirementToVerify.name,
+            "isCompliant": False,
+            "isConsistent": False,
+            "severity": "CRITICAL",
+            "observation": f"An error occurred during AI analysis: {e}",
+            "recommendation": "Manual review required due to system error.",
+            "agentSource": agent_source
+        }
+
+# AnnexFindingsBatch field holding each specialist's findings.
+BATCH_FINDING_KEYS = {
+    "Financial": "financialFindings",
+    "Technical": "technicalFindings",
+    "Legal": "legalFindings",
+}
+
+def build_annex_batch_messages(batch: List[Tuple[str, SpecialistTask]]) -> List[BaseMessage]:
+    """
+    Builds one call covering every requirement mapped to the same annex.
+    The form and annex passages of all tasks are sent once, followed by the
+    requirements grouped by specialist.
+    """
+    form_text = merge_passage_texts([documentStore.get(ref) for ref in dict.fromkeys(task.mainFormRef for _, task in batch)])
+    evidence_text = merge_passage_texts([documentStore.get(ref) for ref in dict.fromkeys(task.evidenceRef for _, task in batch)])
+    requirements_by_specialist = {source.lower(): [] for source in SPECIALIST_PROFILES}
+    for agent_source, task in batch:
+        requirements_by_specialist[agent_source.lower()].append(task.requirementToVerify.model_dump())
+
+    context_for_llm = (
+        "**Main Proposal Form Text (for context):**\n"
+        f"{form_text}\n"
+        "---\n"
+        "**Evidence Document Text (Annex):**\n"
+        f"{evidence_text}\n"
+        "---\n"
+        "**Requirements to Verify:**\n"
+        f"{json.dumps(requirements_by_specialist, indent=2, ensure_ascii=False)}"
+    )
+    return [
+        SystemMessage(content=ANNEX_BATCH_ANALYSIS_PROMPT),
+        HumanMessage(content=context_for_llm)
+    ]
 
-        try:
-            finding_result = await llmService.invoke_json(
-                messages=messages,
-                output_schema=FinancialFinding,
-                model_name="gpt-4o-mini",
-                temperature=0.0
-            )
-            finding_result["agentSource"] = "Financial"
-            new_findings.append(finding_result)
+async def run_annex_batch(
+    batch: List[Tuple[str, SpecialistTask]],
+    tender_id: Optional[str] = None,
+    proposal_name: Optional[str] = None,
+    model_name: str = "gpt-4o-mini",
+    use_rules: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Audits all (agentSource, task) pairs that share one annex (or one
+    proposal) in a single call and returns their findings in batch order.
+    Requirements the rule engine decides are left out of the call;
+    requirements the model left out of its answer are audited again one by one.
+    """
+    specialist_options = {"tender_id": tender_id, "proposal_name": proposal_name, "model_name": model_name}
+    if len(batch) == 1:
+        agent_source, task = batch[0]
+        return [await run_specialist_task(agent_source, task, use_rules=use_rules, **specialist_options)]
 
-        except Exception as e:
-            error_finding = {
-                "requirementName": task.requirementToVerify.name,
-                "isCompliant": False,
-                "isConsistent": False,
-                "severity": "CRITICAL",
-                "observation": f"An error occurred during AI analysis: {e}",
-                "recommendation": "Manual review required due to system error.",
-                "agentSource": "Financial"
-            }
-            new_findings.append(error_finding)
+    findings: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+    try:
+        await documentStore.aload([ref for _, task in batch for ref in (task.mainFormRef, task.evidenceRef)])
+        if use_rules:
+            findings = [try_rule_engine(agent_source, task, tender_id) for agent_source, task in batch]
+    except Exception as e:
+        print(f"ERROR preparing annex batch for {batch[0][1].annexKey}: {e}")
+    pending = [index for index, finding in enumerate(findings) if finding is None]
+    llm_batch = [batch[index] for index in pending]
 
-    print(f"financialSpecialistNode generated {len(new_findings)} new findings.")
-    
-    return {"findings": new_findings}
+    if len(llm_batch) == 1:
+        agent_source, task = llm_batch[0]
+        findings[pending[0]] = await run_specialist_task(agent_source, task, use_rules=False, **specialist_options)
+    if len(llm_batch) <= 1:
+        return findings
 
-async def technicalSpecialistNode(state: ProposalAuditState) -> Dict[str, Any]:
-    """
-    Acts as the technical specialist.
-    """
-    print("EXECUTING NODE: technicalSpecialistNode")
-    
-    technical_tasks: List[SpecialistTask] = state.get("technicalTasks", [])
-    if not technical_tasks:
-        print("SKIPPING: No technical tasks to perform.")
-        return {}
+    print(f"Auditing {len(llm_batch)} requirements against annex: {batch[0][1].annexKey}")
 
-    new_findings = []
-    
-    for task_dict in technical_tasks:
-        try:
-            task = SpecialistTask.model_validate(task_dict)
-        except Exception as e:
-            print(f"ERROR: Could not validate task_dict data: {e}")
-            continue
-        
-        print(f"Auditing Technical Requirement: {task.requirementToVerify.name}")
-        
-        context_for_llm = f"""
-        **Requirement to Verify:**
-        {task.requirementToVerify.model_dump_json(indent=2)}
-        ---
-        **Main Proposal Form Text (for context):**
-        {task.mainFormText}
-        ---
-        **Evidence Document Text (Annex):**
-        {task.evidenceText}
-        """
-        messages = [
-            SystemMessage(content=TECHNICAL_ANALYSIS_PROMPT),
-            HumanMessage(content=context_for_llm)
-        ]
+    findings_by_requirement: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    try:
+        batch_result = await llmService.invoke_json(
+            messages=build_annex_batch_messages(llm_batch),
+            output_schema=AnnexFindingsBatch,
+            model_name=model_name,
+            temperature=0.0,
+            tender_id=tender_id,
+            proposal_name=proposal_name,
+            node_name="annex_batch_auditor",
+            priority=PRIORITY_BULK
+        )
+        for agent_source, findings_key in BATCH_FINDING_KEYS.items():
+            for finding in batch_result.get(findings_key, []):
+                finding["agentSource"] = agent_source
+                findings_by_requirement.setdefault((agent_source, finding.get("requirementName")), finding)
+    except BudgetExceededError:
+        for agent_source, task in llm_batch:
+            findings_by_requirement[(agent_source, task.requirementToVerify.name)] = budget_finding(agent_source, task.requirementToVerify)
+    except Exception as e:
+        print(f"ERROR in annex batch for {batch[0][1].annexKey}, falling back to per-requirement calls: {e}")
+
+    for index in pending:
+        agent_source, task = batch[index]
+        findings[index] = findings_by_requirement.get((agent_source, task.requirementToVerify.name))
+    missing = [index for index, finding in enumerate(findings) if finding is None]
+    retried = await asyncio.gather(*(
+        run_specialist_task(batch[index][0], batch[index][1], use_rules=False, **specialist_options)
+        for index in missing
+    ))
+    for index, finding in zip(missing, retried):
+        findings[index] = finding
+    return findings
+
+def not_evaluated_finding(agent_source: str, requirement: Requirement, reason: str, observation: str, recommendation: str) -> Dict[str, Any]:
+    """Finding for a requirement that was deliberately left unverified; it is reported but not scored."""
+    return {
+        "agentSource": agent_source,
+        "severity": "WARNING",
+        "requirementName": requirement.name,
+        "requirementDetails": requirement.details,
+        "isCompliant": None,
+        "notEvaluated": True,
+        "notEvaluatedReason": reason,
+        "observation": observation,
+        "recommendation": recommendation
+    }
 
-        try:
-            finding_result = await llmService.invoke_json(
-                messages=messages,
-                output_schema=TechnicalFinding,
-                model_name="gpt-4o-mini",
-                temperature=0.0
-            )
-            finding_result["agentSource"] = "Technical"
-            new_findings.append(finding_result)
+def timeout_finding(agent_source: str, requirement: Requirement) -> Dict[str, Any]:
+    """Finding for a requirement left unverified because its audit deadline expired."""
+    return not_evaluated_finding(
+        agent_source, requirement, "timeout",
+        "Not evaluated (timeout): the audit deadline expired before this requirement could be verified.",
+        "Verify this requirement manually or re-run the analysis with a longer deadline."
+    )
 
-        except Exception as e:
-            error_finding = {
-                "requirementName": task.requirementToVerify.name,
-                "isCompliant": False,
-                "isConsistent": False,
-                "severity": "CRITICAL",
-                "observation": f"An error occurred during AI analysis: {e}",
-                "recommendation": "Manual review required due to system error.",
-                "agentSource": "Technical"
-            }
-            new_findings.append(error_finding)
+def budget_finding(agent_source: str, requirement: Requirement) -> Dict[str, Any]:
+    """Finding for a requirement left unverified because the analysis used up its LLM budget."""
+    return not_evaluated_finding(
+        agent_source, requirement, "budget",
+        "Not evaluated (budget): the analysis used up its LLM budget before this requirement could be verified.",
+        "Verify this requirement manually or re-run the analysis with a larger LLM budget."
+    )
 
-    print(f"technicalSpecialistNode generated {len(new_findings)} new findings.")
+def error_finding(agent_source: str, requirement: Requirement, error: Exception) -> Dict[str, Any]:
+    """Finding for a requirement left unverified because its proposal could not be audited (e.g. an unreadable document)."""
+    return not_evaluated_finding(
+        agent_source, requirement, "error",
+        f"Not evaluated (error): the proposal could not be audited ({type(error).__name__}: {error}).",
+        "Check the submitted documents and re-run the analysis, or verify this requirement manually."
+    )
 
-    return {"findings": new_findings}
+def skipped_finding(agent_source: str, requirement: Requirement, disqualification: str) -> Dict[str, Any]:
+    """Finding for a requirement skipped because the bidder was already disqualified."""
+    return not_evaluated_finding(
+        agent_source, requirement, "disqualified",
+        f"Not evaluated (skipped): the proposal was already disqualified ({disqualification}).",
+        "Only verify this requirement if the disqualification is overturned."
+    )
 
-async def legalSpecialistNode(state: ProposalAuditState) -> Dict[str, Any]:
+def disqualification_reason(findings: List[Dict[str, Any]]) -> Optional[str]:
     """
-    Acts as the legal specialist.
+    Reason to stop auditing a proposal under the early-termination policy
+    (EARLY_TERMINATION_ON_INVALID_RUC, EARLY_TERMINATION_CRITICAL_FINDINGS), or None.
     """
-    print("EXECUTING NODE: legalSpecialistNode")
-    
-    legal_tasks: List[SpecialistTask] = state.get("legalTasks", [])
-    if not legal_tasks:
-        print("SKIPPING: No legal tasks to perform.")
-        return {}
-
-    new_findings = []
-    
-    for task_dict in legal_tasks:
-        try:
-            task = SpecialistTask.model_validate(task_dict)
-        except Exception as e:
-            print(f"ERROR: Could not validate task_dict data: {e}")
-            continue
-        
-        print(f"Auditing Legal Requirement: {task.requirementToVerify.name}")
-        
-        context_for_llm = f"""
-        **Requirement to Verify:**
-        {task.requirementToVerify.model_dump_json(indent=2)}
-        ---
-        **Main Proposal Form Text (for context):**
-        {task.mainFormText}
-        ---
-        **Evidence Document Text (Annex):**
-        {task.evidenceText}
-        """
-        messages = [
-            SystemMessage(content=LEGAL_ANALYSIS_PROMPT),
-            HumanMessage(content=context_for_llm)
-        ]
-
+    evaluated = [finding for finding in findings if not finding.get("notEvaluated")]
+    if EARLY_TERMINATION_ON_INVALID_RUC and any(
+        finding.get("requirementName") == RUC_REQUIREMENT_NAME and finding.get("severity") == "CRITICAL"
+        for finding in evaluated
+    ):
+        return "invalid RUC"
+    critical = sum(1 for finding in evaluated if finding.get("severity") == "CRITICAL")
+    if EARLY_TERMINATION_CRITICAL_FINDINGS > 0 and critical >= EARLY_TERMINATION_CRITICAL_FINDINGS:
+        return f"{critical} CRITICAL findings"
+    return None
+
+async def run_disqualified_batch(
+    batch: List[Tuple[str, SpecialistTask]],
+    disqualification: str,
+    tender_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Findings for the remaining tasks of a disqualified proposal, without LLM
+    calls: skipped findings, or with EARLY_TERMINATION_ACTION "rules_only"
+    the rule engine's decision where it can reach one.
+    """
+    rules_only = EARLY_TERMINATION_ACTION == "rules_only"
+    if rules_only:
         try:
-            finding_result = await llmService.invoke_json(
-                messages=messages,
-                output_schema=LegalFinding,
-                model_name="gpt-4o-mini",
-                temperature=0.0
-            )
-            finding_result["agentSource"] = "Legal"
-            new_findings.append(finding_result)
-
+            await documentStore.aload([ref for _, task in batch for ref in (task.mainFormRef, task.evidenceRef)])
         except Exception as e:
-            error_finding = {
-                "requirementName": task.requirementToVerify.name,
-                "isCompliant": False,
-                "isConsistent": False,
-                "severity": "CRITICAL",
-                "observation": f"An error occurred during AI analysis: {e}",
-                "recommendation": "Manual review required due to system error.",
-                "agentSource": "Legal"
-            }
-            new_findings.append(error_finding)
-
-    print(f"legalSpecialistNode generated {len(new_findings)} new findings.")
-
-    return {"findings": new_findings}
+            print(f"ERROR loading documents for rule checks: {e}")
+            rules_only = False
+    return [
+        (try_rule_engine(agent_source, task, tender_id) if rules_only else None)
+        or skipped_finding(agent_source, task.requirementToVerify, disqualification)
+        for agent_source, task in batch
+    ]
 
 def compileProposalReportNode(state: ProposalAuditState) -> Dict[str, Any]:
     """
     Final node in the sub-graph. Compiles all findings and calculates the
-    final scores using the OK, WARNING, CRITICAL severity system.
+    final scores using the OK, WARNING, CRITICAL severity system and the
+    configured scoring policy (see scoring.py).
+    Requirements not evaluated (deadline, early termination) are counted but
+    not scored; tasks skipped for a disqualified bidder are listed.
     """
     proposal = state.get("proposal", {})
     companyName = proposal.get("companyName", "Unknown name")
@@ -367,47 +510,24 @@ def compileProposalReportNode(state: ProposalAuditState) -> Dict[str, Any]:
     
     findings = state.get("findings", [])
     
-    findingsSummary = {
-        "total": len(findings),
-        "critical": sum(1 for f in findings if f.get("severity") == "CRITICAL"),
-        "warning": sum(1 for f in findings if f.get("severity") == "WARNING"),
-        "ok": sum(1 for f in findings if f.get("severity") == "OK")
-    }
-    
-    POINTS_DEDUCTION = {
-        "CRITICAL": 15,
-        "WARNING": 5,
-        "OK": 0 
-    }
-    
-    scores = {"legal": 100, "technical": 100, "financial": 100}
-
-    for finding in findings:
-        severity = finding.get("severity")
-        points_to_deduct = POINTS_DEDUCTION.get(severity, 0)
-        
-        source = finding.get("agentSource")
-        if source == "Legal":
-            scores["legal"] -= points_to_deduct
-        elif source == "Technical":
-            scores["technical"] -= points_to_deduct
-        elif source == "Financial":
-            scores["financial"] -= points_to_deduct
-
-    scores["legal"] = max(0, scores["legal"])
-    scores["technical"] = max(0, scores["technical"])
-    scores["financial"] = max(0, scores["financial"])
-    scores["viabilityTotal"] = int((scores["legal"] + scores["technical"] + scores["financial"]) / 3)
+    # Requirements nobody got to verify are counted but do not count against the bidder.
+    score_matrix = ScoreMatrix.from_findings(findings, companyName)
+    findingsSummary = score_matrix.findings_summaries()[0]
+    scores = score_matrix.scores()[0]
+
+    skipped = [f for f in findings if f.get("notEvaluatedReason") == "disqualified"]
 
     final_analysis_for_proposal = {
         "bidderName": companyName,
-        "summaryData": {
-            "totalAmountUSD": 1000000, 
-            "deliveryMonths": 12
-        },
+        "summaryData": state.get("bidSummary") or extract_bid_summary(""),
         "scores": scores,
         "findingsSummary": findingsSummary,
         "findings": findings
     }
+    if skipped:
+        final_analysis_for_proposal["earlyTermination"] = {
+            "reason": disqualification_reason(findings),
+            "skippedTasks": [f"{f.get('agentSource')}: {f.get('requirementName')}" for f in skipped]
+        }
 
     return {"finalAnalysis": final_analysis_for_proposal}
\ No newline at end of file
@@ -5,24 +5,36 @@ class TenderAnalysisState(TypedDict):
     """
     Represents the full state of the tender analysis pipeline.
     """
+    tenderId: Optional[str]
     tenderText: str
+    tenderOutline: Optional[List[Dict[str, Any]]]
+    regenerateChecklist: Optional[bool]
     proposals: List[Dict[str, Any]]
+    evaluationMode: Optional[str]
+    analysisDeadline: Optional[float]
+    analysisProfile: Optional[str]
+    llmBudget: Optional[Dict[str, Any]]
     masterChecklist: Optional[MasterChecklist]
+    checklistConsolidation: Optional[Dict[str, Any]]
     analysisResults: Optional[List[Dict[str, Any]]]
     subgraphInputs: Optional[List[Dict[str, Any]]]
     individualReports: Optional[List[Dict[str, Any]]]
     executiveSummary: Optional[str]
+    budgetComparison: Optional[Dict[str, Any]]
     finalReport: Optional[Dict[str, Any]]
 
 class ProposalAuditState(TypedDict):
     """
     Represents the state for auditing a single proposal.
     """
+    tenderId: Optional[str]
     proposal: Dict[str, Any]
     masterChecklist: MasterChecklist
+    analysisProfile: Optional[str]
     technicalTasks: Optional[List[Dict[str, Any]]]
     financialTasks: Optional[List[Dict[str, Any]]]
     legalTasks: Optional[List[Dict[str, Any]]]
     findings: Annotated[List[Dict[str, Any]], lambda a, b: a + b]
+    bidSummary: Optional[Dict[str, Any]]
     scores: Optional[Dict[str, int]]
     finalAnalysis: Optional[Dict[str, Any]]
\ No newline at end of file
@@ -0,0 +1,100 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from ...core.constants import PAGE_SEPARATOR
+from .retrievalIndex import strip_accents
+
+CHECKLIST_KEYS = ("financialRequirements", "technicalRequirements", "legalRequirements")
+
+# Chapter-style headings that survive clean_pdf_text ("CAPÍTULO III", "SECCIÓN 2").
+_HEADING_RE = re.compile(r"(?:CAP[IÍ]TULO|SECCI[OÓ]N|T[IÍ]TULO)\s+(?:[IVXLC]+|\d+)\b")
+
+
+def normalize_requirement_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", strip_accents(name or "").lower()).strip()
+
+
+def _outline_sections(pages: List[str], outline: List[Dict[str, Any]]) -> List[str]:
+    """Page ranges that start at the top two levels of the PDF outline (get_toc)."""
+    entries = [entry for entry in outline if entry.get("page")]
+    if not entries:
+        return []
+    top_level = min(entry.get("level", 1) for entry in entries)
+    starts = sorted({
+        entry["page"] - 1 for entry in entries
+        if entry.get("level", 1) <= top_level + 1 and 0 < entry["page"] <= len(pages)
+    } | {0})
+    ends = starts[1:] + [len(pages)]
+    return [PAGE_SEPARATOR.join(pages[start:end]) for start, end in zip(starts, ends)]
+
+
+def _heading_sections(text: str) -> List[str]:
+    starts = sorted({0} | {match.start() for match in _HEADING_RE.finditer(text)})
+    ends = starts[1:] + [len(text)]
+    return [text[start:end] for start, end in zip(starts, ends)]
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Splits a section by pages, and a page at whitespace, until each piece fits."""
+    pieces = []
+    for page in section.split(PAGE_SEPARATOR):
+        while len(page) > max_chars:
+            cut = page.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(page[:cut])
+            page = page[cut:]
+        pieces.append(page)
+    return pieces
+
+
+def split_tender_sections(
+    tender_text: str,
+    outline: Optional[List[Dict[str, Any]]] = None,
+    max_chars: int = 60000
+) -> List[str]:
+    """
+    Splits a tender into sections of at most `max_chars` for map-reduce checklist
+    extraction. Boundaries come from the PDF outline when there is one, then from
+    chapter headings, then from pages; small neighbouring sections are packed
+    together so short tenders stay a single section.
+    """
+    if len(tender_text) <= max_chars:
+        return [tender_text]
+
+    pages = tender_text.split(PAGE_SEPARATOR)
+    sections = _outline_sections(pages, outline or [])
+    if len(sections) <= 1:
+        sections = _heading_sections(tender_text)
+    if len(sections) <= 1:
+        sections = pages
+
+    pieces = [piece for section in sections for piece in _split_oversized(section, max_chars) if piece.strip()]
+
+    packed: List[str] = []
+    for piece in pieces:
+        if packed and len(packed[-1]) + len(PAGE_SEPARATOR) + len(piece) <= max_chars:
+            packed[-1] = packed[-1] + PAGE_SEPARATOR + piece
+        else:
+            packed.append(piece)
+    return packed
+
+
+def merge_checklists(checklists: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merges per-section MasterChecklists. Requirements with the same normalized
+    name in the same list are kept once, with any differing details appended.
+    """
+    merged: Dict[str, List[Dict[str, Any]]] = {key: [] for key in CHECKLIST_KEYS}
+    seen: Dict[tuple, Dict[str, Any]] = {}
+
+    for checklist in checklists:
+        for key in CHECKLIST_KEYS:
+            for requirement in checklist.get(key, []):
+                identity = (key, normalize_requirement_name(requirement.get("name", "")))
+                existing = seen.get(identity)
+                if existing is None:
+                    seen[identity] = dict(requirement)
+                    merged[key].append(seen[identity])
+                elif requirement.get("details") and requirement["details"] not in existing.get("details", ""):
+                    existing["details"] = f"{existing.get('details', '')}; {requirement['details']}".strip("; ")
+    return merged
@@ -1,7 +1,7 @@
 # main.py
 import json
-from typing import List, Dict, Any
-from fastapi import FastAPI, UploadFile, File, HTTPException, status, Body
+from typing import List, Dict, Any, Optional
+from fastapi import FastAPI, UploadFile, File, HTTPException, status, Body, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 import traceback
@@ -52,6 +52,12 @@ app.add_middleware(
 def health_check() -> Dict[str, str]:
     return {"status": "healthy"}
 
+@app.get("/llm/endpoints", summary="LLM Endpoint Health", tags=["System"])
+def llm_endpoints_health() -> Dict[str, Any]:
+    """Load and health of every configured LLM endpoint (keys are never returned)."""
+    from app.agents.services import llmService
+    return {"endpoints": llmService.get_endpoint_health(), "scheduler": llmService.get_scheduler_stats()}
+
 # --- Tender Endpoints ---
 
 @app.post("/tenders/upload", response_model=schemas.TenderUploadResponse, tags=["Tenders"])
@@ -225,14 +231,34 @@ async def get_summary():
     return services.get_executive_summary_if_completed()
 
 @app.post("/tenders/{tender_id}/analyze", status_code=status.HTTP_202_ACCEPTED, tags=["Processing"])
-async def trigger_tender_analysis(tender_id: str):
+async def trigger_tender_analysis(
+    tender_id: str,
+    regenerate_checklist: bool = False,
+    profile: Optional[str] = None,
+    max_llm_calls: Optional[int] = None,
+    max_llm_tokens: Optional[int] = None,
+    max_llm_wall_sec: Optional[float] = None
+):
     """
     Triggers the full AI agent analysis for a given tender.
     The process runs in the background. The frontend will be notified
     via SSE when the analysis is complete.
+    The cached master checklist is reused unless `regenerate_checklist` is set.
+    `profile` picks the depth of the analysis: "triage" (quick screening),
+    "standard" or "forensic" (final award review); DEFAULT_ANALYSIS_PROFILE if omitted.
+    `max_llm_calls`, `max_llm_tokens` and `max_llm_wall_sec` cap the LLM use of this
+    analysis (ANALYSIS_MAX_LLM_* if omitted, 0 = unlimited); near the cap it degrades
+    to cheaper strategies, past it the remaining requirements are reported as not evaluated.
     """
     try:
-        response = await services.start_tender_analysis(tender_id)
+        response = await services.start_tender_analysis(
+            tender_id,
+            regenerate_checklist=regenerate_checklist,
+            profile=profile,
+            max_llm_calls=max_llm_calls,
+            max_llm_tokens=max_llm_tokens,
+            max_llm_wall_sec=max_llm_wall_sec
+        )
         
         if "error" in response:
             raise HTTPException(status_code=400, detail=response["error"])
@@ -296,6 +322,109 @@ async def get_analysis_status(tender_id: str):
         raise HTTPException(status_code=500, detail=f"Error retrieving analysis status: {e}")
 
 
+@app.get("/tenders/{tender_id}/analysis/llm-usage", tags=["Analysis"])
+async def get_analysis_llm_usage(tender_id: str):
+    """
+    Gets the LLM cost and latency breakdown of a tender's analysis.
+    
+    Returns:
+        Totals plus per-node, per-proposal and per-schema call, token, latency and cost figures
+    """
+    try:
+        usage_report = services.get_llm_usage_report(tender_id)
+        if usage_report is None:
+            raise HTTPException(status_code=404, detail=f"No LLM usage recorded for tender {tender_id}.")
+        return usage_report
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Error retrieving LLM usage: {e}")
+
+
+@app.get("/tenders/{tender_id}/master-checklist", tags=["Analysis"])
+async def get_tender_master_checklist(tender_id: str):
+    """
+    Gets the cached master checklist of a tender.
+    
+    Returns:
+        The MasterChecklist plus its cache key, prompt version and creation time
+    """
+    try:
+        checklist_entry = services.get_master_checklist(tender_id)
+        if checklist_entry is None:
+            raise HTTPException(status_code=404, detail=f"No master checklist cached for tender {tender_id}.")
+        return checklist_entry
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Error retrieving master checklist: {e}")
+
+
+@app.post("/tenders/{tender_id}/master-checklist/regenerate", tags=["Analysis"])
+async def regenerate_tender_master_checklist(tender_id: str):
+    """
+    Forces a new extraction of the tender's master checklist and replaces the cached one.
+    
+    Returns:
+        The new cached checklist entry
+    """
+    try:
+        response = await services.regenerate_master_checklist(tender_id)
+        if "error" in response:
+            raise HTTPException(status_code=400, detail=response["error"])
+        return response
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Error regenerating master checklist: {e}")
+
+
+@app.post("/tenders/{tender_id}/rescore", tags=["Analysis"])
+async def rescore_tender_analysis(tender_id: str, request: Optional[analysis_schemas.RescoreRequest] = None):
+    """
+    Recomputes the scores and ranking of an analyzed tender under other
+    deduction tables and area weights, without re-running the analysis
+    (no LLM calls).
+    
+    Returns:
+        The applied policy, the new scores of each proposal and the ranking
+    """
+    try:
+        response = services.rescore_tender(tender_id, request.model_dump() if request else None)
+        if response is None:
+            raise HTTPException(status_code=404, detail=f"No analysis results found for tender {tender_id}.")
+        if "error" in response:
+            raise HTTPException(status_code=400, detail=response["error"])
+        return response
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Error rescoring tender: {e}")
+
+
+@app.get("/tenders/{tender_id}/partial-results", tags=["Analysis"])
+async def get_tender_partial_results(tender_id: str, since: int = Query(0, ge=0)):
+    """
+    Gets the proposal reports and findings an analysis has produced so far,
+    in the order they completed.
+    
+    Args:
+        since: Number of results already received (the previous response's nextSince)
+    
+    Returns:
+        New proposal reports and findings, plus the nextSince to poll with
+    """
+    try:
+        partial_results = services.get_partial_results(tender_id, since)
+        if partial_results is None:
+            raise HTTPException(status_code=404, detail=f"No partial results for tender {tender_id}.")
+        return partial_results
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Error retrieving partial results: {e}")
+
+
 @app.get("/analysis/current-status", tags=["Analysis"])
 async def get_current_status():
     """
@@ -11,7 +11,8 @@ from .analysis_schemas import (
     AnalysisStatus,
     AnalysisProgressEvent,
     AnalysisHistoryItem,
-    AnalysisHistoryResponse
+    AnalysisHistoryResponse,
+    RescoreRequest
 )
 
 __all__ = [
@@ -27,6 +28,7 @@ __all__ = [
     "AnalysisProgressEvent", 
     "AnalysisHistoryItem",
     "AnalysisHistoryResponse",
+    "RescoreRequest",
     # Module references
     "analysis_schemas",
     "base_schemas"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Dict, Optional, Literal
 from datetime import datetime
 
 
@@ -64,3 +64,19 @@ class AnalysisHistoryResponse(BaseModel):
     """Schema for analysis history list response"""
     total: int = Field(description="Total number of analyses")
     analyses: list[AnalysisHistoryItem] = Field(description="List of analysis history items")
+
+
+class RescoreRequest(BaseModel):
+    """Scoring policy overrides for /tenders/{id}/rescore; fields left out keep the configured values"""
+    deductions: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Points deducted per finding by severity (CRITICAL, WARNING, OK)"
+    )
+    areaDeductions: Optional[Dict[str, Dict[str, float]]] = Field(
+        default=None,
+        description="Per-area (legal, technical, financial) overrides of the deductions"
+    )
+    areaWeights: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Weight of each area in viabilityTotal"
+    )
@@ -51,6 +51,7 @@ class TenderJsonData(BaseModel):
     """Schema for complete tender JSON data"""
     tenderName: str
     tenderText: str
+    tenderOutline: Optional[List[Dict[str, Any]]] = None
     proposals: List[ProposalData]
 
 class TenderJsonResponse(BaseModel):
@@ -23,10 +23,15 @@ from .sse_service import (
     save_sse_data,
     stream_sse_data,
     get_executive_summary_if_completed,
+    get_partial_results,
 )
 
 from .analysis_service import (
     start_tender_analysis,
+    get_llm_usage_report,
+    get_master_checklist,
+    regenerate_master_checklist,
+    rescore_tender,
 )
 
 
@@ -46,7 +51,12 @@ __all__ = [
     "save_sse_data",
     "stream_sse_data",
     "get_executive_summary_if_completed",
+    "get_partial_results",
 
     # AI Analysis Orchestration Service
     "start_tender_analysis",
+    "get_llm_usage_report",
+    "get_master_checklist",
+    "regenerate_master_checklist",
+    "rescore_tender",
 ]
\ No newline at end of file
@@ -1,16 +1,61 @@
 # services/analysis_service.py
 
 import asyncio
+import json
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 
 # Importamos el agente y las funciones de los otros servicios
 # Asegúrate de que la ruta de importación a tu carpeta 'agents' sea correcta
 # desde la perspectiva de la carpeta 'services'.
 from app.agents.tenderAnalyzer.mainGraph import agentGraph  
+from app.agents.tenderAnalyzer.pipelineNodes import generate_master_checklist
+from app.agents.tenderAnalyzer import checklistCache
+from app.agents.tenderAnalyzer.proposalIntake import cancel_proposal_intake
+from app.agents.tenderAnalyzer.analysisProfiles import get_analysis_profile
+from app.agents.tenderAnalyzer.scoring import ScoreMatrix, ScoringPolicy, load_score_matrix, save_score_matrix
+from app.agents.services import llmService
+from app.agents.services.llmBudget import LLMBudget
+from app.agents.services.documentStore import documentStore, tender_namespace
+
+from app.core import constants
 
 from . import tender_service, sse_service
 
+LLM_USAGE_FILENAME = "llm_usage.json"
+
+def _llm_usage_path(tender_id: str):
+    return constants.TENDERS_DIR / f"tender_{tender_id}" / LLM_USAGE_FILENAME
+
+def save_llm_usage_report(tender_id: str) -> None:
+    """
+    Persists the tender's LLM cost/latency breakdown next to its tender PDF.
+    Nothing is written if the run made no LLM call or the tender does not exist.
+    """
+    usage_path = _llm_usage_path(tender_id)
+    if not llmService.telemetry.has_records(tender_id) or not usage_path.parent.is_dir():
+        return
+    try:
+        with open(usage_path, "w", encoding="utf-8") as f:
+            json.dump(llmService.get_usage_breakdown(tender_id), f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"Warning: Could not save LLM usage report for tender {tender_id}: {e}")
+
+def get_llm_usage_report(tender_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the LLM cost/latency breakdown for a tender: the live figures while
+    an analysis is running in this process, otherwise the last persisted report.
+    """
+    if llmService.telemetry.has_records(tender_id):
+        return llmService.get_usage_breakdown(tender_id)
+
+    usage_path = _llm_usage_path(tender_id)
+    if not usage_path.is_file():
+        return None
+    with open(usage_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 async def run_analysis_and_notify(tender_id: str, input_data: Dict[str, Any]):
     """
     This is the core background task. It runs the full agent graph and,
@@ -20,6 +65,8 @@ async def run_analysis_and_notify(tender_id: str, input_data: Dict[str, Any]):
     
     # Set tender_id in environment for SSE progress tracking in pipeline nodes
     os.environ["CURRENT_TENDER_ID"] = tender_id
+    llmService.reset_usage(tender_id)
+    sse_service.reset_partial_results(tender_id)
     
     try:
         # Emit initial progress event
@@ -39,6 +86,8 @@ async def run_analysis_and_notify(tender_id: str, input_data: Dict[str, Any]):
 
         if report_json:
             print(f"--- 🤖 AGENT: Analysis for tender {tender_id} completed successfully. ---")
+            # La matriz de hallazgos permite recalcular puntajes sin repetir el análisis.
+            save_score_matrix(tender_id, report_json.get("proposalsAnalysis", []))
             
             # Emit completion event
             sse_service.emit_progress_event(
@@ -91,26 +140,115 @@ async def run_analysis_and_notify(tender_id: str, input_data: Dict[str, Any]):
         )
         sse_service.save_sse_data(error_payload)
 
+    finally:
+        cancel_proposal_intake(tender_id)
+        sse_service.finish_partial_results(tender_id)
+        # Once persisted, the per-call records are dropped; get_llm_usage_report reads the file.
+        save_llm_usage_report(tender_id)
+        llmService.budget.clear(tender_id)
+        llmService.reset_usage(tender_id)
+        documentStore.release(tender_namespace(tender_id))
+
+
+def get_master_checklist(tender_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached master checklist of a tender with its cache metadata,
+    flagging whether it was built with the current extraction prompt.
+    """
+    entry = checklistCache.load_checklist_entry(tender_id)
+    if entry is None:
+        return None
+    return {**entry, "isCurrentPromptVersion": entry.get("promptVersion") == checklistCache.MASTER_CHECKLIST_PROMPT_VERSION}
+
+async def regenerate_master_checklist(tender_id: str) -> Dict[str, Any]:
+    """
+    Extracts the master checklist again from the tender PDF and replaces the
+    cached one. If any tender section fails, the cached checklist is kept.
+    """
+    document = await tender_service.extract_tender_document(tender_id)
+    tender_text = document.get("tenderText", "")
+    if not tender_text.strip() or tender_text.startswith(("TENDER_FILE_NOT_FOUND", "TENDER_PROCESSING_ERROR")):
+        return {"error": f"Could not regenerate checklist. Tender text for ID {tender_id} is missing or unreadable."}
+
+    checklist, failed_sections = await generate_master_checklist(tender_id, tender_text, document.get("tenderOutline"))
+    if failed_sections:
+        return {"error": f"Could not regenerate checklist. Extraction failed for tender sections {', '.join(map(str, failed_sections))}; the cached checklist was kept."}
+    checklistCache.save_cached_checklist(tender_id, checklistCache.checklist_cache_key(tender_text), checklist)
+    return get_master_checklist(tender_id)
+
+def rescore_tender(tender_id: str, policy_overrides: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Recomputes the scores and ranking of an analyzed tender under another
+    scoring policy (deduction tables and area weights), from its persisted
+    findings matrix and without any LLM call. Falls back to the last report
+    in the SSE data if it belongs to this tender. None if it was never analyzed.
+    """
+    try:
+        policy = ScoringPolicy(**{key: value for key, value in (policy_overrides or {}).items() if value is not None})
+    except ValueError as e:
+        return {"error": str(e)}
+
+    started_at = time.perf_counter()
+    matrix = load_score_matrix(tender_id)
+    if matrix is None:
+        report = sse_service.get_current_analysis_report(tender_id)
+        if not report or not report.get("proposalsAnalysis"):
+            return None
+        matrix = save_score_matrix(tender_id, report["proposalsAnalysis"]) or ScoreMatrix.from_analyses(report["proposalsAnalysis"])
+
+    scores = matrix.scores(policy)
+    result = {
+        "tenderId": tender_id,
+        "policy": policy.resolved(),
+        "proposals": [{"bidderName": bidder, "scores": score} for bidder, score in zip(matrix.bidders, scores)],
+        "ranking": matrix.ranking(policy),
+        "requirements": len(matrix.requirements),
+    }
+    result["elapsedMs"] = round((time.perf_counter() - started_at) * 1000, 2)
+    return result
 
-async def start_tender_analysis(tender_id: str):
+async def start_tender_analysis(
+    tender_id: str,
+    regenerate_checklist: bool = False,
+    profile: Optional[str] = None,
+    max_llm_calls: Optional[int] = None,
+    max_llm_tokens: Optional[int] = None,
+    max_llm_wall_sec: Optional[float] = None
+):
     """
     This is the main orchestrator function called by the API endpoint.
     It fetches data, starts the analysis in the background, and returns immediately.
+    With `regenerate_checklist`, the cached master checklist is ignored and rebuilt.
+    `profile` selects the analysis depth (triage, standard, forensic; see analysisProfiles).
+    The `max_llm_*` arguments override the configured LLM budget of this analysis (0 = unlimited).
     """
     print(f"--- Orchestrator: Kicking off analysis for tender_id: {tender_id} ---")
+
+    try:
+        analysis_profile = get_analysis_profile(profile)
+        llm_budget = LLMBudget.from_config(maxCalls=max_llm_calls, maxTokens=max_llm_tokens, maxWallTimeSec=max_llm_wall_sec)
+    except ValueError as e:
+        return {"error": str(e)}
     
-    # 1. Obtener los datos necesarios usando el servicio que ya teníamos
+    # 1. Obtener los datos necesarios. Las propuestas solo llevan referencias al
+    #    documentStore: sus PDFs se extraen cuando el análisis los lee.
     try:
-        json_data = await tender_service.generate_full_tender_json(tender_id)
+        json_data = await tender_service.extract_tender_document(tender_id)
         if not json_data.get("tenderText") or json_data.get("tenderText").strip() == "":
             return {"error": f"Could not start analysis. Tender text for ID {tender_id} is missing or empty."}
+        proposals = await asyncio.to_thread(tender_service.collect_proposal_documents, tender_id)
     except Exception as e:
         return {"error": f"Failed to fetch data for analysis: {e}"}
 
     # 2. Preparar el diccionario de entrada para el agente
     agent_input = {
+        "tenderId": tender_id,
         "tenderText": json_data["tenderText"],
-        "proposals": json_data["proposals"]
+        "tenderOutline": json_data.get("tenderOutline"),
+        "regenerateChecklist": regenerate_checklist,
+        "analysisProfile": analysis_profile.name,
+        "llmBudget": llm_budget.model_dump(),
+        "proposals": proposals
     }
     
     # 3. Lanzar la tarea de análisis en segundo plano
@@ -130,7 +268,11 @@ async def start_tender_analysis(tender_id: str):
     sse_service.save_sse_data(initial_payload)
     
     # 5. Retornar una respuesta inmediata al usuario
-    return {"message": "Analysis process started successfully. You will be notified via SSE upon completion."}
+    return {
+        "message": "Analysis process started successfully. You will be notified via SSE upon completion.",
+        "analysisProfile": analysis_profile.name,
+        "llmBudget": llm_budget.model_dump()
+    }
     
     
     
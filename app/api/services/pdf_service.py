@@ -1,25 +1,37 @@
 # services/pdf_service.py
 import os
+from typing import Any, Dict, List
+
 import fitz  # PyMuPDF
 
+from app.core.constants import PAGE_SEPARATOR
+
 def llm_text_detection(pdf_path: str) -> str:
     """Placeholder for future OCR or LLM-based text detection."""
     filename = os.path.basename(pdf_path)
     return f"[PDF with no extractable text detected: {filename}. OCR pending implementation]"
 
 def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extracts all text from a PDF file using PyMuPDF."""
+    """Extracts all text from a PDF file using PyMuPDF, one PAGE_SEPARATOR between pages."""
     text = ""
     try:
         with fitz.open(pdf_path) as doc:
-            for page in doc:
-                text += page.get_text()
+            text = PAGE_SEPARATOR.join(page.get_text() for page in doc)
     except Exception as e:
         # It's better to raise the exception to be handled by the calling service
         raise Exception(f"Error processing PDF {pdf_path}: {e}")
     
     return text if text.strip() else llm_text_detection(pdf_path)
 
+def extract_outline_from_pdf(pdf_path: str) -> List[Dict[str, Any]]:
+    """Returns the PDF outline (bookmarks) as [{"level", "title", "page"}], empty if it has none."""
+    try:
+        with fitz.open(pdf_path) as doc:
+            return [{"level": level, "title": title, "page": page} for level, title, page in doc.get_toc(simple=True)]
+    except Exception as e:
+        print(f"Could not read outline of {pdf_path}: {e}")
+        return []
+
 def extract_last_page_from_pdf(pdf_path: str) -> str:
     """Extracts text from only the last page of a PDF file."""
     text = ""
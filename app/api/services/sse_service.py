@@ -2,7 +2,7 @@ import json
 import time
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, List, Optional
 from fastapi import HTTPException
 
 from app.core import constants
@@ -29,7 +29,9 @@ def emit_progress_event(
     event_type: str,
     progress: int,
     message: str,
-    node_name: str = None
+    node_name: str = None,
+    eta_seconds: Optional[float] = None,
+    llm_budget: Optional[Dict[str, Any]] = None
 ) -> None:
     """
     Emits a progress event to the SSE stream.
@@ -40,6 +42,8 @@ def emit_progress_event(
         progress: Progress percentage (0-100)
         message: Human-readable message
         node_name: Optional name of the graph node
+        eta_seconds: Optional estimate of the time left in the current stage
+        llm_budget: Optional LLM budget consumption of the analysis
     """
     event_data = {
         "event_type": event_type,
@@ -67,6 +71,8 @@ def emit_progress_event(
             "tenderId": tender_id,
             "currentProgress": progress,
             "currentStep": message,
+            "etaSeconds": eta_seconds,
+            "llmBudget": llm_budget,
             "lastUpdate": event_data["timestamp"]
         })
         
@@ -77,6 +83,141 @@ def emit_progress_event(
         print(f"Error emitting progress event: {e}")
 
 
+PARTIAL_RESULTS_FILENAME = "partial_results.jsonl"
+# Latest findings kept in the SSE state; the full stream is in the tender's partial results file.
+RECENT_FINDINGS_LIMIT = 20
+# Minimum time between two rewrites of the SSE state for streamed findings (the SSE stream polls every 2 s).
+PARTIAL_RESULTS_FLUSH_INTERVAL_SEC = 2.0
+
+# Partial results summary of each running analysis, written to the SSE state at most every flush interval.
+_partial_summaries: Dict[str, Dict[str, Any]] = {}
+_partial_flushed_at: Dict[str, float] = {}
+# Byte offset of each line already read from a tender's partial results file, plus the end of the last one.
+_partial_offsets: Dict[str, List[int]] = {}
+
+
+def _partial_results_path(tender_id: str):
+    return constants.TENDERS_DIR / f"tender_{tender_id}" / PARTIAL_RESULTS_FILENAME
+
+
+def finish_partial_results(tender_id: str) -> None:
+    """Drops the in-memory summary of a finished analysis; its results stay in the file."""
+    _partial_summaries.pop(tender_id, None)
+    _partial_flushed_at.pop(tender_id, None)
+
+
+def reset_partial_results(tender_id: str) -> None:
+    """Clears the partial results of a previous analysis run of the tender."""
+    finish_partial_results(tender_id)
+    _partial_offsets.pop(tender_id, None)
+    try:
+        _partial_results_path(tender_id).unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Warning: Could not reset partial results for tender {tender_id}: {e}")
+
+
+def emit_partial_result(tender_id: str, result_type: str, payload: Dict[str, Any]) -> None:
+    """
+    Publishes a partial result of a running analysis as soon as it is available.
+
+    Args:
+        tender_id: ID of the tender being analyzed
+        result_type: 'findings' (new findings of one proposal) or 'proposalReport'
+            (the finished analysis of one proposal)
+        payload: {"bidderName", "findings"} or {"bidderName", "finalAnalysis"}
+
+    Every result is appended to the tender's partial results file (see
+    get_partial_results); the SSE state gets a compact summary of it. The
+    summary is kept in memory and written at most every
+    PARTIAL_RESULTS_FLUSH_INTERVAL_SEC for findings, and always for a
+    finished proposal report, so the audit does not rewrite the SSE file once
+    per LLM result.
+    """
+    timestamp = datetime.now().isoformat()
+    results_path = _partial_results_path(tender_id)
+    try:
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(results_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": result_type, "timestamp": timestamp, **payload}, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Warning: Could not persist partial result for tender {tender_id}: {e}")
+
+    partial = _partial_summaries.setdefault(tender_id, {"completedProposals": [], "findingsStreamed": 0, "recentFindings": []})
+    bidder_name = payload.get("bidderName")
+    if result_type == "findings":
+        findings = payload.get("findings", [])
+        partial["findingsStreamed"] += len(findings)
+        partial["recentFindings"] = (partial["recentFindings"] + [
+            {
+                "bidderName": bidder_name,
+                "agentSource": finding.get("agentSource"),
+                "requirementName": finding.get("requirementName"),
+                "severity": finding.get("severity")
+            }
+            for finding in findings
+        ])[-RECENT_FINDINGS_LIMIT:]
+    elif result_type == "proposalReport":
+        analysis = payload.get("finalAnalysis") or {}
+        partial["completedProposals"].append({
+            "bidderName": bidder_name,
+            "scores": analysis.get("scores"),
+            "findingsSummary": analysis.get("findingsSummary")
+        })
+
+    now = time.monotonic()
+    if result_type == "findings" and now - _partial_flushed_at.get(tender_id, float("-inf")) < PARTIAL_RESULTS_FLUSH_INTERVAL_SEC:
+        return
+    _partial_flushed_at[tender_id] = now
+
+    try:
+        existing_data = {}
+        if constants.SSE_DATA_FILE.exists():
+            with open(constants.SSE_DATA_FILE, "r", encoding="utf-8") as f:
+                existing_data = json.load(f)
+        existing_data.update({"tenderId": tender_id, "partialResults": partial, "lastUpdate": timestamp})
+        save_sse_data(existing_data)
+    except Exception as e:
+        print(f"Error emitting partial result: {e}")
+
+
+def get_partial_results(tender_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    Returns the partial results persisted for a tender, starting at result
+    number `since`, so clients can poll for what is new. None if there are none.
+    Line offsets are remembered between polls, so each poll only scans the
+    lines appended since the previous one and parses the ones it returns.
+    """
+    results_path = _partial_results_path(tender_id)
+    if not results_path.is_file():
+        return None
+
+    offsets = _partial_offsets.setdefault(tender_id, [0])
+    with open(results_path, "rb") as f:
+        if f.seek(0, 2) < offsets[-1]:
+            # The file was replaced by a shorter one (a new run): index it again.
+            offsets[:] = [0]
+        f.seek(offsets[-1])
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # still being written
+            offsets.append(offsets[-1] + len(line))
+        start = offsets[min(since, len(offsets) - 1)]
+        f.seek(start)
+        data = f.read(offsets[-1] - start)
+
+    new_results: List[Dict[str, Any]] = [json.loads(line) for line in data.decode("utf-8").splitlines() if line.strip()]
+    return {
+        "tenderId": tender_id,
+        "proposalReports": [r["finalAnalysis"] for r in new_results if r.get("type") == "proposalReport"],
+        "findings": [
+            {"bidderName": r.get("bidderName"), **finding}
+            for r in new_results if r.get("type") == "findings"
+            for finding in r.get("findings", [])
+        ],
+        "nextSince": len(offsets) - 1
+    }
+
+
 async def stream_sse_data() -> AsyncGenerator[str, None]:
     """Streams data from the JSON file as Server-Sent Events."""
     last_state = {}
@@ -122,6 +263,19 @@ def get_executive_summary_if_completed() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error reading analysis data: {e}")
 
 
+def get_current_analysis_report(tender_id: str) -> Optional[Dict[str, Any]]:
+    """Returns the completed report in the SSE data file if it belongs to `tender_id`, else None."""
+    if not constants.SSE_DATA_FILE.exists():
+        return None
+    try:
+        with open(constants.SSE_DATA_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("tenderId") != tender_id or data.get("state") != "Completado":
+        return None
+    return data
+
 def get_current_analysis_status(tender_id: str = None) -> Dict[str, Any]:
     """
     Gets the current analysis status from the SSE data file.
@@ -5,10 +5,15 @@ import uuid
 import re
 import asyncio
 import concurrent.futures
+from functools import partial
 from typing import List, Dict, Any
 from fastapi import UploadFile, HTTPException
 
 from app.core import constants
+from app.agents.services.documentStore import (
+    documentStore, document_handle, proposal_namespace, MAIN_FORM_DOCUMENT, ANNEX_INDEX_DOCUMENT
+)
+from app.agents.services.sriClient import sriClient
 from . import pdf_service, file_service
 
 async def upload_new_tender(file: UploadFile) -> Dict[str, Any]:
@@ -43,7 +48,10 @@ async def upload_proposal(
     tender_id: str, contractor_id: str, company_name: str, ruc: str,
     principal_file: UploadFile, attachment_files: List[UploadFile]
 ) -> Dict[str, Any]:
-    """Creates directory structure and saves all proposal files with RUC metadata."""
+    """
+    Creates directory structure and saves all proposal files with RUC metadata.
+    The RUC is validated against the SRI in the background, so the analysis finds it cached.
+    """
     company_name_clean = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip()
     company_name_clean = company_name_clean or "UNKNOWN_COMPANY"
     
@@ -68,6 +76,7 @@ async def upload_proposal(
     }
     with open(proposal_dir / "metadata.json", "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2)
+    sriClient.prefetch([ruc])
     
     return {
         "message": "Files received and classified correctly.",
@@ -80,7 +89,10 @@ def clean_pdf_text(text: str) -> str:
     """
     Cleans extracted PDF text for better LLM readability.
     Removes excessive line breaks, multiple spaces, and artifacts.
+    Pages are cleaned one by one so their PAGE_SEPARATOR boundaries survive.
     """
+    if constants.PAGE_SEPARATOR in text:
+        return constants.PAGE_SEPARATOR.join(clean_pdf_text(page) for page in text.split(constants.PAGE_SEPARATOR))
     text = re.sub(r'-\n', '', text)
     text = re.sub(r'\n\s*\n', '\n\n', text)
     text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
@@ -118,9 +130,9 @@ def get_contractors_for_batch(tender_ids: List[str]) -> Dict[str, Any]:
     """Gets contractors for a batch of tender IDs."""
     return {tender_id: get_tender_contractors(tender_id) for tender_id in tender_ids}
 
-def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
-    """Synchronous core function to generate tender JSON with cleaned text."""
-    result = {"tenderName": f"TENDER_{tender_id}", "tenderText": "", "proposals": []}
+def _extract_tender_document_sync(tender_id: str) -> Dict[str, Any]:
+    """Extracts the cleaned text and outline of a tender PDF (no proposals)."""
+    result = {"tenderName": f"TENDER_{tender_id}", "tenderText": "", "tenderOutline": []}
 
     tender_dir = constants.TENDERS_DIR / f"tender_{tender_id}"
     try:
@@ -129,6 +141,7 @@ def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
         
         raw_text = pdf_service.extract_text_from_pdf(str(tender_pdf_path))
         result["tenderText"] = clean_pdf_text(raw_text)
+        result["tenderOutline"] = pdf_service.extract_outline_from_pdf(str(tender_pdf_path))
         result["tenderName"] = tender_pdf_path.stem
     except FileNotFoundError as e:
         print(f"TENDER PARSING ERROR: {e}")
@@ -136,19 +149,27 @@ def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
     except Exception as e:
         print(f"TENDER PARSING ERROR: {e}")
         result["tenderText"] = f"TENDER_PROCESSING_ERROR: {e}"
+    return result
 
+async def extract_tender_document(tender_id: str) -> Dict[str, Any]:
+    """Async wrapper returning the tender's cleaned text and outline."""
+    return await asyncio.to_thread(_extract_tender_document_sync, tender_id)
+
+def _iter_proposal_dirs(tender_id: str):
+    """
+    Yields (proposal_data, principal_pdf, {annex key: annex_pdf}) for every submitted
+    proposal of a tender, without extracting any text. `proposal_data` holds the
+    contractor, company and RUC metadata.
+    """
     proposals_dir = constants.PROPOSALS_DIR / f"tender_{tender_id}"
     if not proposals_dir.exists():
-        return result
+        return
 
     for contractor_dir in proposals_dir.glob("contractor_*"):
         contractor_id = contractor_dir.name.replace("contractor_", "")
         for company_dir in contractor_dir.iterdir():
             if company_dir.is_dir():
-                proposal_data = {
-                    "contractorId": contractor_id, "companyName": company_dir.name,
-                    "mainFormText": "", "annexIndexText": "", "attachments": {}, "ruc": None
-                }
+                proposal_data = {"contractorId": contractor_id, "companyName": company_dir.name, "ruc": None}
                 
                 metadata_file = company_dir / "metadata.json"
                 if metadata_file.exists():
@@ -160,12 +181,9 @@ def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
                     except Exception as e:
                         print(f"Error reading metadata: {e}")
                 
-                try:
-                    p_file = next(company_dir.glob(f"{constants.PREFIX_PRINCIPAL}_*.pdf"))
-                    proposal_data["mainFormText"] = clean_pdf_text(pdf_service.extract_text_from_pdf(str(p_file)))
-                    proposal_data["annexIndexText"] = pdf_service.extract_last_page_from_pdf(str(p_file))
-                except StopIteration: pass
+                p_file = next(company_dir.glob(f"{constants.PREFIX_PRINCIPAL}_*.pdf"), None)
                 
+                annex_files = {}
                 for a_file in company_dir.glob(f"{constants.PREFIX_ATTACHMENTS}_*.pdf"):
                     filename_parts = a_file.stem.split("_")
                     if len(filename_parts) >= 3:
@@ -173,13 +191,56 @@ def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
                         annex_key = "_".join(original_name_parts) + ".pdf"
                     else:
                         annex_key = a_file.name
-                    
-                    proposal_data["attachments"][annex_key] = clean_pdf_text(pdf_service.extract_text_from_pdf(str(a_file)))
+                    annex_files[annex_key] = a_file
                 
-                result["proposals"].append(proposal_data)
+                yield proposal_data, p_file, annex_files
+
+def _extract_clean_text(pdf_path) -> str:
+    return clean_pdf_text(pdf_service.extract_text_from_pdf(str(pdf_path)))
+
+def _generate_tender_json_data_sync(tender_id: str) -> Dict[str, Any]:
+    """Synchronous core function to generate tender JSON with cleaned text."""
+    result = {**_extract_tender_document_sync(tender_id), "proposals": []}
+
+    for proposal_data, p_file, annex_files in _iter_proposal_dirs(tender_id):
+        proposal_data.update({"mainFormText": "", "annexIndexText": "", "attachments": {}})
+        if p_file is not None:
+            proposal_data["mainFormText"] = _extract_clean_text(p_file)
+            proposal_data["annexIndexText"] = pdf_service.extract_last_page_from_pdf(str(p_file))
+        for annex_key, a_file in annex_files.items():
+            proposal_data["attachments"][annex_key] = _extract_clean_text(a_file)
+        result["proposals"].append(proposal_data)
                 
     return result
 
+def collect_proposal_documents(tender_id: str) -> List[Dict[str, Any]]:
+    """
+    Lists a tender's proposals with documentStore handles instead of texts.
+    Each PDF is registered with a loader and only extracted when the analysis
+    first reads it, so the agent input stays small however many proposals there are.
+    """
+    proposals = []
+    for proposal_data, p_file, annex_files in _iter_proposal_dirs(tender_id):
+        namespace = proposal_namespace(tender_id, proposal_data)
+        main_form_handle = document_handle(namespace, MAIN_FORM_DOCUMENT)
+        annex_index_handle = document_handle(namespace, ANNEX_INDEX_DOCUMENT)
+        if p_file is not None:
+            documentStore.register(main_form_handle, partial(_extract_clean_text, p_file))
+            documentStore.register(annex_index_handle, partial(pdf_service.extract_last_page_from_pdf, str(p_file)))
+        else:
+            documentStore.put(main_form_handle, "")
+            documentStore.put(annex_index_handle, "")
+        proposal_data.update({
+            "mainFormRef": main_form_handle,
+            "annexIndexRef": annex_index_handle,
+            "attachmentRefs": {
+                annex_key: documentStore.register(document_handle(namespace, annex_key), partial(_extract_clean_text, a_file))
+                for annex_key, a_file in annex_files.items()
+            }
+        })
+        proposals.append(proposal_data)
+    return proposals
+
 async def generate_full_tender_json(tender_id: str) -> Dict[str, Any]:
     """Async wrapper to generate tender JSON data in a thread pool."""
     loop = asyncio.get_event_loop()
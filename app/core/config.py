@@ -5,8 +5,82 @@ load_dotenv()
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Optional OpenAI-compatible endpoint, e.g. the local stand-in (app/agents/services/llmStandIn.py)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
 CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "checkpoints/chat_memory.db")
 
+# LLM Call Configuration
+# Maximum number of LLM requests in flight at once on the default endpoint.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+# Optional pool of endpoints/keys/deployments as a JSON list, e.g.
+# [{"name": "acct-a", "apiKey": "sk-...", "weight": 2, "maxConcurrency": 16},
+#  {"name": "azure-east", "baseUrl": "https://.../openai/v1", "apiKey": "...", "modelMap": {"gpt-4o-mini": "my-deployment"}}]
+# Without it, OPENAI_API_KEY / OPENAI_BASE_URL form a single endpoint limited to LLM_MAX_CONCURRENCY.
+LLM_ENDPOINTS = os.getenv("LLM_ENDPOINTS")
+# Call slots kept free for critical-path calls (checklist, annex map, executive summary).
+LLM_CRITICAL_RESERVED_SLOTS = int(os.getenv("LLM_CRITICAL_RESERVED_SLOTS", 1))
+# Workers auditing specialist tasks across all proposals (0 = one per LLM call slot).
+AUDIT_POOL_WORKERS = int(os.getenv("AUDIT_POOL_WORKERS", 0))
+# "per_requirement": one LLM call per requirement; "per_annex": one call per proposal annex; "per_proposal": one call per proposal.
+SPECIALIST_EVALUATION_MODE = os.getenv("SPECIALIST_EVALUATION_MODE", "per_requirement")
+# Analysis profile used when /tenders/{id}/analyze does not name one: triage, standard or forensic.
+DEFAULT_ANALYSIS_PROFILE = os.getenv("DEFAULT_ANALYSIS_PROFILE", "standard")
+# "lpt": dispatch the most expensive specialist calls first (shortest makespan); "fifo": in routing order.
+AUDIT_POOL_SCHEDULING = os.getenv("AUDIT_POOL_SCHEDULING", "lpt")
+# Upper bounds (seconds, 0 = none) for auditing one proposal and for a whole analysis; unfinished requirements become "not evaluated (timeout)" findings.
+PROPOSAL_AUDIT_DEADLINE_SEC = float(os.getenv("PROPOSAL_AUDIT_DEADLINE_SEC", 0))
+ANALYSIS_DEADLINE_SEC = float(os.getenv("ANALYSIS_DEADLINE_SEC", 0))
+# LLM budget of one analysis (0 = unlimited): calls, tokens (prompt + completion) and wall time in seconds.
+# Once exhausted, further LLM calls of the analysis are refused and their requirements reported as "not evaluated (budget)".
+ANALYSIS_MAX_LLM_CALLS = int(os.getenv("ANALYSIS_MAX_LLM_CALLS", 0))
+ANALYSIS_MAX_LLM_TOKENS = int(os.getenv("ANALYSIS_MAX_LLM_TOKENS", 0))
+ANALYSIS_MAX_LLM_WALL_SEC = float(os.getenv("ANALYSIS_MAX_LLM_WALL_SEC", 0))
+# Fraction of any budget at which the analysis degrades: smaller evidence windows, batched evaluation, template summary.
+LLM_BUDGET_DEGRADE_AT = float(os.getenv("LLM_BUDGET_DEGRADE_AT", 0.8))
+# Decide clear-cut financial/legal requirements (amounts, percentages, dates, Sí/Acepto) locally, without an LLM call.
+RULE_ENGINE_ENABLED = os.getenv("RULE_ENGINE_ENABLED", "true").lower() == "true"
+# Early termination of clearly disqualified bidders: after this many CRITICAL findings (0 = never) and/or on an invalid RUC,
+# the remaining requirements are skipped ("skip") or only decided by the rule engine ("rules_only").
+EARLY_TERMINATION_CRITICAL_FINDINGS = int(os.getenv("EARLY_TERMINATION_CRITICAL_FINDINGS", 0))
+EARLY_TERMINATION_ON_INVALID_RUC = os.getenv("EARLY_TERMINATION_ON_INVALID_RUC", "false").lower() == "true"
+EARLY_TERMINATION_ACTION = os.getenv("EARLY_TERMINATION_ACTION", "skip")
+# Proposal scoring (see scoring.py): points each finding deducts from its area score (legal, technical, financial),
+# and the weight of each area in viabilityTotal. /tenders/{id}/rescore can override both without re-running the analysis.
+SCORING_DEDUCTION_CRITICAL = float(os.getenv("SCORING_DEDUCTION_CRITICAL", 15))
+SCORING_DEDUCTION_WARNING = float(os.getenv("SCORING_DEDUCTION_WARNING", 5))
+SCORING_DEDUCTION_OK = float(os.getenv("SCORING_DEDUCTION_OK", 0))
+SCORING_WEIGHT_LEGAL = float(os.getenv("SCORING_WEIGHT_LEGAL", 1))
+SCORING_WEIGHT_TECHNICAL = float(os.getenv("SCORING_WEIGHT_TECHNICAL", 1))
+SCORING_WEIGHT_FINANCIAL = float(os.getenv("SCORING_WEIGHT_FINANCIAL", 1))
+
+# Tenders longer than this (characters) get their master checklist extracted per section, in parallel.
+MASTER_CHECKLIST_SECTION_CHARS = int(os.getenv("MASTER_CHECKLIST_SECTION_CHARS", 60000))
+# Similarity (0-1) at which two checklist requirements are merged as duplicates; 1 disables consolidation.
+CHECKLIST_DEDUP_THRESHOLD = float(os.getenv("CHECKLIST_DEDUP_THRESHOLD", 0.6))
+
+# SRI (Tax Authority) RUC Validation
+# Base URL of the SRI catastro web service (or a local stand-in, see app/agents/services/sriStandIn.py).
+SRI_BASE_URL = os.getenv("SRI_BASE_URL", "https://srienlinea.sri.gob.ec")
+# Concurrent SRI requests over the shared connection pool, and the timeout of each request.
+SRI_MAX_CONCURRENCY = int(os.getenv("SRI_MAX_CONCURRENCY", 4))
+SRI_TIMEOUT_SEC = float(os.getenv("SRI_TIMEOUT_SEC", 10))
+# How long an SRI answer is reused from the RUC cache before the SRI is asked again (0 disables the cache).
+SRI_CACHE_TTL_HOURS = float(os.getenv("SRI_CACHE_TTL_HOURS", 24))
+# Reject RUCs with a bad province code, type digit or check digit (modulo 10/11) without calling the SRI.
+RUC_CHECKSUM_VALIDATION = os.getenv("RUC_CHECKSUM_VALIDATION", "true").lower() == "true"
+# "live": ask the SRI web service; "snapshot": answer from the offline catastro snapshot (see sriSnapshot) and only
+# call the SRI for RUCs missing from it, or for all RUCs once the snapshot is older than SRI_SNAPSHOT_MAX_AGE_DAYS (0 = never).
+SRI_LOOKUP_MODE = os.getenv("SRI_LOOKUP_MODE", "live")
+SRI_SNAPSHOT_MAX_AGE_DAYS = float(os.getenv("SRI_SNAPSHOT_MAX_AGE_DAYS", 30))
+
+# Evidence Retrieval Configuration
+# Passages (with page citations) sent per requirement from its annex and from the form; 0 sends the whole document.
+RETRIEVAL_EVIDENCE_TOP_K = int(os.getenv("RETRIEVAL_EVIDENCE_TOP_K", 5))
+RETRIEVAL_FORM_TOP_K = int(os.getenv("RETRIEVAL_FORM_TOP_K", 3))
+RETRIEVAL_PASSAGE_CHARS = int(os.getenv("RETRIEVAL_PASSAGE_CHARS", 1200))
+# Proposals whose intake (texts, retrieval index, RUC check) may be prepared or held ahead of their audit at once (0 = all).
+PROPOSAL_INTAKE_CONCURRENCY = int(os.getenv("PROPOSAL_INTAKE_CONCURRENCY", 4))
+
 # Next.js Frontend Configuration
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 CORS_ORIGINS = [
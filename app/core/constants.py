@@ -12,6 +12,8 @@ TENDERS_DIR = DATA_DIR / "tenders"
 PROPOSALS_DIR = DATA_DIR / "proposals"
 TEMP_DIR = DATA_DIR / "temp_files"
 SSE_DATA_FILE = DATA_DIR / "sse_data.json"
+SRI_CACHE_FILE = DATA_DIR / "sri_ruc_cache.json"
+SRI_SNAPSHOT_FILE = DATA_DIR / "sri_catastro.sqlite"
 
 # Project metadata
 PROJECT_NAME = "AI Service API"
@@ -27,6 +29,9 @@ ALLOWED_TYPES = ALLOWED_PDF_TYPES + ALLOWED_ZIP_TYPES
 PREFIX_PRINCIPAL = "PRINCIPAL"
 PREFIX_ATTACHMENTS = "ATTACHMENT"
 
+# Extracted PDF text keeps page boundaries as form feeds so passages can cite pages
+PAGE_SEPARATOR = "\f"
+
 # Error messages
 ERROR_INVALID_FILE_TYPE = "Invalid file type. Expected PDF or ZIP."
 ERROR_PDF_PROCESSING = "Error processing PDF file."
@@ -0,0 +1,214 @@
+"""
+End-to-end benchmark of the tender analysis graph against the local LLM stand-in.
+
+Runs `agentGraph` on a synthetic tender (or a tender JSON produced by
+GET /tenders/{id}/generate_json) without a real OpenAI key and prints the
+wall-clock time plus the LLM telemetry totals.
+
+Examples:
+    uv run python -m benchmarks.pipeline_benchmark --proposals 10 --latency lognormal --latency-ms 800
+    uv run python -m benchmarks.pipeline_benchmark --mode replay --transcript transcripts/tender_7.jsonl --input tender_7.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.agents.services import llmService
+from app.agents.services.documentStore import (
+    ANNEX_INDEX_DOCUMENT,
+    MAIN_FORM_DOCUMENT,
+    document_handle,
+    documentStore,
+    proposal_namespace,
+)
+from app.agents.services.endpointPool import LLMEndpoint
+from app.agents.services.llmStandIn import StandInConfig, create_stand_in_app, create_stand_in_client
+from app.core import constants
+
+FILLER_SENTENCE = (
+    "El oferente declara bajo juramento que la información presentada es veraz y "
+    "se somete a las condiciones establecidas en el pliego de contratación. "
+)
+
+
+def build_synthetic_tender(
+    proposal_count: int,
+    annexes_per_proposal: int,
+    annex_pages: int,
+    tender_pages: int = 0,
+    large_proposal_factor: int = 1
+) -> Dict[str, Any]:
+    """
+    Builds an agent input with `proposal_count` bidders whose forms reference their annexes.
+    With `tender_pages`, the pliego is that many pages long with a chapter every 20 pages.
+    With `large_proposal_factor`, the last bidder has that many times more annexes and pages.
+    """
+    tender_text = "PLIEGO DE LICITACIÓN\n\n" + FILLER_SENTENCE * 200
+    if tender_pages:
+        tender_text = constants.PAGE_SEPARATOR.join(
+            (f"CAPÍTULO {page // 20 + 1} " if page % 20 == 0 else "") + FILLER_SENTENCE * 25
+            for page in range(tender_pages)
+        )
+    proposals: List[Dict[str, Any]] = []
+
+    for proposal_index in range(proposal_count):
+        factor = large_proposal_factor if proposal_index == proposal_count - 1 else 1
+        annex_names = [f"Anexo_{annex_index + 1}.pdf" for annex_index in range(annexes_per_proposal * factor)]
+        form_lines = [f"FORMULARIO DE OFERTA - OFERENTE {proposal_index + 1}"]
+        form_lines += [f"Sección {i + 1}: ver {name}. " + FILLER_SENTENCE for i, name in enumerate(annex_names)]
+        materials, labour = 400000 + 25000 * proposal_index, 250000 + 10000 * proposal_index
+        form_lines += [
+            f"Plazo de entrega: {90 + 30 * (proposal_index % 4)} días calendario",
+            "Rubro | Valor USD",
+            f"Materiales | {materials:,.2f}",
+            f"Mano de obra | {labour:,.2f}",
+            f"TOTAL | {materials + labour:,.2f}",
+        ]
+        proposals.append({
+            "contractorId": f"BENCH{proposal_index + 1:03d}",
+            "companyName": f"Oferente {proposal_index + 1}",
+            "mainFormText": "\n".join(form_lines),
+            "annexIndexText": "\n".join(annex_names),
+            "attachments": {
+                name: constants.PAGE_SEPARATOR.join(f"Página {page + 1}. " + FILLER_SENTENCE * 8 for page in range(annex_pages * factor))
+                for name in annex_names
+            },
+            "ruc": None
+        })
+
+    return {"tenderText": tender_text, "proposals": proposals}
+
+
+def simulate_extraction(agent_input: Dict[str, Any], tender_id: str, extraction_ms: float) -> None:
+    """
+    Replaces the inline proposal texts with lazily loaded documents that take
+    `extraction_ms` to "extract", like the PDFs registered by tender_service.
+    """
+    def loader(text: str):
+        return lambda: time.sleep(extraction_ms / 1000) or text
+
+    for proposal in agent_input.get("proposals", []):
+        namespace = proposal_namespace(tender_id, proposal)
+        proposal["mainFormRef"] = documentStore.register(document_handle(namespace, MAIN_FORM_DOCUMENT), loader(proposal.pop("mainFormText", "")))
+        proposal["annexIndexRef"] = documentStore.register(document_handle(namespace, ANNEX_INDEX_DOCUMENT), loader(proposal.pop("annexIndexText", "")))
+        proposal["attachmentRefs"] = {
+            annex_key: documentStore.register(document_handle(namespace, annex_key), loader(text))
+            for annex_key, text in proposal.pop("attachments", {}).items()
+        }
+
+
+async def run_benchmark(
+    agent_input: Dict[str, Any],
+    config: StandInConfig,
+    tender_id: str,
+    endpoint_count: int = 1,
+    endpoint_concurrency: int = 8
+) -> Dict[str, Any]:
+    from app.agents.tenderAnalyzer.mainGraph import agentGraph
+
+    stand_in_app = create_stand_in_app(config)
+    llmService.configure_endpoints(
+        [
+            LLMEndpoint(name=f"stand-in-{index + 1}", apiKey="stand-in", baseUrl="http://llm-stand-in/v1", maxConcurrency=endpoint_concurrency)
+            for index in range(endpoint_count)
+        ],
+        http_async_client=create_stand_in_client(stand_in_app)
+    )
+    llmService.reset_usage(tender_id)
+    os.environ["CURRENT_TENDER_ID"] = tender_id
+
+    started_at = time.perf_counter()
+    final_state = await agentGraph.ainvoke({**agent_input, "tenderId": tender_id})
+    wall_time = time.perf_counter() - started_at
+
+    return {
+        "wallTimeSec": round(wall_time, 3),
+        "proposals": len(agent_input.get("proposals", [])),
+        "reports": len((final_state.get("finalReport") or {}).get("proposalsAnalysis", [])),
+        "llm": llmService.get_usage_summary(tender_id),
+        "llmBudget": (final_state.get("finalReport") or {}).get("llmBudget"),
+        "budgetComparison": (final_state.get("finalReport") or {}).get("budgetComparison"),
+        "standIn": dict(stand_in_app.state.standIn.stats),
+        "documentStore": documentStore.stats()
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the tender graph against the LLM stand-in.")
+    parser.add_argument("--input", help="Tender JSON (the 'data' of /tenders/{id}/generate_json). Synthetic if omitted.")
+    parser.add_argument("--proposals", type=int, default=5)
+    parser.add_argument("--annexes", type=int, default=4)
+    parser.add_argument("--annex-pages", type=int, default=5)
+    parser.add_argument("--large-proposal-factor", type=int, default=1, help="Make the last bidder this many times larger (skewed sizes).")
+    parser.add_argument("--tender-pages", type=int, default=0, help="Pliego length in pages (default: a short pliego).")
+    parser.add_argument("--mode", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--transcript", default=None)
+    parser.add_argument("--latency", choices=["none", "fixed", "uniform", "normal", "lognormal", "recorded"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=0.0)
+    parser.add_argument("--latency-per-ktoken-ms", type=float, default=0.0, help="Extra latency per 1000 prompt tokens.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endpoints", type=int, default=1, help="Number of pooled endpoints (simulated keys).")
+    parser.add_argument("--endpoint-concurrency", type=int, default=8, help="Concurrency limit per endpoint.")
+    parser.add_argument("--extraction-ms", type=float, default=0.0, help="Simulated extraction time per proposal document.")
+    parser.add_argument("--scheduling", choices=["lpt", "fifo"], default=None, help="Audit pool dispatch order (default: AUDIT_POOL_SCHEDULING).")
+    parser.add_argument("--evaluation-mode", choices=["per_requirement", "per_annex", "per_proposal"], default=None)
+    parser.add_argument("--profile", choices=["triage", "standard", "forensic"], default=None, help="Analysis profile.")
+    parser.add_argument("--max-llm-calls", type=int, default=None, help="LLM call budget of the analysis.")
+    parser.add_argument("--max-llm-tokens", type=int, default=None, help="LLM token budget of the analysis.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            agent_input = json.load(f)
+    else:
+        agent_input = build_synthetic_tender(
+            args.proposals, args.annexes, args.annex_pages, args.tender_pages, args.large_proposal_factor
+        )
+    if args.evaluation_mode:
+        agent_input["evaluationMode"] = args.evaluation_mode
+    if args.profile:
+        agent_input["analysisProfile"] = args.profile
+    if args.max_llm_calls is not None or args.max_llm_tokens is not None:
+        agent_input["llmBudget"] = {"maxCalls": args.max_llm_calls, "maxTokens": args.max_llm_tokens}
+    if args.scheduling:
+        from app.agents.tenderAnalyzer import auditPool
+        auditPool.AUDIT_POOL_SCHEDULING = args.scheduling
+    if args.extraction_ms:
+        simulate_extraction(agent_input, "benchmark", args.extraction_ms)
+
+    config = StandInConfig(
+        mode=args.mode,
+        transcriptPath=args.transcript,
+        latencyDistribution=args.latency,
+        latencyMs=args.latency_ms,
+        latencySpreadMs=args.latency_spread_ms,
+        latencyPerKTokenMs=args.latency_per_ktoken_ms,
+        errorRate=args.error_rate,
+        seed=args.seed
+    )
+
+    # Keep the run's side files (SSE state, checklist cache, output_agent.json) out of the real data directory.
+    with tempfile.TemporaryDirectory() as work_dir:
+        constants.SSE_DATA_FILE = Path(work_dir) / "sse_data.json"
+        constants.TENDERS_DIR = Path(work_dir) / "tenders"
+        os.chdir(work_dir)
+        result = asyncio.run(run_benchmark(
+            agent_input, config, tender_id="benchmark",
+            endpoint_count=args.endpoints, endpoint_concurrency=args.endpoint_concurrency
+        ))
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
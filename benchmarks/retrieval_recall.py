@@ -0,0 +1,90 @@
+"""
+Recall and prompt-size check for the evidence retrieval index.
+
+Builds synthetic proposals whose annexes hide the evidence for each requirement
+on one page among many pages of boilerplate, then reports how often that page
+is among the retrieved passages and how much smaller the evidence gets.
+
+Example:
+    uv run python -m benchmarks.retrieval_recall --annex-pages 60 --top-k 5
+"""
+import argparse
+import json
+import random
+from typing import Any, Dict, List, Tuple
+
+from app.agents.tenderAnalyzer.retrievalIndex import ProposalRetrievalIndex, format_passages
+from app.core.constants import PAGE_SEPARATOR
+
+BOILERPLATE = [
+    "El oferente declara bajo juramento que la información presentada es veraz.",
+    "Las condiciones generales del contrato se rigen por la normativa vigente del SERCOP.",
+    "Los documentos deberán presentarse debidamente foliados y rubricados por el representante legal.",
+    "La entidad contratante se reserva el derecho de verificar la información proporcionada.",
+    "Cualquier controversia se resolverá conforme a la ley orgánica del sistema nacional de contratación pública.",
+]
+
+# (requirement name, requirement details, evidence sentence written in the annex)
+REQUIREMENTS: List[Tuple[str, str, str]] = [
+    ("Patrimonio Mínimo", ">= $80,187.24", "El patrimonio neto de la compañía al cierre del ejercicio asciende a USD 95.320,11."),
+    ("Índice de Solvencia", "Mayor o igual a 1.0", "El índice de solvencia calculado sobre los estados financieros es de 1,35."),
+    ("Experiencia General", "Al menos 3 contratos similares en los últimos 15 años", "Se adjuntan actas de entrega recepción de tres contratos similares de obra civil."),
+    ("Equipo Mínimo", "Retroexcavadora y volqueta de 8 m3", "El equipo mínimo disponible incluye una retroexcavadora CAT 416 y una volqueta de 8 m3."),
+    ("Personal Técnico Clave", "Ingeniero civil residente con 5 años de experiencia", "El ingeniero civil residente acredita siete años de experiencia en obras viales."),
+    ("Garantía de Fiel Cumplimiento", "5% del monto del contrato", "Se compromete a entregar la garantía de fiel cumplimiento por el 5% del monto contractual."),
+    ("Plazo de Ejecución", "180 días calendario", "El plazo de ejecución ofertado es de 180 días calendario contados desde el anticipo."),
+    ("Certificado ISO 9001", "Vigente a la fecha de la oferta", "Se presenta certificado ISO 9001:2015 vigente emitido por organismo acreditado."),
+]
+
+
+def build_case(annex_pages: int, rng: random.Random) -> Tuple[str, Dict[str, str], List[Dict[str, Any]]]:
+    """One proposal with a single annex; returns form text, annexes and the expected evidence pages."""
+    pages = [" ".join(rng.choice(BOILERPLATE) for _ in range(12)) for _ in range(annex_pages)]
+    expectations = []
+    for name, details, evidence in REQUIREMENTS:
+        page_index = rng.randrange(annex_pages)
+        pages[page_index] += " " + evidence
+        expectations.append({"name": name, "details": details, "page": page_index + 1})
+    form_text = PAGE_SEPARATOR.join([
+        "FORMULARIO DE OFERTA. " + " ".join(f"{name}: ver Anexo_1.pdf." for name, _, _ in REQUIREMENTS),
+        " ".join(rng.choice(BOILERPLATE) for _ in range(20)),
+    ])
+    return form_text, {"Anexo_1.pdf": PAGE_SEPARATOR.join(pages)}, expectations
+
+
+def run(cases: int, annex_pages: int, top_k: int, passage_chars: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    hits = total = full_chars = retrieved_chars = 0
+
+    for _ in range(cases):
+        form_text, annexes, expectations = build_case(annex_pages, rng)
+        index = ProposalRetrievalIndex(form_text, annexes, passage_chars)
+        for expected in expectations:
+            passages = index.search(f"{expected['name']} {expected['details']}", "Anexo_1.pdf", top_k)
+            hits += any(passage.page == expected["page"] for passage in passages)
+            total += 1
+            full_chars += len(annexes["Anexo_1.pdf"])
+            retrieved_chars += len(format_passages(passages))
+
+    return {
+        "requirements": total,
+        "recallAtK": round(hits / total, 3) if total else 0.0,
+        "avgEvidenceCharsFull": full_chars // max(total, 1),
+        "avgEvidenceCharsRetrieved": retrieved_chars // max(total, 1),
+        "reductionFactor": round(full_chars / max(retrieved_chars, 1), 1)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure recall@k of the evidence retrieval index.")
+    parser.add_argument("--cases", type=int, default=20)
+    parser.add_argument("--annex-pages", type=int, default=60)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--passage-chars", type=int, default=1200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.cases, args.annex_pages, args.top_k, args.passage_chars, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
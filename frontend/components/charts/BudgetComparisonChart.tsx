@@ -40,14 +40,16 @@ export function BudgetComparisonChart({ budgetComparison }: BudgetComparisonChar
 
   const { proposals } = budgetComparison;
 
-  const CustomTooltip = ({ active, payload, label }: any) => {
-    if (active && payload && payload.length) {
+  const CustomTooltip = ({ active, label }: any) => {
+    if (active) {
+      // Read the row itself: recharts leaves bars without a value out of the payload
+      const row: any = data.find((entry: any) => entry.category === label) || {};
       return (
         <div className="bg-white p-3 border border-gray-200 rounded-md shadow-sm">
           <p className="text-sm font-semibold text-gray-900 mb-2">{label}</p>
-          {payload.map((entry: any, index: number) => (
-            <p key={index} className="text-sm" style={{ color: entry.color }}>
-              {entry.name}: {formatCurrency(entry.value)}
+          {proposals.map((proposal, index) => (
+            <p key={proposal.bidderName} className="text-sm" style={{ color: CHART_COLORS[index % CHART_COLORS.length] }}>
+              {proposal.bidderName}: {row[proposal.bidderName] == null ? 'Not found' : formatCurrency(row[proposal.bidderName])}
             </p>
           ))}
         </div>
@@ -5,7 +5,9 @@
 import type { BudgetComparison, ProposalScores, FindingsSummary } from './types';
 
 /**
- * Transform budget comparison data for Bar Chart
+ * Transform budget comparison data for Bar Chart.
+ * Amounts a proposal does not state stay null, so no bar is drawn for them
+ * (a missing amount is not a $0 bid).
  */
 export function transformBudgetForBarChart(budgetComparison: BudgetComparison) {
     // Handle undefined or missing data
@@ -19,7 +21,7 @@ export function transformBudgetForBarChart(budgetComparison: BudgetComparison) {
         category,
         ...proposals.reduce((acc, proposal) => ({
             ...acc,
-            [proposal.bidderName]: proposal.valuesUSD[idx] || 0
+            [proposal.bidderName]: proposal.valuesUSD[idx] ?? null
         }), {})
     }));
 }
@@ -21,16 +21,33 @@ export interface FindingsSummary {
     ok: number;
 }
 
+export interface BudgetItem {
+    category: string;
+    amountUSD: number;
+}
+
+// Figures read from the bidder's main form; null when the form does not state them
+export interface BidSummary {
+    totalAmountUSD: number | null;
+    deliveryMonths: number | null;
+    deliveryDays: number | null;
+    budgetItems: BudgetItem[];
+    financialRatios?: Record<string, number>;
+    sourcePages?: Record<string, number>;
+}
+
 export interface ProposalAnalysis {
     bidderName: string;
     scores: ProposalScores;
     findingsSummary: FindingsSummary;
     findings: Finding[];
+    summaryData?: BidSummary;
 }
 
 export interface BudgetProposal {
     bidderName: string;
-    valuesUSD: number[];
+    // null where the proposal does not state the category's amount
+    valuesUSD: (number | null)[];
 }
 
 export interface BudgetComparison {
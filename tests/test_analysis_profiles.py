@@ -0,0 +1,55 @@
+"""
+Tests for the triage / standard / forensic analysis profiles
+"""
+import asyncio
+
+import pytest
+
+from app.agents.tenderAnalyzer.analysisProfiles import get_analysis_profile
+from app.agents.tenderAnalyzer.auditPool import run_audit_pool
+from app.agents.tenderAnalyzer.pipelineNodes import template_executive_summary
+from app.api.services import analysis_service
+
+
+def test_profiles_are_resolved_by_name():
+    assert get_analysis_profile().name == "standard"
+    assert get_analysis_profile("forensic").specialistModel == "gpt-4o"
+    with pytest.raises(ValueError):
+        get_analysis_profile("express")
+    assert "error" in asyncio.run(analysis_service.start_tender_analysis("1", profile="express"))
+
+
+def test_triage_makes_one_call_per_proposal_without_llm_routing(monkeypatch):
+    """Unreferenced requirements go to the best-matching annex by retrieval, or are left unevaluated"""
+    calls = []
+
+    async def fake_batch(batch, tender_id=None, proposal_name=None, model_name=None, use_rules=True):
+        calls.append((proposal_name, model_name, [task.requirementToVerify.name for _, task in batch]))
+        return [{"requirementName": task.requirementToVerify.name, "severity": "OK", "agentSource": source} for source, task in batch]
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.auditPool.run_annex_batch", fake_batch)
+    checklist = {
+        "financialRequirements": [{"name": "Patrimonio", "details": "d"}],
+        "technicalRequirements": [{"name": "Experiencia", "details": "d"}],
+        "legalRequirements": [{"name": "Garantía", "details": "d"}, {"name": "Certificado ISO", "details": "9001"}]
+    }
+    inputs = [{"tenderId": "triage", "findings": [], "proposal": {
+        "contractorId": "T", "companyName": "Triaje SA", "ruc": None,
+        "mainFormText": "Patrimonio: ver Anexo_1.pdf. Experiencia: ver Anexo_2.pdf.",
+        "annexIndexText": "", "attachments": {"Anexo_1.pdf": "Patrimonio.", "Anexo_2.pdf": "Experiencia. Certificado ISO 9001 vigente."}
+    }}]
+
+    report = asyncio.run(run_audit_pool(inputs, master_checklist=checklist, profile=get_analysis_profile("triage")))[0]
+
+    assert calls == [("Triaje SA", "gpt-4o-mini", ["Patrimonio", "Experiencia", "Certificado ISO"])]
+    unmapped = [f for f in report["findings"] if f["requirementName"] == "Garantía"][0]
+    assert unmapped["notEvaluated"] is True and unmapped["notEvaluatedReason"] == "profile"
+
+
+def test_template_summary_ranks_proposals_without_an_llm():
+    summary = template_executive_summary([
+        {"bidderName": "Beta", "scores": {"viabilityTotal": 70}, "findingsSummary": {"critical": 2, "notEvaluated": 1}},
+        {"bidderName": "Alfa", "scores": {"viabilityTotal": 95}, "findingsSummary": {"critical": 0}},
+    ])
+    assert summary.startswith("Triaje de 2 propuestas. La mejor puntuada es Alfa (95/100")
+    assert "Beta (70/100, 2 hallazgos críticos)" in summary and "1 requisitos quedaron sin evaluar" in summary
@@ -0,0 +1,47 @@
+"""
+Tests for the deterministic annex resolver
+"""
+from app.agents.tenderAnalyzer.annexResolver import AnnexIndex, resolve_requirement_annexes
+
+ANNEXES = ["ANEXO_1.pdf", "Anexo-2 Experiencia.pdf", "Estados_Financieros.pdf", "anexo_03.pdf"]
+
+
+def test_annex_index_resolves_common_spellings():
+    """Case, separators, extension, numbering and small typos all resolve to the real key"""
+    index = AnnexIndex(ANNEXES)
+    assert index.resolve("anexo 1") == "ANEXO_1.pdf"
+    assert index.resolve("Anexo_2_Experiencia.PDF") == "Anexo-2 Experiencia.pdf"
+    assert index.resolve("Anexo No. 3") == "anexo_03.pdf"
+    assert index.resolve("Estado_Financiero.pdf") == "Estados_Financieros.pdf"
+    assert index.resolve("Anexo_9.pdf") is None
+
+
+def test_requirements_resolve_from_form_and_index_page():
+    """References in the form and the annex index page map requirements without an LLM"""
+    form = (
+        "FORMULARIO. Patrimonio Mínimo: USD 95.320 (ver ANEXO_1.pdf). "
+        "Experiencia general del oferente, ver Anexo 2. Garantías: Anexo No. 3."
+    )
+    index_page = "Anexo 1 - Balance\nAnexo 3 - Garantía de fiel cumplimiento"
+
+    resolved = resolve_requirement_annexes(
+        ["Patrimonio Mínimo", "Experiencia General", "Garantía de Fiel Cumplimiento", "Índice de Solvencia"],
+        form, index_page, AnnexIndex(ANNEXES)
+    )
+
+    assert resolved == {
+        "Patrimonio Mínimo": "ANEXO_1.pdf",
+        "Experiencia General": "Anexo-2 Experiencia.pdf",
+        "Garantía de Fiel Cumplimiento": "anexo_03.pdf",
+    }
+
+
+def test_single_annex_only_takes_the_requirements_it_matches():
+    """A bidder who uploads one annex is not credited with the others: unmatched requirements stay unresolved"""
+    form = "Patrimonio Mínimo: ver Anexo_1.pdf. Garantía de fiel cumplimiento: ver Anexo_2.pdf."
+
+    resolved = resolve_requirement_annexes(
+        ["Patrimonio Mínimo", "Garantía de Fiel Cumplimiento"], form, "", AnnexIndex(["Anexo_1.pdf"])
+    )
+
+    assert resolved == {"Patrimonio Mínimo": "Anexo_1.pdf"}
@@ -4,10 +4,19 @@ Basic tests for TenderAnalyzer API endpoints
 import pytest
 from fastapi.testclient import TestClient
 from app.api.main import app
+from app.core import constants
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Keeps the endpoints from writing tender folders or SSE state into data/"""
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path / "tenders")
+    monkeypatch.setattr(constants, "PROPOSALS_DIR", tmp_path / "proposals")
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+
+
 
 
 
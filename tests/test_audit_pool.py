@@ -0,0 +1,255 @@
+"""
+Tests for the flattened specialist task pool
+"""
+import asyncio
+import time
+
+from app.agents.services.documentStore import documentStore
+from app.agents.tenderAnalyzer.auditPool import AuditJob, PoolProgress, estimate_unit_cost, run_audit_pool, _DispatchQueue, _group_jobs
+from app.agents.tenderAnalyzer.schemas.masterChecklist import Requirement
+from app.agents.tenderAnalyzer.schemas.specialistTasks import SpecialistTask
+from app.core import constants
+
+
+def _job(proposal_index, agent_source, annex_key):
+    task = SpecialistTask(
+        requirementToVerify=Requirement(name=f"{agent_source}-{annex_key}", details="d"),
+        evidenceRef="tender_1/annex", mainFormRef="tender_1/form", annexKey=annex_key
+    )
+    return AuditJob(proposal_index, agent_source, task)
+
+
+def _checklist(*financial_names):
+    return {
+        "financialRequirements": [{"name": name, "details": "d"} for name in financial_names],
+        "technicalRequirements": [],
+        "legalRequirements": []
+    }
+
+
+def _inputs(tender_id, annex_texts):
+    """One pool input per company in `annex_texts`, whose form points to a single annex with that text"""
+    return [
+        {"tenderId": tender_id, "findings": [], "proposal": {
+            "contractorId": name, "companyName": name, "ruc": None, "mainFormText": "Patrimonio, solvencia y liquidez: ver Anexo_1.pdf",
+            "annexIndexText": "", "attachments": {"Anexo_1.pdf": text}
+        }}
+        for name, text in annex_texts.items()
+    ]
+
+
+def _stub_specialists(monkeypatch, delay=lambda proposal_name, requirement_name: 0.01, severity="OK"):
+    """
+    Replaces the specialist LLM call: each call waits delay(proposal, first requirement)
+    seconds (the callable may also raise) and returns one `severity` finding per task.
+    Returns the list of (proposal, requirement names) of the calls made.
+    """
+    calls = []
+
+    async def fake_batch(batch, tender_id=None, proposal_name=None, **options):
+        names = [task.requirementToVerify.name for _, task in batch]
+        calls.append((proposal_name, names))
+        await asyncio.sleep(delay(proposal_name, names[0]))
+        return [{"requirementName": task.requirementToVerify.name, "severity": severity, "agentSource": source} for source, task in batch]
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.auditPool.run_annex_batch", fake_batch)
+    return calls
+
+
+def test_audit_pool_bounds_concurrency_and_keeps_task_order(monkeypatch):
+    """Never more than worker_count specialist calls run at once; findings keep task order"""
+    running = 0
+    peak = 0
+
+    async def fake_batch(batch, tender_id=None, proposal_name=None, **options):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * len(batch[0][1].requirementToVerify.name))
+        running -= 1
+        return [{"requirementName": task.requirementToVerify.name, "severity": "OK", "agentSource": source} for source, task in batch]
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.auditPool.run_annex_batch", fake_batch)
+    inputs = _inputs("bounded", dict.fromkeys(("A", "B", "C"), "Patrimonio, solvencia y liquidez."))
+
+    reports = asyncio.run(run_audit_pool(inputs, worker_count=2, master_checklist=_checklist("Patrimonio", "Solvencia", "Liquidez"),
+                                         evaluation_mode="per_requirement"))
+
+    assert peak == 2
+    for report in reports:
+        assert [f["requirementName"] for f in report["findings"]][-3:] == ["Patrimonio", "Solvencia", "Liquidez"]
+
+
+def test_per_annex_mode_groups_jobs_by_proposal_and_annex():
+    """Requirements from different specialists share a call when they share a proposal annex"""
+    jobs = [
+        _job(0, "Financial", "Anexo_1.pdf"),
+        _job(0, "Legal", "Anexo_1.pdf"),
+        _job(0, "Technical", "Anexo_2.pdf"),
+        _job(1, "Financial", "Anexo_1.pdf"),
+    ]
+    assert _group_jobs(jobs, "per_annex") == [[0, 1], [2], [3]]
+    assert _group_jobs(jobs, "per_requirement") == [[0], [1], [2], [3]]
+
+
+def test_audit_pool_streams_each_proposal_as_it_completes(monkeypatch):
+    """A fast proposal is reported while a slow one is still being audited"""
+    events = []
+    _stub_specialists(monkeypatch, delay=lambda proposal_name, _: 0.2 if proposal_name == "Lenta" else 0.01)
+
+    reports = asyncio.run(run_audit_pool(
+        _inputs("stream", dict.fromkeys(("Lenta", "Rapida"), "Patrimonio y solvencia.")),
+        worker_count=4, master_checklist=_checklist("Patrimonio", "Solvencia"), evaluation_mode="per_requirement",
+        on_findings=lambda state, findings: events.append(("findings", state["proposal"]["companyName"], len(findings))),
+        on_proposal_done=lambda state: events.append(("report", state["proposal"]["companyName"]))
+    ))
+
+    assert [event for event in events if event[0] == "report"] == [("report", "Rapida"), ("report", "Lenta")]
+    assert events.index(("report", "Rapida")) < max(i for i, event in enumerate(events) if event[1] == "Lenta" and event[0] == "findings")
+    assert [report["finalAnalysis"]["bidderName"] for report in reports] == ["Lenta", "Rapida"]
+    assert [f["requirementName"] for f in reports[1]["findings"]][-2:] == ["Patrimonio", "Solvencia"]
+
+
+def test_unit_cost_counts_each_document_once_and_longest_units_dispatch_first():
+    """Costs follow evidence volume; the dispatch queue hands out the lowest priority first, sentinels last"""
+    documentStore.put("tender_lpt/form", "f" * 400)
+    documentStore.put("tender_lpt/annex", "a" * 40000)
+    task = SpecialistTask(requirementToVerify=Requirement(name="R", details="d"), evidenceRef="tender_lpt/annex",
+                          mainFormRef="tender_lpt/form", annexKey="Anexo_1.pdf")
+    jobs = [AuditJob(0, "Financial", task), AuditJob(0, "Legal", task)]
+    single, batched = estimate_unit_cost(jobs, [0]), estimate_unit_cost(jobs, [0, 1])
+    assert single > 10000 and batched - single < 1000
+    documentStore.release("tender_lpt/")
+
+    async def drain():
+        queue = _DispatchQueue()
+        queue.put_nowait(None)
+        for name, cost in [("small", 100), ("large", 9000), ("medium", 800)]:
+            queue.put_nowait(name, (-cost,))
+        return [await queue.get() for _ in range(4)]
+
+    assert asyncio.run(drain()) == ["large", "medium", "small", None]
+
+
+def test_audit_pool_reports_estimated_work_and_eta(monkeypatch):
+    """Progress snapshots end with all estimated work completed; no ETA before every proposal is routed"""
+    snapshots = []
+    _stub_specialists(monkeypatch)
+    inputs = _inputs("eta", {"Chica": "Patrimonio. " * 10, "Grande": "Patrimonio. " * 2000})
+
+    asyncio.run(run_audit_pool(inputs, worker_count=1, master_checklist=_checklist("Patrimonio"), evaluation_mode="per_requirement",
+                               on_progress=snapshots.append, scheduling="lpt"))
+
+    final = snapshots[-1]
+    assert final["routedProposals"] == final["totalProposals"] == 2
+    assert final["completedTokens"] == final["estimatedTokens"] > 0
+    assert final["etaSeconds"] == 0
+    assert PoolProgress(3).snapshot()["etaSeconds"] is None
+
+
+def test_deadlines_turn_unfinished_requirements_into_timeout_findings(monkeypatch):
+    """A stuck call only delays its proposal until the deadline; the report is still compiled"""
+    _stub_specialists(monkeypatch, delay=lambda proposal_name, _: 30 if proposal_name == "Atascada" else 0.01)
+    checklist = _checklist("Patrimonio")
+    inputs = _inputs("deadline", dict.fromkeys(("Atascada", "Normal"), "Patrimonio."))
+
+    started_at = time.monotonic()
+    reports = asyncio.run(run_audit_pool(inputs, worker_count=2, master_checklist=checklist,
+                                         evaluation_mode="per_requirement", proposal_deadline_sec=0.3))
+
+    assert time.monotonic() - started_at < 5
+    stuck, normal = (report["finalAnalysis"] for report in reports)
+    assert stuck["findings"][-1]["notEvaluated"] is True
+    assert stuck["findings"][-1]["observation"].startswith("Not evaluated (timeout)")
+    assert stuck["findingsSummary"]["notEvaluated"] == 1 and stuck["scores"]["financial"] == 100
+    assert normal["findingsSummary"]["notEvaluated"] == 0
+
+    expired = asyncio.run(run_audit_pool(inputs[1:], worker_count=1, master_checklist=checklist,
+                                         evaluation_mode="per_requirement", deadline=time.monotonic() - 1))
+    assert [f["requirementName"] for f in expired[0]["finalAnalysis"]["findings"]] == ["Patrimonio"]
+    assert expired[0]["finalAnalysis"]["findings"][0]["notEvaluated"] is True
+
+
+def test_final_report_separates_timeouts_from_other_skips(tmp_path, monkeypatch):
+    """Only deadline timeouts count as timedOutProposals; budget or disqualification skips are listed apart"""
+    from app.agents.tenderAnalyzer.pipelineNodes import formatFinalResponseNode
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+    skipped = {"notEvaluated": True, "notEvaluatedReason": "budget"}
+    analyses = [
+        {"bidderName": "Lenta", "findings": [{"notEvaluated": True, "notEvaluatedReason": "timeout"}, skipped]},
+        {"bidderName": "Sin presupuesto", "findings": [skipped, skipped, {"severity": "OK"}]},
+    ]
+
+    report = formatFinalResponseNode({"tenderId": "report", "analysisResults": analyses})["finalReport"]
+
+    assert report["deadlines"]["timedOutProposals"] == [{"bidderName": "Lenta", "notEvaluated": 1}]
+    assert report["notEvaluatedProposals"] == [
+        {"bidderName": "Lenta", "byReason": {"budget": 1}},
+        {"bidderName": "Sin presupuesto", "byReason": {"budget": 2}},
+    ]
+
+
+def test_disqualified_proposals_skip_their_remaining_calls(monkeypatch):
+    """After N CRITICAL findings the remaining tasks are skipped and listed in the report"""
+    calls = _stub_specialists(monkeypatch, delay=lambda *_: 0, severity="CRITICAL")
+    monkeypatch.setattr("app.agents.tenderAnalyzer.specialistNodes.EARLY_TERMINATION_CRITICAL_FINDINGS", 2)
+    checklist = _checklist("Patrimonio", "Solvencia", "Liquidez")
+    inputs = _inputs("early", {"Descalificada": "Patrimonio, solvencia y liquidez."})
+
+    report = asyncio.run(run_audit_pool(inputs, worker_count=1, master_checklist=checklist,
+                                        evaluation_mode="per_requirement"))[0]["finalAnalysis"]
+
+    # The missing RUC is the first CRITICAL finding, the first specialist call the second.
+    assert len(calls) == 1
+    assert report["earlyTermination"]["skippedTasks"] == ["Financial: Solvencia", "Financial: Liquidez"]
+    assert report["findingsSummary"]["notEvaluated"] == 2
+
+    calls.clear()
+    monkeypatch.setattr("app.agents.tenderAnalyzer.specialistNodes.EARLY_TERMINATION_CRITICAL_FINDINGS", 0)
+    monkeypatch.setattr("app.agents.tenderAnalyzer.specialistNodes.EARLY_TERMINATION_ON_INVALID_RUC", True)
+    report = asyncio.run(run_audit_pool(inputs, worker_count=1, master_checklist=checklist,
+                                        evaluation_mode="per_requirement"))[0]["finalAnalysis"]
+    assert calls == [] and report["earlyTermination"]["reason"] == "invalid RUC"
+
+
+def test_a_failing_router_only_affects_its_proposal_and_a_failing_pool_stops_its_calls(monkeypatch):
+    """A router error becomes not-evaluated findings for that proposal; a pool that fails cancels its workers"""
+    from app.agents.tenderAnalyzer import auditPool
+
+    real_router = auditPool.projectManagerRouterNode
+
+    async def flaky_router(state):
+        if state["proposal"]["companyName"] == "Corrupta":
+            raise ValueError("cannot read Anexo_1.pdf")
+        return await real_router(state)
+
+    def delay(proposal_name, requirement_name):
+        if proposal_name == "Rota" and requirement_name == "Patrimonio":
+            raise RuntimeError("unexpected specialist error")
+        return 0.2 if requirement_name == "Solvencia" else 0.01
+
+    monkeypatch.setattr(auditPool, "projectManagerRouterNode", flaky_router)
+    calls = _stub_specialists(monkeypatch, delay=delay)
+    checklist = _checklist("Patrimonio", "Solvencia")
+    inputs = _inputs("errors", dict.fromkeys(("Corrupta", "Normal", "Rota"), "Patrimonio y solvencia."))
+
+    reports = asyncio.run(run_audit_pool(inputs[:2], worker_count=2, master_checklist=checklist, evaluation_mode="per_requirement"))
+    corrupt, normal = (report["finalAnalysis"] for report in reports)
+    assert [f["notEvaluatedReason"] for f in corrupt["findings"]] == ["error", "error"]
+    assert "cannot read Anexo_1.pdf" in corrupt["findings"][0]["observation"]
+    assert normal["findingsSummary"]["notEvaluated"] == 0 and [name for name, _ in calls] == ["Normal", "Normal"]
+
+    calls.clear()
+
+    async def run_and_wait():
+        try:
+            await run_audit_pool(inputs[1:], worker_count=2, master_checklist=checklist, evaluation_mode="per_requirement")
+        except RuntimeError:
+            pass
+        calls_at_failure = len(calls)
+        await asyncio.sleep(0.3)
+        return calls_at_failure
+
+    assert asyncio.run(run_and_wait()) == len(calls)
@@ -0,0 +1,61 @@
+"""
+Tests for reading bid amounts, delivery terms and financial indices from the main form
+"""
+from app.agents.tenderAnalyzer.bidSummary import build_budget_comparison, extract_bid_summary
+from app.core.constants import PAGE_SEPARATOR
+
+FORM = PAGE_SEPARATOR.join([
+    "FORMULARIO DE OFERTA\nRazón social: Constructora Andes S.A.\nPlazo de ejecución: ciento veinte (120) días calendario",
+    "TABLA DE CANTIDADES Y PRECIOS\nRubro | Cantidad | Precio total\n"
+    "Materiales de construcción | 1 | 600.000,00\nMano de obra | 1 | 350.000,00\nEquipos | 1 | 150.000,00\n"
+    "SUBTOTAL | | 1.100.000,00\nIVA 15% | | 165.000,00\nTOTAL | | 1.265.000,00",
+    "INDICADORES FINANCIEROS\nÍndice de solvencia (mínimo 1,0): 1,45\nÍndice de endeudamiento\n0,62",
+])
+
+# Cells extracted one per line, items that do not add up to the total, a term in working days.
+LOOSE_FORM = (
+    "Monto total\n$ 980,500.00\n"
+    "Garantía    50,000.00\nPóliza    12,000.00\n"
+    "Total    980,500.00\n"
+    "Tiempo de entrega: 45 días hábiles"
+)
+
+
+def test_extracts_total_items_delivery_and_ratios_with_their_pages():
+    summary = extract_bid_summary(FORM)
+
+    assert summary["totalAmountUSD"] == 1265000.0
+    assert summary["budgetItems"] == [
+        {"category": "Materiales de construcción", "amountUSD": 600000.0},
+        {"category": "Mano de obra", "amountUSD": 350000.0},
+        {"category": "Equipos", "amountUSD": 150000.0},
+    ]
+    assert (summary["deliveryDays"], summary["deliveryMonths"]) == (120, 4.0)
+    assert summary["financialRatios"] == {"solvencyIndex": 1.45, "debtRatio": 0.62}
+    assert summary["sourcePages"] == {"totalAmountUSD": 2, "budgetItems": 2, "deliveryMonths": 1, "solvencyIndex": 3, "debtRatio": 3}
+
+
+def test_unreconciled_items_are_dropped_and_missing_values_stay_empty():
+    summary = extract_bid_summary(LOOSE_FORM)
+    assert summary["totalAmountUSD"] == 980500.0 and summary["budgetItems"] == []
+    assert summary["deliveryDays"] == 63
+
+    empty = extract_bid_summary("")
+    assert (empty["totalAmountUSD"], empty["deliveryMonths"], empty["financialRatios"]) == (None, None, {})
+
+
+def test_budget_comparison_aligns_categories_across_bidders():
+    comparison = build_budget_comparison([
+        {"bidderName": "Andes", "summaryData": extract_bid_summary(FORM)},
+        {"bidderName": "Litoral", "summaryData": {"totalAmountUSD": 900000.0, "budgetItems": [
+            {"category": "MANO DE OBRA", "amountUSD": 300000.0}, {"category": "Materiales de construccion", "amountUSD": 600000.0}
+        ]}},
+        {"bidderName": "Sin datos", "summaryData": extract_bid_summary("")},
+    ])
+
+    assert comparison["categories"] == ["Total", "Materiales de construcción", "Mano de obra", "Equipos"]
+    assert [proposal["valuesUSD"] for proposal in comparison["proposals"]] == [
+        [1265000.0, 600000.0, 350000.0, 150000.0],
+        [900000.0, 600000.0, 300000.0, None],
+        [None, None, None, None],
+    ]
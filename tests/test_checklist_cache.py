@@ -0,0 +1,58 @@
+"""
+Tests for the per-tender master checklist cache
+"""
+import asyncio
+
+from app.core import constants
+from app.agents.tenderAnalyzer import checklistCache
+from app.agents.tenderAnalyzer.pipelineNodes import createMasterChecklistNode
+
+CHECKLIST = {
+    "financialRequirements": [{"name": "Patrimonio Mínimo", "details": ">= $80,187.24"}],
+    "technicalRequirements": [],
+    "legalRequirements": []
+}
+
+
+def test_cache_hit_requires_same_tender_text(tmp_path, monkeypatch):
+    """A cached checklist is only reused for the exact text it was built from"""
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    key = checklistCache.checklist_cache_key("Pliego v1")
+    checklistCache.save_cached_checklist("7", key, CHECKLIST)
+
+    assert checklistCache.load_cached_checklist("7", key) == CHECKLIST
+    assert checklistCache.load_cached_checklist("7", checklistCache.checklist_cache_key("Pliego v2")) is None
+    assert checklistCache.load_checklist_entry("7")["promptVersion"] == checklistCache.MASTER_CHECKLIST_PROMPT_VERSION
+
+
+def test_node_reuses_cached_checklist_without_llm(tmp_path, monkeypatch):
+    """Re-analysis of an unchanged tender skips the checklist LLM call"""
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+    checklistCache.save_cached_checklist("7", checklistCache.checklist_cache_key("Pliego v1"), CHECKLIST)
+
+    async def fail_if_called(*args, **kwargs):
+        raise AssertionError("LLM must not be called on a cache hit")
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.pipelineNodes.generate_master_checklist", fail_if_called)
+
+    result = asyncio.run(createMasterChecklistNode({"tenderId": "7", "tenderText": "Pliego v1"}))
+
+    assert result == {"masterChecklist": CHECKLIST}
+
+
+def test_incomplete_checklist_is_used_but_not_cached(tmp_path, monkeypatch):
+    """A checklist missing failed sections is not reused by later analyses; the section size is part of the key"""
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+
+    async def partial_checklist(*args, **kwargs):
+        return CHECKLIST, [2]
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.pipelineNodes.generate_master_checklist", partial_checklist)
+
+    result = asyncio.run(createMasterChecklistNode({"tenderId": "7", "tenderText": "Pliego v1"}))
+
+    assert result == {"masterChecklist": CHECKLIST}
+    assert checklistCache.load_checklist_entry("7") is None
+    assert checklistCache.checklist_cache_key("Pliego v1", 30000) != checklistCache.checklist_cache_key("Pliego v1", 60000)
@@ -0,0 +1,60 @@
+"""
+Tests for near-duplicate requirement consolidation in the master checklist
+"""
+from app.agents.tenderAnalyzer.checklistConsolidation import consolidate_checklist
+
+
+def _checklist():
+    return {
+        "financialRequirements": [
+            {"name": "Patrimonio mínimo", "details": ">= $80,187.24"},
+            {"name": "Índice de solvencia", "details": ">= 1.0"}
+        ],
+        "technicalRequirements": [
+            {"name": "Experiencia específica", "details": "3 contratos similares"},
+            {"name": "Experiencia especifica", "details": "5 contratos similares"},
+            {"name": "Plazo de entrega", "details": "180 días calendario"}
+        ],
+        "legalRequirements": [
+            {"name": "Patrimonio requerido", "details": "Patrimonio mayor o igual a $80.187,24"},
+            {"name": "Garantía de fiel cumplimiento", "details": "5% del monto del contrato"},
+            {"name": "Garantia fiel cumplimiento", "details": "5 % del monto del contrato"},
+            {"name": "Plazo de ejecución", "details": "180 días"}
+        ]
+    }
+
+
+def test_same_figure_merges_across_lists():
+    """The same amount written with different separators is one requirement, kept in the first list"""
+    consolidated, summary = consolidate_checklist(_checklist(), 0.6)
+
+    patrimonio = [r for r in consolidated["financialRequirements"] if r["name"] == "Patrimonio mínimo"]
+    assert len(patrimonio) == 1
+    assert "$80.187,24" in patrimonio[0]["details"]
+    assert all(r["name"] != "Patrimonio requerido" for r in consolidated["legalRequirements"])
+    assert {"keptName": "Patrimonio mínimo", "list": "financialRequirements", "mergedNames": ["Patrimonio requerido"]} in summary["mergedGroups"]
+
+
+def test_spelling_variants_merge():
+    """Accent and wording variants of the same requirement are merged"""
+    consolidated, summary = consolidate_checklist(_checklist(), 0.6)
+
+    names = [r["name"] for r in consolidated["legalRequirements"]]
+    assert names.count("Garantía de fiel cumplimiento") == 1
+    assert "Garantia fiel cumplimiento" not in names
+    assert (summary["before"], summary["after"]) == (9, 7)
+
+
+def test_different_figures_are_kept_apart():
+    """Requirements that differ only in a number are distinct"""
+    consolidated, _ = consolidate_checklist(_checklist(), 0.6)
+
+    experience = [r["details"] for r in consolidated["technicalRequirements"] if r["name"].startswith("Experiencia")]
+    assert experience == ["3 contratos similares", "5 contratos similares"]
+    assert any(r["name"] == "Plazo de ejecución" for r in consolidated["legalRequirements"])
+
+
+def test_threshold_one_disables_consolidation():
+    consolidated, summary = consolidate_checklist(_checklist(), 1.0)
+    assert consolidated == _checklist()
+    assert summary["mergedGroups"] == []
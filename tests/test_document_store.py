@@ -0,0 +1,69 @@
+"""
+Tests for the reference-based document store used by the audit graph
+"""
+import asyncio
+
+from app.agents.services.documentStore import DocumentStore, documentStore, proposal_document_refs
+from app.agents.tenderAnalyzer.specialistNodes import projectManagerRouterNode
+from app.core.constants import PAGE_SEPARATOR
+
+
+def test_documents_load_lazily_once_and_reload_after_unload():
+    """A registered document is only loaded when read, and again after it is unloaded"""
+    store = DocumentStore()
+    calls = []
+    handle = store.register("tender_1/A/ACME/Anexo_1.pdf", lambda: calls.append(1) or "texto del anexo")
+
+    assert calls == []
+    assert store.get(handle) == store.get(handle) == "texto del anexo"
+    assert len(calls) == 1
+
+    store.unload([handle])
+    assert store.stats()["residentChars"] == 0
+    assert asyncio.run(store.aget(handle)) == "texto del anexo"
+    assert len(calls) == 2
+
+
+def test_interned_selections_are_kept_once_and_released_with_their_namespace():
+    store = DocumentStore()
+    first = store.intern("tender_1/A/ACME", "[Main form, p. 1]\nPatrimonio")
+    second = store.intern("tender_1/A/ACME", "[Main form, p. 1]\nPatrimonio")
+    other = store.put("tender_10/B/Beta/mainForm", "form")
+
+    assert first == second
+    assert store.stats()["residentDocuments"] == 2
+
+    store.release("tender_1/")
+    assert store.stats()["handles"] == 1
+    assert store.get(other) == "form"
+
+
+def test_router_tasks_carry_handles_instead_of_texts():
+    """Tasks reference shared passage selections; the texts live once in the store"""
+    annex_text = PAGE_SEPARATOR.join(
+        ["Portada del anexo."] * 8 + ["Patrimonio neto de la compañía: $80.187,24 según balance."]
+    )
+    proposal = {
+        "contractorId": "T1", "companyName": "Handles SA", "ruc": None,
+        "mainFormText": "Formulario de oferta. Patrimonio mínimo y patrimonio neto: ver Anexo_1.pdf",
+        "annexIndexText": "Anexo_1.pdf",
+        "attachments": {"Anexo_1.pdf": annex_text}
+    }
+    checklist = {
+        "financialRequirements": [
+            {"name": "Patrimonio mínimo", "details": "$80,187.24"},
+            {"name": "Patrimonio neto", "details": "Balance general"}
+        ],
+        "technicalRequirements": [],
+        "legalRequirements": []
+    }
+
+    result = asyncio.run(projectManagerRouterNode({"tenderId": "handles", "proposal": proposal, "masterChecklist": checklist}))
+    tasks = result["financialTasks"]
+
+    assert len(tasks) == 2
+    assert all(len(task.evidenceRef) < 100 and len(task.mainFormRef) < 100 for task in tasks)
+    assert "$80.187,24" in documentStore.get(tasks[0].evidenceRef)
+    assert tasks[0].mainFormRef == tasks[1].mainFormRef
+    assert proposal_document_refs("handles", proposal)[2]["Anexo_1.pdf"].endswith("Anexo_1.pdf")
+    documentStore.release("tender_handles/")
@@ -0,0 +1,84 @@
+"""
+Tests for multi-endpoint LLM routing and failover
+"""
+import asyncio
+import httpx
+import openai
+import pytest
+
+from app.agents.services.endpointPool import EndpointPool, LLMEndpoint
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    error_class = openai.RateLimitError if status_code == 429 else openai.InternalServerError if status_code >= 500 else openai.BadRequestError
+    return error_class(f"status {status_code}", response=response, body=None)
+
+
+def test_fails_over_to_next_endpoint_on_rate_limit():
+    """A 429 cools the endpoint down and the call is retried elsewhere"""
+    pool = EndpointPool([LLMEndpoint(name="a", apiKey="k", weight=2), LLMEndpoint(name="b", apiKey="k")])
+
+    async def call(endpoint):
+        if endpoint.name == "a":
+            raise _status_error(429)
+        return "ok"
+
+    result, endpoint_name, _ = asyncio.run(pool.execute(call))
+
+    assert (result, endpoint_name) == ("ok", "b")
+    health = {item["name"]: item for item in pool.get_health()}
+    assert health["a"]["healthy"] is False
+    assert health["a"]["rateLimited"] == 1
+    assert health["b"]["healthy"] is True
+
+
+def test_non_retryable_errors_are_raised_without_failover():
+    """Client errors (4xx other than 429) are not retried on other endpoints"""
+    pool = EndpointPool([LLMEndpoint(name="a", apiKey="k"), LLMEndpoint(name="b", apiKey="k")])
+    calls = []
+
+    async def call(endpoint):
+        calls.append(endpoint.name)
+        raise _status_error(400)
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(pool.execute(call))
+    assert len(calls) == 1
+
+
+def test_raises_last_error_when_every_endpoint_fails():
+    """With all endpoints failing the last retryable error surfaces"""
+    pool = EndpointPool([LLMEndpoint(name="a", apiKey="k"), LLMEndpoint(name="b", apiKey="k")])
+
+    async def call(endpoint):
+        raise _status_error(503)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(pool.execute(call))
+
+
+def test_least_outstanding_routing_respects_weights_and_limits():
+    """Concurrent load spreads over endpoints in proportion to weight, within limits"""
+    pool = EndpointPool([
+        LLMEndpoint(name="big", apiKey="k", weight=3, maxConcurrency=3),
+        LLMEndpoint(name="small", apiKey="k", weight=1, maxConcurrency=1),
+    ])
+    in_flight = {"big": 0, "small": 0}
+    peak = {"big": 0, "small": 0}
+
+    async def call(endpoint):
+        in_flight[endpoint.name] += 1
+        peak[endpoint.name] = max(peak[endpoint.name], in_flight[endpoint.name])
+        await asyncio.sleep(0.01)
+        in_flight[endpoint.name] -= 1
+        return endpoint.name
+
+    async def run_all():
+        return await asyncio.gather(*(pool.execute(call) for _ in range(16)))
+
+    served_by = [endpoint_name for _, endpoint_name, _ in asyncio.run(run_all())]
+
+    assert peak == {"big": 3, "small": 1}
+    assert served_by.count("big") > served_by.count("small") > 0
@@ -0,0 +1,96 @@
+"""
+Tests for the per-analysis LLM budget governor and graceful degradation
+"""
+import asyncio
+
+import pytest
+
+from app.agents.services import llmService
+from app.agents.services.documentStore import documentStore
+from app.agents.services.llmBudget import BudgetExceededError, LLMBudget, LLMBudgetGovernor
+from app.agents.services.llmTelemetry import LLMTelemetry
+from app.agents.tenderAnalyzer.auditPool import run_audit_pool
+from app.agents.tenderAnalyzer.schemas.masterChecklist import Requirement
+from app.agents.tenderAnalyzer.schemas.specialistTasks import SpecialistTask
+from app.agents.tenderAnalyzer.specialistNodes import run_specialist_task
+
+USAGE = {"promptTokens": 900, "cachedPromptTokens": 0, "completionTokens": 100}
+
+
+def test_budget_degrades_then_refuses_calls():
+    """Past degradeAt the analysis is degraded; once used up, further calls are refused"""
+    telemetry = LLMTelemetry()
+    governor = LLMBudgetGovernor(telemetry)
+    governor.start("1", LLMBudget(maxCalls=5, maxTokens=10000, degradeAt=0.8))
+
+    for _ in range(4):
+        governor.acquire("1")
+        telemetry.record_call("1", "ACME", "legal_auditor", "LegalFinding", "gpt-4o-mini", 0, 100, USAGE)
+        governor.release("1")
+    assert governor.level("1") == "degraded"
+    assert governor.headroom("1") == {"calls": 1, "tokens": 6000}
+
+    governor.acquire("1")
+    with pytest.raises(BudgetExceededError):
+        governor.acquire("1")
+
+    usage = governor.usage("1")
+    assert (usage["level"], usage["calls"], usage["refusedCalls"], usage["usedFraction"]) == ("exhausted", 4, 1, 1.0)
+    assert governor.usage("2") is None and governor.level("2") == "normal"
+
+
+def test_refused_specialist_call_becomes_a_not_evaluated_finding():
+    """An exhausted budget yields a 'not evaluated (budget)' finding instead of a CRITICAL error"""
+    llmService.reset_usage("spent")
+    llmService.budget.start("spent", LLMBudget(maxCalls=1))
+    llmService.budget.acquire("spent")
+    task = SpecialistTask(
+        requirementToVerify=Requirement(name="Experiencia", details="3 contratos"),
+        evidenceRef=documentStore.put("tender_spent/A/Anexo_1.pdf", "Tres contratos."),
+        mainFormRef=documentStore.put("tender_spent/A/mainForm", "Experiencia: ver Anexo_1.pdf"),
+        annexKey="Anexo_1.pdf"
+    )
+
+    try:
+        finding = asyncio.run(run_specialist_task("Technical", task, tender_id="spent", use_rules=False))
+    finally:
+        llmService.budget.clear("spent")
+        documentStore.release("tender_spent/")
+
+    assert (finding["notEvaluated"], finding["notEvaluatedReason"], finding["severity"]) == (True, "budget", "WARNING")
+
+
+def test_pool_batches_proposals_that_would_not_fit_in_the_budget(monkeypatch):
+    """Per-requirement calls that exceed the calls left are grouped into one call per annex"""
+    batch_sizes = []
+
+    async def fake_batch(batch, tender_id=None, proposal_name=None, **options):
+        batch_sizes.append(len(batch))
+        return [{"requirementName": task.requirementToVerify.name, "severity": "OK", "agentSource": source} for source, task in batch]
+
+    monkeypatch.setattr("app.agents.tenderAnalyzer.auditPool.run_annex_batch", fake_batch)
+    checklist = {
+        "financialRequirements": [{"name": "Patrimonio", "details": "d"}, {"name": "Solvencia", "details": "d"}],
+        "technicalRequirements": [{"name": "Experiencia", "details": "d"}],
+        "legalRequirements": []
+    }
+    proposal = {
+        "contractorId": "A", "companyName": "Ahorro", "ruc": None, "annexIndexText": "",
+        "mainFormText": "Patrimonio: ver Anexo_1.pdf\nSolvencia: ver Anexo_1.pdf\nExperiencia: ver Anexo_2.pdf",
+        "attachments": {"Anexo_1.pdf": "Patrimonio y solvencia.", "Anexo_2.pdf": "Experiencia."}
+    }
+    llmService.reset_usage("frugal")
+    llmService.budget.start("frugal", LLMBudget(maxCalls=2, degradeAt=1))
+
+    try:
+        reports = asyncio.run(run_audit_pool(
+            [{"tenderId": "frugal", "findings": [], "proposal": proposal}],
+            worker_count=2, master_checklist=checklist, evaluation_mode="per_requirement"
+        ))
+        degradations = llmService.budget.usage("frugal")["degradations"]
+    finally:
+        llmService.budget.clear("frugal")
+
+    assert sorted(batch_sizes) == [1, 2]
+    assert degradations == ["batchedEvaluation"]
+    assert reports[0]["finalAnalysis"]["findingsSummary"]["ok"] == 3
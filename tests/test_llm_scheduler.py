@@ -0,0 +1,59 @@
+"""
+Tests for the priority-aware, fair-share LLM scheduler
+"""
+import asyncio
+
+from app.agents.services.llmScheduler import LLMScheduler, PRIORITY_CRITICAL, PRIORITY_BULK
+
+
+async def _run_in_order(scheduler, calls, hold_sec=0.01):
+    """Starts every (priority, tender) call at once and returns the order they got a slot."""
+    started = []
+
+    async def call(label, priority, tender_id):
+        async with scheduler.slot(priority, tender_id):
+            started.append(label)
+            await asyncio.sleep(hold_sec)
+
+    await asyncio.gather(*(call(label, priority, tender_id) for label, priority, tender_id in calls))
+    return started
+
+
+def test_critical_calls_overtake_queued_bulk_calls():
+    """Once a slot frees up, a waiting critical call goes before earlier bulk calls"""
+    scheduler = LLMScheduler(capacity=1, reserved_critical=0)
+    calls = [(f"bulk-{i}", PRIORITY_BULK, "t1") for i in range(3)] + [("critical", PRIORITY_CRITICAL, "t1")]
+    started = asyncio.run(_run_in_order(scheduler, calls))
+    assert started[:2] == ["bulk-0", "critical"]
+
+
+def test_slots_are_shared_fairly_across_tenders():
+    """A tender with a long queue does not starve a tender that arrives later"""
+    scheduler = LLMScheduler(capacity=1, reserved_critical=0)
+    calls = [(f"a-{i}", PRIORITY_BULK, "a") for i in range(4)] + [(f"b-{i}", PRIORITY_BULK, "b") for i in range(2)]
+    started = asyncio.run(_run_in_order(scheduler, calls))
+    assert started == ["a-0", "b-0", "a-1", "b-1", "a-2", "a-3"]
+
+
+def test_reserved_slot_lets_critical_start_while_bulk_saturates():
+    """Bulk work can never take the reserved slots, so critical calls start immediately"""
+    async def scenario():
+        scheduler = LLMScheduler(capacity=2, reserved_critical=1)
+        release = asyncio.Event()
+
+        async def bulk():
+            async with scheduler.slot(PRIORITY_BULK, "t1"):
+                await release.wait()
+
+        bulk_tasks = [asyncio.create_task(bulk()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["inFlight"] == 1
+
+        async with scheduler.slot(PRIORITY_CRITICAL, "t2"):
+            assert scheduler.get_stats()["inFlight"] == 2
+
+        release.set()
+        await asyncio.gather(*bulk_tasks)
+        assert scheduler.get_stats()["inFlight"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+"""
+Tests for the local OpenAI-compatible LLM stand-in
+"""
+import asyncio
+import json
+import random
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from app.agents.services.llmService import LLMService
+from app.agents.services.llmStandIn import (
+    StandInConfig,
+    build_synthetic_payload,
+    create_stand_in_app,
+    create_stand_in_client,
+    request_key,
+)
+from app.agents.tenderAnalyzer.schemas.masterChecklist import MasterChecklist
+from app.agents.tenderAnalyzer.schemas.routerSchemas import AnnexMapOutput
+from app.agents.tenderAnalyzer.schemas.specialistFindings import FinancialFinding, TechnicalFinding, LegalFinding, AnnexFindingsBatch
+from app.agents.tenderAnalyzer.schemas.aggregatorSchemas import ExecutiveSummary
+
+
+@pytest.mark.parametrize("schema", [
+    MasterChecklist, AnnexMapOutput, FinancialFinding, TechnicalFinding, LegalFinding, ExecutiveSummary, AnnexFindingsBatch
+])
+def test_synthetic_payload_validates_against_schema(schema):
+    """Synthetic answers must validate against every pipeline schema"""
+    payload = build_synthetic_payload(schema.__name__, schema.model_json_schema(), "prompt", random.Random(0))
+    schema.model_validate(payload)
+
+
+def test_annex_map_uses_requirements_and_annexes_from_prompt():
+    """The annex map answer maps the listed requirements onto the listed annexes"""
+    prompt = "Requirements List: ['Patrimonio', 'Experiencia']\n---\nAvailable Annexes in Proposal: ['Anexo_1.pdf']\n"
+    payload = build_synthetic_payload("AnnexMapOutput", AnnexMapOutput.model_json_schema(), prompt, random.Random(0))
+    assert [item["requirementName"] for item in payload["annexMap"]] == ["Patrimonio", "Experiencia"]
+    assert {item["annexFilename"] for item in payload["annexMap"]} == {"Anexo_1.pdf"}
+
+
+def test_llm_service_runs_against_in_process_stand_in():
+    """LLMService can target the stand-in without a real key"""
+    service = LLMService()
+    app = create_stand_in_app(StandInConfig())
+    service.configure_endpoint(base_url="http://llm-stand-in/v1", api_key="stand-in", http_async_client=create_stand_in_client(app))
+
+    result = asyncio.run(service.invoke_json(
+        [SystemMessage(content="Extract"), HumanMessage(content="Pliego")],
+        output_schema=MasterChecklist, tender_id="offline", node_name="createMasterChecklist"
+    ))
+
+    MasterChecklist.model_validate(result)
+    assert service.get_usage_summary("offline")["calls"] == 1
+
+
+def test_error_injection_returns_requested_status():
+    """With errorRate=1 every request fails with one of the configured statuses"""
+    client = TestClient(create_stand_in_app(StandInConfig(errorRate=1.0, errorStatusCodes=[429])))
+    response = client.post("/v1/chat/completions", json={"model": "gpt-4o-mini", "messages": []})
+    assert response.status_code == 429
+    assert response.json()["error"]["type"] == "rate_limit_error"
+
+
+def test_replay_serves_recorded_response(tmp_path):
+    """Replay mode answers from the transcript, keyed by the request hash"""
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hola"}]}
+    recorded_response = {"id": "chatcmpl-recorded", "object": "chat.completion", "choices": [], "usage": {}}
+    transcript = tmp_path / "transcript.jsonl"
+    transcript.write_text(json.dumps({"key": request_key(body), "request": body, "response": recorded_response}) + "\n")
+
+    client = TestClient(create_stand_in_app(StandInConfig(mode="replay", transcriptPath=str(transcript), replayFallback="error")))
+
+    assert client.post("/v1/chat/completions", json=body).json()["id"] == "chatcmpl-recorded"
+    other_body = {**body, "messages": [{"role": "user", "content": "otro"}]}
+    assert client.post("/v1/chat/completions", json=other_body).status_code == 404
+
+
+def test_prompt_cache_simulation_reports_shared_prefix():
+    """A repeated long prefix is reported as cached tokens on the second call"""
+    client = TestClient(create_stand_in_app(StandInConfig()))
+    shared_prefix = "x" * 6000
+    first = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": shared_prefix + "A"}]}
+    second = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": shared_prefix + "B"}]}
+
+    assert client.post("/v1/chat/completions", json=first).json()["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+    assert client.post("/v1/chat/completions", json=second).json()["usage"]["prompt_tokens_details"]["cached_tokens"] >= 1024
@@ -0,0 +1,111 @@
+"""
+Tests for per-call LLM telemetry and the cost/latency breakdown
+"""
+import asyncio
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.agents.services.endpointPool import LLMEndpoint
+from app.agents.services.llmService import LLMService
+from app.agents.services.llmTelemetry import LLMTelemetry, estimate_cost_usd
+
+
+def test_estimate_cost_prices_cached_tokens_lower():
+    """Cached prompt tokens should be billed at the cached-input rate"""
+    uncached = estimate_cost_usd("gpt-4o-mini", 1_000_000, 0, 0)
+    cached = estimate_cost_usd("gpt-4o-mini", 1_000_000, 1_000_000, 0)
+    assert uncached == 0.15
+    assert cached == 0.075
+    assert estimate_cost_usd("unknown-model", 1000, 0, 1000) == 0.0
+
+
+def test_breakdown_groups_by_node_proposal_and_schema():
+    """Records are aggregated per tender and grouped by their tags"""
+    telemetry = LLMTelemetry()
+    usage = {"promptTokens": 1000, "cachedPromptTokens": 500, "completionTokens": 100}
+    telemetry.record_call("1", "ACME", "financial_auditor", "FinancialFinding", "gpt-4o-mini", 5, 100, usage)
+    telemetry.record_call("1", "ACME", "legal_auditor", "LegalFinding", "gpt-4o-mini", 0, 300, usage)
+    telemetry.record_call("1", None, "createMasterChecklist", "MasterChecklist", "gpt-4o-mini", 0, 200, usage, error="boom")
+    telemetry.record_call("2", "OTHER", "router", "AnnexMapOutput", "gpt-4o-mini", 0, 50, usage)
+
+    breakdown = telemetry.get_breakdown("1")
+
+    assert breakdown["totals"]["calls"] == 3
+    assert breakdown["totals"]["errors"] == 1
+    assert breakdown["totals"]["promptTokens"] == 3000
+    assert breakdown["totals"]["cacheHitRatio"] == 0.5
+    assert breakdown["byProposal"]["ACME"]["calls"] == 2
+    assert breakdown["byProposal"]["(tender)"]["calls"] == 1
+    assert set(breakdown["byNode"]) == {"financial_auditor", "legal_auditor", "createMasterChecklist"}
+    assert breakdown["latencyMs"]["max"] == 300
+
+
+def test_running_totals_match_the_records_and_reset_with_them():
+    """get_totals reads running totals that agree with re-adding the records"""
+    telemetry = LLMTelemetry()
+    usage = {"promptTokens": 1000, "cachedPromptTokens": 250, "completionTokens": 100}
+    for wall_time in (100, 200, 300):
+        telemetry.record_call("1", "ACME", "financial_auditor", "FinancialFinding", "gpt-4o-mini", 1, wall_time, usage)
+
+    totals = telemetry.get_totals("1")
+
+    assert totals == telemetry.get_breakdown("1")["totals"]
+    assert totals["calls"] == 3 and totals["wallTimeMs"] == 600
+    totals["calls"] = 99  # callers get a copy
+    assert telemetry.get_totals("1")["calls"] == 3
+    telemetry.reset("1")
+    assert telemetry.get_totals("1")["calls"] == 0
+
+
+def test_service_records_tagged_call():
+    """LLMService records usage and tags for every tracked call"""
+    service = LLMService(endpoints=[LLMEndpoint(name="test", apiKey="sk-test", maxConcurrency=1)])
+    fake_raw = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 2000, "output_tokens": 40, "total_tokens": 2040,
+            "input_token_details": {"cache_read": 1024}
+        }
+    )
+    runner = RunnableLambda(lambda messages: {"raw": fake_raw, "parsed": None, "parsing_error": None})
+
+    asyncio.run(service._tracked_ainvoke(
+        lambda llm_runner: runner, [], raw_getter=lambda r: r.get("raw"), schema_name="TechnicalFinding",
+        model_name="gpt-4o-mini", temperature=0.0, tender_id="9", proposal_name="ACME", node_name="technical_auditor"
+    ))
+
+    records = service.telemetry.get_records("9")
+    assert len(records) == 1
+    assert records[0]["node"] == "technical_auditor"
+    assert records[0]["endpoint"] == "test"
+    assert records[0]["cachedPromptTokens"] == 1024
+    assert records[0]["estimatedCostUSD"] > 0
+    assert service.get_usage_summary("9")["completionTokens"] == 40
+
+
+def test_finished_analysis_persists_its_usage_and_drops_the_records(tmp_path, monkeypatch):
+    """Per-call records do not outlive their analysis; the usage report is then read from disk"""
+    from app.agents.services import llmService
+    from app.api.services import analysis_service
+    from app.core import constants
+
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+    monkeypatch.setenv("CURRENT_TENDER_ID", "11")  # restored after the run sets it
+    (tmp_path / "tender_11").mkdir()
+
+    class FailingGraph:
+        async def ainvoke(self, input_data):
+            usage = {"promptTokens": 100, "cachedPromptTokens": 0, "completionTokens": 10}
+            llmService.telemetry.record_call("11", None, "createMasterChecklist", "MasterChecklist", "gpt-4o-mini", 0, 50, usage)
+            raise RuntimeError("graph failed")
+
+    monkeypatch.setattr(analysis_service, "agentGraph", FailingGraph())
+    asyncio.run(analysis_service.run_analysis_and_notify("11", {}))
+
+    assert not llmService.telemetry.has_records("11")
+    assert analysis_service.get_llm_usage_report("11")["totals"]["calls"] == 1
+
+    # Runs for unknown tenders leave nothing behind.
+    asyncio.run(analysis_service.run_analysis_and_notify("12", {}))
+    assert not (tmp_path / "tender_12").exists()
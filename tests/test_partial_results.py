@@ -0,0 +1,64 @@
+"""
+Tests for streaming partial analysis results to the progress channel
+"""
+import json
+
+from app.api.services import sse_service
+from app.core import constants
+
+
+def test_partial_results_are_persisted_and_summarized(tmp_path, monkeypatch):
+    """Findings and proposal reports are appended as they arrive and can be polled incrementally"""
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+
+    finding = {"agentSource": "Financial", "requirementName": "Patrimonio", "severity": "OK"}
+    sse_service.emit_partial_result("9", "findings", {"bidderName": "ACME", "findings": [finding]})
+    first = sse_service.get_partial_results("9")
+
+    sse_service.emit_partial_result("9", "proposalReport", {
+        "bidderName": "ACME",
+        "finalAnalysis": {"bidderName": "ACME", "scores": {"viabilityTotal": 90}, "findingsSummary": {"total": 1}}
+    })
+    second = sse_service.get_partial_results("9", since=first["nextSince"])
+
+    assert first["findings"] == [{"bidderName": "ACME", **finding}]
+    assert second["findings"] == [] and second["proposalReports"][0]["scores"] == {"viabilityTotal": 90}
+    assert second["nextSince"] == 2
+
+    with open(constants.SSE_DATA_FILE, "r", encoding="utf-8") as f:
+        partial = json.load(f)["partialResults"]
+    assert partial["findingsStreamed"] == 1
+    assert partial["completedProposals"] == [{"bidderName": "ACME", "scores": {"viabilityTotal": 90}, "findingsSummary": {"total": 1}}]
+
+    sse_service.reset_partial_results("9")
+    assert sse_service.get_partial_results("9") is None
+
+
+def test_findings_rewrites_are_throttled_and_polls_validate_since(tmp_path, monkeypatch):
+    """Streamed findings rewrite the SSE state at most once per interval; a negative since is rejected"""
+    from fastapi.testclient import TestClient
+    from app.api.main import app
+
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+    saves = []
+    real_save = sse_service.save_sse_data
+    monkeypatch.setattr(sse_service, "save_sse_data", lambda data: saves.append(1) or real_save(data))
+
+    finding = {"agentSource": "Legal", "requirementName": "Poder", "severity": "WARNING"}
+    for _ in range(50):
+        sse_service.emit_partial_result("10", "findings", {"bidderName": "ACME", "findings": [finding]})
+    assert len(saves) == 1
+    assert sse_service.get_partial_results("10", since=48)["nextSince"] == 50
+    assert len(sse_service.get_partial_results("10", since=48)["findings"]) == 2
+
+    sse_service.emit_partial_result("10", "proposalReport", {"bidderName": "ACME", "finalAnalysis": {"bidderName": "ACME"}})
+    with open(constants.SSE_DATA_FILE, "r", encoding="utf-8") as f:
+        assert json.load(f)["partialResults"]["findingsStreamed"] == 50
+    assert sse_service.get_partial_results("10", since=50)["proposalReports"] == [{"bidderName": "ACME"}]
+
+    client = TestClient(app)
+    assert client.get("/tenders/10/partial-results", params={"since": -1}).status_code == 422
+    assert client.get("/tenders/10/partial-results", params={"since": 51}).json()["nextSince"] == 51
+    sse_service.reset_partial_results("10")
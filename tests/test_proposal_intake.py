@@ -0,0 +1,117 @@
+"""
+Tests for the proposal intake that overlaps with master checklist generation
+"""
+import asyncio
+import time
+
+from app.agents.services.documentStore import documentStore, document_handle, proposal_namespace
+from app.agents.tenderAnalyzer import proposalIntake
+from app.agents.tenderAnalyzer.proposalIntake import cancel_proposal_intake, start_proposal_intake
+from app.agents.tenderAnalyzer.specialistNodes import projectManagerRouterNode
+
+CHECKLIST = {
+    "financialRequirements": [{"name": "Patrimonio mínimo", "details": "$80,187.24"}],
+    "technicalRequirements": [],
+    "legalRequirements": []
+}
+
+
+def _slow_proposal(tender_id: str, delay: float) -> dict:
+    proposal = {"contractorId": "P1", "companyName": "Intake SA", "ruc": "1790012345001"}
+    namespace = proposal_namespace(tender_id, proposal)
+
+    def loader(text):
+        return lambda: time.sleep(delay) or text
+
+    proposal["mainFormRef"] = documentStore.register(document_handle(namespace, "mainForm"), loader("Patrimonio mínimo: ver Anexo_1.pdf"))
+    proposal["annexIndexRef"] = documentStore.register(document_handle(namespace, "annexIndex"), loader("Anexo_1.pdf"))
+    proposal["attachmentRefs"] = {
+        "Anexo_1.pdf": documentStore.register(document_handle(namespace, "Anexo_1.pdf"), loader("Patrimonio neto: $95.000,00"))
+    }
+    return proposal
+
+
+def test_intake_overlaps_with_checklist_generation(monkeypatch):
+    """Extraction and RUC checks run while the checklist is built, not after it"""
+    async def slow_ruc_check(proposal):
+        await asyncio.sleep(0.3)
+        return [{"agentSource": "Project Manager", "severity": "OK", "requirementName": "Company RUC Validation"}]
+
+    monkeypatch.setattr(proposalIntake, "validate_proposal_ruc", slow_ruc_check)
+    proposal = _slow_proposal("intake", 0.3)
+
+    async def scenario():
+        started_at = time.perf_counter()
+        start_proposal_intake("intake", [proposal])
+        await asyncio.sleep(0.3)  # master checklist generation
+        result = await projectManagerRouterNode({"tenderId": "intake", "proposal": proposal, "masterChecklist": CHECKLIST})
+        return result, time.perf_counter() - started_at
+
+    result, elapsed = asyncio.run(scenario())
+
+    assert elapsed < 0.55
+    assert result["findings"][0]["requirementName"] == "Company RUC Validation"
+    assert len(result["financialTasks"]) == 1
+    documentStore.release("tender_intake/")
+
+
+def test_unconsumed_intake_is_cancelled():
+    proposal = _slow_proposal("cancelled", 5)
+
+    async def scenario():
+        start_proposal_intake("cancelled", [proposal])
+        pending = list(proposalIntake._pending_intakes.values())
+        cancel_proposal_intake("cancelled")
+        await asyncio.sleep(0)
+        return pending
+
+    pending = asyncio.run(scenario())
+
+    assert pending and all(task.cancelled() for task in pending)
+    assert not proposalIntake._pending_intakes
+    documentStore.release("tender_cancelled/")
+
+
+def test_unreadable_documents_become_findings_of_their_proposal_only(monkeypatch):
+    """A corrupt annex is reported as an omission instead of failing the router"""
+    async def ruc_check(proposal):
+        return []
+
+    def corrupt_pdf():
+        raise ValueError("EOF marker not found")
+
+    monkeypatch.setattr(proposalIntake, "validate_proposal_ruc", ruc_check)
+    proposal = _slow_proposal("corrupt", 0)
+    proposal["attachmentRefs"]["Anexo_1.pdf"] = documentStore.register(proposal["attachmentRefs"]["Anexo_1.pdf"], corrupt_pdf)
+
+    result = asyncio.run(projectManagerRouterNode({"tenderId": "corrupt", "proposal": proposal, "masterChecklist": CHECKLIST}))
+
+    unreadable, omission = result["findings"]
+    assert unreadable["requirementName"] == "Readable document: Anexo_1.pdf" and "EOF marker" in unreadable["observation"]
+    assert omission["requirementName"] == "Patrimonio mínimo" and omission["severity"] == "CRITICAL"
+    assert result["financialTasks"] == [] and documentStore.get(proposal["attachmentRefs"]["Anexo_1.pdf"]) == ""
+    documentStore.release("tender_corrupt/")
+
+
+def test_intakes_held_ahead_of_their_router_are_bounded(monkeypatch):
+    """With a concurrency of 1 the next intake only starts once the previous one is consumed"""
+    prepared = []
+
+    async def fake_prepare(tender_id, proposal, build_index=None):
+        prepared.append(proposal["companyName"])
+        return proposal["companyName"]
+
+    monkeypatch.setattr(proposalIntake, "prepare_proposal_intake", fake_prepare)
+    proposals = [{"contractorId": str(i), "companyName": f"Oferente {i}"} for i in range(3)]
+
+    async def scenario():
+        start_proposal_intake("bounded", proposals, concurrency=1)
+        await asyncio.sleep(0.05)
+        ahead = list(prepared)
+        consumed = [await proposalIntake.get_proposal_intake("bounded", proposal) for proposal in proposals]
+        return ahead, consumed
+
+    ahead, consumed = asyncio.run(scenario())
+
+    assert ahead == ["Oferente 0"]
+    assert consumed == prepared == ["Oferente 0", "Oferente 1", "Oferente 2"]
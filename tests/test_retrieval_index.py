@@ -0,0 +1,44 @@
+"""
+Tests for the BM25 evidence retrieval index
+"""
+from app.agents.tenderAnalyzer.retrievalIndex import (
+    ProposalRetrievalIndex,
+    format_passages,
+    merge_passage_texts,
+    split_passages,
+    tokenize,
+)
+from app.core.constants import PAGE_SEPARATOR
+
+
+def test_tokenize_normalizes_spanish_text_and_numbers():
+    """Accents, stopwords, plurals and number formats do not prevent a match"""
+    assert tokenize("Garantías de la Compañía") == ["garantia", "compania"]
+    assert tokenize("$80,187.24") == tokenize("80.187,24") == ["8018724"]
+
+
+def test_split_passages_keeps_page_numbers():
+    """Every passage knows the page it came from"""
+    passages = split_passages("Anexo_1.pdf", PAGE_SEPARATOR.join(["Portada.", "Balance general.", "Firmas."]))
+    assert [(p.page, p.text) for p in passages] == [(1, "Portada."), (2, "Balance general."), (3, "Firmas.")]
+
+
+def test_search_returns_the_page_with_the_evidence():
+    """The requirement's page is retrieved and cited, other documents are never mixed in"""
+    filler = "El oferente declara que la información es veraz. " * 30
+    pages = [filler] * 40
+    pages[36] = filler + "El patrimonio neto asciende a USD 95.320,11 según balance."
+    index = ProposalRetrievalIndex("Formulario: patrimonio ver Anexo_1.pdf", {"Anexo_1.pdf": PAGE_SEPARATOR.join(pages)}, passage_chars=600)
+
+    passages = index.search("Patrimonio Mínimo >= $80,187.24", "Anexo_1.pdf", k=2)
+
+    assert 37 in [p.page for p in passages]
+    assert all(p.source == "Anexo_1.pdf" for p in passages)
+    assert "[Anexo_1.pdf, p. 37]" in format_passages(passages)
+
+
+def test_merge_passage_texts_keeps_each_passage_once():
+    """Evidence of several tasks in one annex batch is merged without repeats"""
+    first = "[Anexo_1.pdf, p. 1]\nA\n\n[Anexo_1.pdf, p. 2]\nB"
+    second = "[Anexo_1.pdf, p. 2]\nB\n\n[Anexo_1.pdf, p. 3]\nC"
+    assert merge_passage_texts([first, second]) == "[Anexo_1.pdf, p. 1]\nA\n\n[Anexo_1.pdf, p. 2]\nB\n\n[Anexo_1.pdf, p. 3]\nC"
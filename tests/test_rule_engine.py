@@ -0,0 +1,91 @@
+"""
+Tests for the deterministic pre-verification rule engine
+"""
+import asyncio
+
+from app.agents.services import llmService
+from app.agents.services.documentStore import documentStore
+from app.agents.tenderAnalyzer.ruleEngine import evaluate_requirement, parse_comparator, parse_number
+from app.agents.tenderAnalyzer.schemas.masterChecklist import Requirement
+from app.agents.tenderAnalyzer.schemas.specialistFindings import FinancialFinding, LegalFinding
+from app.agents.tenderAnalyzer.schemas.specialistTasks import SpecialistTask
+from app.agents.tenderAnalyzer.specialistNodes import run_annex_batch
+
+FORM = """[Main form, p. 1]
+Patrimonio: $95.000,00 (ver Anexo_1.pdf). Índice de endeudamiento: 45% (ver Anexo_1.pdf).
+Declaración de aceptación de condiciones: Sí, acepto."""
+
+ANNEX = """[Anexo_1.pdf, p. 4]
+Total patrimonio neto al 31/12/2024: USD 95,000.00. Índice de endeudamiento calculado: 45 %.
+[Anexo_1.pdf, p. 7]
+Declaración de aceptación de condiciones del pliego. Acepto."""
+
+
+def test_numbers_and_comparators_are_parsed_in_both_locales():
+    assert parse_number("80,187.24") == parse_number("80.187,24") == 80187.24
+    assert parse_number("12,5") == 12.5
+    assert parse_number("1.000.000") == 1000000
+    assert parse_comparator(">= $80,187.24") == ">="
+    assert parse_comparator("No menor a USD 50.000") == ">="
+    assert parse_comparator("Máximo 70%") == "<="
+    assert parse_comparator("Entre mínimo 3 y máximo 5") is None
+
+
+def test_amount_threshold_is_decided_locally_in_the_specialist_schema():
+    finding = evaluate_requirement("Financial", "Patrimonio mínimo", ">= $80,187.24", FORM, ANNEX)
+
+    FinancialFinding.model_validate(finding)
+    assert (finding["severity"], finding["isCompliant"], finding["declaredValue"]) == ("OK", True, "$95,000.00")
+    assert "Anexo_1.pdf, p. 4" in finding["observation"]
+
+    failing = evaluate_requirement("Financial", "Patrimonio mínimo", ">= $120.000,00", FORM, ANNEX)
+    assert (failing["severity"], failing["isCompliant"]) == ("CRITICAL", False)
+
+
+def test_percentage_and_dates_are_compared():
+    assert evaluate_requirement("Financial", "Índice de endeudamiento", "Máximo 70%", FORM, ANNEX)["isCompliant"] is True
+
+    validity = evaluate_requirement(
+        "Legal", "Vigencia de la garantía", "Garantía vigente hasta el 31/12/2025",
+        "Vigencia de la garantía: 15/03/2026.", "Póliza con vigencia de la garantía hasta 15 de marzo de 2026."
+    )
+    LegalFinding.model_validate(validity)
+    assert validity["isCompliant"] is True
+
+
+def test_ambiguous_evidence_is_left_to_the_llm():
+    """Missing annex confirmation, several declared values or other specialists fall back"""
+    assert evaluate_requirement("Financial", "Patrimonio mínimo", ">= $80,187.24", FORM, "Anexo sin cifras.") is None
+    two_values = FORM.replace("Patrimonio: $95.000,00", "Patrimonio: $95.000,00 y patrimonio ajustado $70.000,00")
+    assert evaluate_requirement("Financial", "Patrimonio mínimo", ">= $80,187.24", two_values, ANNEX) is None
+    assert evaluate_requirement("Technical", "Patrimonio mínimo", ">= $80,187.24", FORM, ANNEX) is None
+
+
+def test_declarations_are_read_from_form_and_annex():
+    accepted = evaluate_requirement("Legal", "Declaración de aceptación de condiciones", "Sí/Acepto", FORM, ANNEX)
+    assert accepted["severity"] == "OK"
+
+    refused = evaluate_requirement(
+        "Legal", "Declaración de aceptación de condiciones", "Sí/Acepto",
+        FORM.replace("Sí, acepto", "No acepto"), "Anexo sin firma."
+    )
+    assert (refused["severity"], refused["isCompliant"]) == ("CRITICAL", False)
+
+
+def test_annex_batch_skips_the_llm_when_every_requirement_is_decided():
+    form_ref = documentStore.put("tender_rules/R/Reglas/mainForm", FORM)
+    annex_ref = documentStore.put("tender_rules/R/Reglas/Anexo_1.pdf", ANNEX)
+    batch = [
+        ("Financial", SpecialistTask(requirementToVerify=Requirement(name="Patrimonio mínimo", details=">= $80,187.24"),
+                                     evidenceRef=annex_ref, mainFormRef=form_ref, annexKey="Anexo_1.pdf")),
+        ("Legal", SpecialistTask(requirementToVerify=Requirement(name="Declaración de aceptación de condiciones", details="Sí/Acepto"),
+                                 evidenceRef=annex_ref, mainFormRef=form_ref, annexKey="Anexo_1.pdf")),
+    ]
+    llmService.reset_usage("rules")
+
+    findings = asyncio.run(run_annex_batch(batch, tender_id="rules", proposal_name="Reglas"))
+
+    assert [finding["agentSource"] for finding in findings] == ["Financial", "Legal"]
+    assert llmService.get_usage_summary("rules")["calls"] == 0
+    assert llmService.get_usage_breakdown("rules")["ruleEngine"]["skippedCallFraction"] == 1.0
+    documentStore.release("tender_rules/")
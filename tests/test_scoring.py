@@ -0,0 +1,71 @@
+"""
+Tests for the findings matrix scoring and the rescore endpoint
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from app.agents.tenderAnalyzer.scoring import ScoreMatrix, ScoringPolicy
+from app.agents.tenderAnalyzer.specialistNodes import compileProposalReportNode
+from app.api.main import app
+from app.core import constants
+
+client = TestClient(app)
+
+
+def _finding(source, name, severity, **extra):
+    return {"agentSource": source, "requirementName": name, "severity": severity, **extra}
+
+
+FINDINGS = [
+    _finding("Project Manager", "Company RUC Validation", "CRITICAL"),
+    _finding("Legal", "Garantía", "CRITICAL"),
+    _finding("Legal", "Poder", "WARNING"),
+    _finding("Technical", "Experiencia", "OK"),
+    _finding("Technical", "Personal", "WARNING", notEvaluated=True, notEvaluatedReason="timeout"),
+    _finding("Financial", "Patrimonio", "CRITICAL"),
+]
+
+
+def test_proposal_report_keeps_the_legacy_scores():
+    """Default policy: 15/5/0 points per finding, equal area weights, unscored sources and pending findings ignored"""
+    report = compileProposalReportNode({"proposal": {"companyName": "ACME"}, "findings": FINDINGS})["finalAnalysis"]
+
+    assert report["scores"] == {"legal": 80, "technical": 100, "financial": 85, "viabilityTotal": 88}
+    assert report["findingsSummary"] == {"total": 6, "critical": 3, "warning": 2, "ok": 1, "notEvaluated": 1}
+
+
+def test_policy_overrides_change_scores_and_ranking():
+    matrix = ScoreMatrix.from_analyses([
+        {"bidderName": "ACME", "findings": FINDINGS},
+        {"bidderName": "Beta", "findings": [_finding("Technical", "Experiencia", "WARNING"), _finding("Technical", "Personal", "WARNING")]},
+    ])
+    assert [entry["bidderName"] for entry in matrix.ranking()] == ["Beta", "ACME"]
+
+    policy = ScoringPolicy(areaDeductions={"technical": {"WARNING": 30}}, areaWeights={"technical": 2})
+    assert matrix.scores(policy)[1] == {"legal": 100, "technical": 40, "financial": 100, "viabilityTotal": 70}
+    assert [entry["bidderName"] for entry in matrix.ranking(policy)] == ["ACME", "Beta"]
+
+
+def test_rescore_endpoint_uses_the_persisted_matrix(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, "TENDERS_DIR", tmp_path)
+    monkeypatch.setattr(constants, "SSE_DATA_FILE", tmp_path / "sse_data.json")
+    report = {
+        "state": "Completado",
+        "tenderId": "7",
+        "proposalsAnalysis": [{"bidderName": f"Bidder {i}", "findings": FINDINGS[: i % len(FINDINGS)]} for i in range(300)]
+    }
+    (tmp_path / "sse_data.json").write_text(json.dumps(report), encoding="utf-8")
+
+    response = client.post("/tenders/7/rescore", json={"deductions": {"CRITICAL": 50}})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["policy"]["deductions"]["legal"] == {"OK": 0.0, "WARNING": 5.0, "CRITICAL": 50.0}
+    assert len(body["ranking"]) == 300 and body["ranking"][0]["viabilityTotal"] == 100
+    assert (tmp_path / "tender_7" / "score_matrix.npz").is_file()
+
+    # Later rescores read the matrix, not the report.
+    (tmp_path / "sse_data.json").unlink()
+    assert client.post("/tenders/7/rescore").json()["proposals"][5]["scores"]["viabilityTotal"] == 93
+    assert client.post("/tenders/7/rescore", json={"deductions": {"FATAL": 1}}).status_code == 400
+    assert client.post("/tenders/8/rescore").status_code == 404
@@ -0,0 +1,66 @@
+"""
+Tests for RUC checksum validation, the SRI result cache and bulk pre-validation
+"""
+import asyncio
+
+from app.agents.services.sriClient import SRIClient, ruc_format_error
+from app.agents.services.sriStandIn import SRIStandInConfig, create_sri_stand_in_app, create_sri_stand_in_client
+
+REGISTRY = {
+    "1790016919001": {"razonSocial": "CORPORACION FAVORITA C.A.", "estadoContribuyenteRuc": "ACTIVO", "actividadEconomicaPrincipal": "COMERCIO"},
+    "0990004196001": {"razonSocial": "BANCO GUAYAQUIL S.A.", "estadoContribuyenteRuc": "ACTIVO", "actividadEconomicaPrincipal": "BANCA"},
+}
+
+
+def _client(app, tmp_path) -> SRIClient:
+    client = SRIClient(base_url="http://sri-stand-in", max_concurrency=2)
+    client.configure(http_async_client=create_sri_stand_in_client(app), cache_path=tmp_path / "sri_cache.json")
+    return client
+
+
+def test_malformed_rucs_are_rejected_locally():
+    """Natural person (modulo 10), public entity and private company (modulo 11) check digits"""
+    assert ruc_format_error("1710034065001") is None
+    assert ruc_format_error("1760013210001") is None
+    assert ruc_format_error("1790016919001") is None
+    assert ruc_format_error("1790016918001") == "the check digit does not match"
+    assert ruc_format_error("9990016919001") == "invalid province code 99"
+    assert ruc_format_error("1770016919001") == "invalid taxpayer type digit 7"
+    assert ruc_format_error("1790016919000") == "the establishment number cannot be zero"
+    assert ruc_format_error("17900169190") == "a RUC has exactly 13 digits"
+
+
+def test_bulk_validation_deduplicates_and_caches_across_runs(tmp_path):
+    """Each well-formed RUC reaches the SRI once; a new client reuses the persisted answers"""
+    app = create_sri_stand_in_app(SRIStandInConfig(registry=REGISTRY, latencyMs=20))
+    client = _client(app, tmp_path)
+
+    results = asyncio.run(client.validate_many(
+        ["1790016919001", "0990004196001", "1790016919001", "1790016918001", "1760013210001", None]
+    ))
+
+    assert results["1790016919001"]["bidderName"] == "CORPORACION FAVORITA C.A."
+    assert results["1790016918001"]["error"].startswith("Malformed RUC")
+    assert results["1760013210001"] == {"error": "No data returned from SRI for this RUC."}
+    assert app.state.stats["requests"] == 3
+    assert client.get_stats()["checksumRejections"] == 1
+
+    second_run = _client(app, tmp_path)
+    assert asyncio.run(second_run.validate("0990004196001"))["status"] == "ACTIVO"
+    assert app.state.stats["requests"] == 3 and second_run.get_stats()["cacheHits"] == 1
+
+
+def test_concurrent_lookups_share_one_request_and_errors_are_not_cached(tmp_path):
+    """Simultaneous lookups of one RUC make a single request; a failed lookup is retried next time"""
+    app = create_sri_stand_in_app(SRIStandInConfig(registry=REGISTRY, latencyMs=20, failingRucs=["0990004196001"]))
+    client = _client(app, tmp_path)
+
+    async def scenario():
+        same = await asyncio.gather(client.validate("1790016919001"), client.validate("1790016919001"))
+        failed = await client.validate("0990004196001")
+        return same, failed, await client.validate("0990004196001")
+
+    same, failed, retried = asyncio.run(scenario())
+
+    assert same[0] == same[1] and app.state.stats["requests"] == 3
+    assert failed == retried == {"error": "Failed to validate RUC. API returned status: 503"}
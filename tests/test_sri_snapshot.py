@@ -0,0 +1,53 @@
+"""
+Tests for the offline SRI catastro snapshot and the snapshot lookup mode
+"""
+import asyncio
+
+from app.agents.services.sriClient import SRIClient
+from app.agents.services.sriSnapshot import SRISnapshot, import_catastro_csv
+from app.agents.services.sriStandIn import SRIStandInConfig, create_sri_stand_in_app, create_sri_stand_in_client
+
+CATASTRO = (
+    "NUMERO_RUC|RAZON_SOCIAL|ESTADO_CONTRIBUYENTE|NUMERO_ESTABLECIMIENTO|ACTIVIDAD_ECONOMICA\n"
+    "1790016919002|CORPORACION FAVORITA C.A.|ACTIVO|002|BODEGA\n"
+    "1790016919001|CORPORACION FAVORITA C.A.|ACTIVO|001|VENTA AL POR MENOR\n"
+    "1710034065001|PEÑA ARIAS JOSÉ|SUSPENDIDO|001|CONSTRUCCIÓN\n"
+    "RUC INVALIDO|X|ACTIVO|001|X\n"
+)
+
+
+def _snapshot(tmp_path, snapshot_date=None, max_age_days=30) -> SRISnapshot:
+    csv_path = tmp_path / "SRI_RUC_Pichincha.csv"
+    csv_path.write_bytes(CATASTRO.encode("latin-1"))
+    db_path = tmp_path / "sri_catastro.sqlite"
+    stats = import_catastro_csv([csv_path], db_path, snapshot_date)
+    assert (stats["rows"], stats["skippedRows"], stats["taxpayers"]) == (4, 1, 3)
+    return SRISnapshot(db_path, max_age_days)
+
+
+def test_import_keeps_the_main_establishment_and_decodes_latin1(tmp_path):
+    snapshot = _snapshot(tmp_path)
+
+    assert snapshot.lookup("1790016919001")["economicActivity"] == "VENTA AL POR MENOR"
+    assert snapshot.lookup("1710034065001")["bidderName"] == "PEÑA ARIAS JOSÉ"
+    assert snapshot.lookup("0990004196001") is None
+    assert snapshot.info()["taxpayers"] == "3" and snapshot.is_fresh()
+
+
+def test_snapshot_mode_calls_the_sri_only_for_missing_rucs_or_a_stale_snapshot(tmp_path):
+    app = create_sri_stand_in_app(SRIStandInConfig(registry={
+        "0990004196001": {"razonSocial": "BANCO GUAYAQUIL S.A.", "estadoContribuyenteRuc": "ACTIVO"},
+        "1790016919001": {"razonSocial": "CORPORACION FAVORITA C.A.", "estadoContribuyenteRuc": "PASIVO"},
+    }))
+    client = SRIClient(base_url="http://sri-stand-in", cache_ttl_hours=0, lookup_mode="snapshot")
+    client.configure(http_async_client=create_sri_stand_in_client(app), snapshot=_snapshot(tmp_path))
+
+    results = asyncio.run(client.validate_many(["1790016919001", "1710034065001", "0990004196001"]))
+
+    assert results["1710034065001"]["status"] == "SUSPENDIDO" and results["1710034065001"]["snapshotDate"]
+    assert results["0990004196001"]["bidderName"] == "BANCO GUAYAQUIL S.A."
+    assert app.state.stats["requests"] == 1 and client.get_stats()["snapshotHits"] == 2
+
+    client.configure(snapshot=_snapshot(tmp_path, snapshot_date="2020-01-01"))
+    assert asyncio.run(client.validate("1790016919001"))["status"] == "PASIVO"
+    assert app.state.stats["requests"] == 2
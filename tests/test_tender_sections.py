@@ -0,0 +1,40 @@
+"""
+Tests for map-reduce master checklist helpers
+"""
+from app.agents.tenderAnalyzer.tenderSections import merge_checklists, split_tender_sections
+from app.core.constants import PAGE_SEPARATOR
+
+
+def test_short_tender_stays_one_section():
+    """Tenders under the limit keep the single-call path"""
+    assert split_tender_sections("Pliego corto", max_chars=100) == ["Pliego corto"]
+
+
+def test_outline_pages_define_sections():
+    """Top-level outline entries start new sections, and every section fits the limit"""
+    pages = [f"Página {index + 1} " + "x" * 40 for index in range(6)]
+    outline = [{"level": 1, "title": "Condiciones", "page": 1}, {"level": 1, "title": "Anexos", "page": 4}]
+
+    sections = split_tender_sections(PAGE_SEPARATOR.join(pages), outline, max_chars=160)
+
+    assert [section.startswith("Página") for section in sections] == [True] * len(sections)
+    assert sections[1].startswith("Página 4")
+    assert all(len(section) <= 160 for section in sections)
+
+
+def test_headings_split_when_there_is_no_outline():
+    """Chapter headings are used as boundaries for PDFs without bookmarks"""
+    text = "CAPÍTULO I " + "a " * 60 + "CAPÍTULO II " + "b " * 60
+    sections = split_tender_sections(text, None, max_chars=140)
+    assert [section[:11] for section in sections] == ["CAPÍTULO I ", "CAPÍTULO II"]
+
+
+def test_merge_checklists_deduplicates_by_normalized_name():
+    """The same requirement found in two sections is kept once with both details"""
+    first = {"financialRequirements": [{"name": "Patrimonio Mínimo", "details": ">= $80,187.24"}], "technicalRequirements": [], "legalRequirements": []}
+    second = {"financialRequirements": [{"name": "PATRIMONIO MINIMO", "details": "Según balance 2023"}], "technicalRequirements": [], "legalRequirements": [{"name": "Multas", "details": "1 por mil"}]}
+
+    merged = merge_checklists([first, second])
+
+    assert merged["financialRequirements"] == [{"name": "Patrimonio Mínimo", "details": ">= $80,187.24; Según balance 2023"}]
+    assert merged["legalRequirements"] == [{"name": "Multas", "details": "1 por mil"}]